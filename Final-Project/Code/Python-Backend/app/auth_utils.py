@@ -1,10 +1,17 @@
 # app/auth/auth_utils.py  O  app/auth_utils.py (según tu estructura)
 import jwt
 import base64
+import time
+from typing import Optional
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from app.database import get_db
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app import config, metrics
+from app.cache import TTLCache, discard_on_write
+from app.crud import users as crud_users
+from app.database import get_db, get_async_db
 from app.models.user import User  # ✅ Importación explícita
 
 security = HTTPBearer(auto_error=False)
@@ -13,29 +20,76 @@ SECRET_KEY = "MTkxNTYyMDIzMTE4NTUxNDc5MTQ1NTE4OTE0NzE5NTEzOTE0MTE4"
 ALGORITHM = "HS256"
 DECODED_KEY = base64.b64decode(SECRET_KEY)
 
+# token -> (payload, user_id): evita jwt.decode por request
+_user_cache = TTLCache(maxsize=config.AUTH_CACHE_SIZE, ttl=config.AUTH_CACHE_TTL, name="auth_users")
+# (engine, user_id) -> columnas del usuario: evita el SELECT. Cualquier flush
+# que escriba el usuario (editarlo, desactivarlo) descarta su fila, y otra vez
+# al commit o rollback; el siguiente request lo vuelve a leer
+_user_rows = TTLCache(maxsize=config.AUTH_CACHE_SIZE, ttl=config.AUTH_CACHE_TTL, name="auth_user_rows")
+discard_on_write(_user_rows, User, lambda session, user: (session.get_bind().engine, user.user_id))
+
 
 def decode_jwt(token: str) -> dict:
     try:
         if not token:
+            metrics.AUTH_FAILURES.inc("missing")
             raise HTTPException(status_code=401, detail="No token provided")
 
         payload = jwt.decode(token, DECODED_KEY, algorithms=[ALGORITHM])
         return payload
 
     except jwt.ExpiredSignatureError:
+        metrics.AUTH_FAILURES.inc("expired")
         raise HTTPException(status_code=401, detail="Token expired")
     except jwt.InvalidTokenError:
+        metrics.AUTH_FAILURES.inc("invalid")
         raise HTTPException(status_code=401, detail="Invalid token")
 
 
+def _cache_user(token: str, payload: dict, user: User, db: Session) -> None:
+    """Guarda el usuario resuelto sin superar la expiración del token"""
+    ttl = config.AUTH_CACHE_TTL
+    if payload.get("exp") is not None:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl <= 0:
+        return
+    values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+    _user_rows.set((db.get_bind().engine, user.user_id), values)
+    _user_cache.set(token, (payload, user.user_id), ttl=ttl)
+
+
+def _cached_user(token: str, db: Session) -> Optional[tuple[dict, User]]:
+    """Payload y usuario desde la caché, adjuntado a la sesión sin consultar la BD"""
+    entry = _user_cache.get(token)
+    if entry is None:
+        return None
+    payload, user_id = entry
+    values = _user_rows.get((db.get_bind().engine, user_id))
+    if values is None:
+        return None
+    user = User(**values)
+    make_transient_to_detached(user)
+    return payload, db.merge(user, load=False)
+
+
+def clear_user_cache() -> None:
+    _user_cache.clear()
+    _user_rows.clear()
+
+
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     if credentials is None:
+        metrics.AUTH_FAILURES.inc("missing")
         raise HTTPException(status_code=401, detail="No token provided")
 
     token = credentials.credentials
+    cached = _cached_user(token, db)
+    if cached is not None:
+        return cached[1]
+
     payload = decode_jwt(token)
 
     user_id = payload.get("id")
@@ -45,20 +99,10 @@ def get_current_user(
     if username is None:
         raise HTTPException(status_code=400, detail="Invalid token: missing username")
 
-    user = db.query(User).filter(User.email == username).first()
-
-    if not user:
-        user = User(
-            auth_id=user_id,
-            email=username,
-            full_name=username.split("@")[0],
-            status="active"
-        )
-
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    # Solo escribe la primera vez que aparece el email (INSERT idempotente)
+    user = crud_users.provision_user(db, username, auth_id=user_id)
 
+    _cache_user(token, payload, user, db)
     return user
 
 
@@ -67,22 +111,29 @@ def get_current_librarian(
     db: Session = Depends(get_db)
 ) -> User:
     if credentials is None:
+        metrics.AUTH_FAILURES.inc("missing")
         raise HTTPException(status_code=401, detail="No token provided")
 
     token = credentials.credentials
-    payload = decode_jwt(token)
+    cached = _cached_user(token, db)
+    payload = cached[0] if cached is not None else decode_jwt(token)
 
     rol = payload.get("rol")
 
     if rol != "ADMIN":
+        metrics.AUTH_FAILURES.inc("forbidden")
         raise HTTPException(status_code=403, detail="Admin role required")
 
+    if cached is not None:
+        return cached[1]
+
     username = payload.get("username")
     user = db.query(User).filter(User.email == username).first()
 
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    _cache_user(token, payload, user, db)
     return user
 
 
@@ -97,4 +148,19 @@ def optional_auth(
     try:
         return get_current_user(credentials, db)
     except:
-        return None
\ No newline at end of file
+        return None
+
+
+# Versiones para los routers async (DB_ASYNC): misma lógica vía run_sync
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    return await db.run_sync(lambda session: get_current_user(credentials, session))
+
+
+async def get_current_librarian_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    return await db.run_sync(lambda session: get_current_librarian(credentials, session))
@@ -0,0 +1,32 @@
+# app/batch.py
+"""
+Lecturas por lista de ids (``/books/batch`` y ``/users/batch``).
+
+Las tablas de préstamos del frontend necesitan el libro y el usuario de cada
+fila; en lugar de un request (y una consulta) por id, se piden todos juntos y
+se resuelven con un solo ``IN``. La respuesta respeta el orden pedido, sin
+repetidos, y ``missing`` lista los ids que no existen.
+"""
+from typing import Any, Callable, Union
+
+MAX_BATCH_IDS = 5000
+
+
+def parse_ids(value: str) -> list[int]:
+    """``"1,2,3"`` -> ``[1, 2, 3]``"""
+    try:
+        return [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise ValueError("ids must be a comma-separated list of integers")
+
+
+def resolve(ids: Union[str, list[int]], load: Callable[[list[int]], dict[int, Any]]) -> dict:
+    """Busca ``ids`` (lista o ``"1,2,3"``) con ``load`` (id -> fila) y separa encontrados de faltantes"""
+    unique = list(dict.fromkeys(parse_ids(ids) if isinstance(ids, str) else ids))
+    if len(unique) > MAX_BATCH_IDS:
+        raise ValueError(f"At most {MAX_BATCH_IDS} ids per request")
+    found = load(unique) if unique else {}
+    return {
+        "items": [found[item_id] for item_id in unique if item_id in found],
+        "missing": [item_id for item_id in unique if item_id not in found],
+    }
@@ -0,0 +1,171 @@
+# app/bulk_import.py
+"""
+Importación masiva de libros desde CSV o NDJSON.
+
+El cuerpo se lee en streaming: cada registro se valida con
+``schemas.BookCreate`` a medida que llega y los válidos se escriben en lotes
+de ``IMPORT_BATCH_SIZE`` con un upsert por ISBN (``crud.books.upsert_books``).
+Los registros inválidos no detienen la importación; se informan con su número
+de línea.
+"""
+import codecs
+import csv
+import json
+from typing import AsyncIterator, Awaitable, Callable, Optional
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from app import schemas
+from app.crud import books as crud_books
+from app.export import ExportFormat
+from app.models.book import Book
+
+ImportFormat = ExportFormat
+
+IMPORT_BATCH_SIZE = 1000
+
+# El reporte guarda como máximo estos errores (el total va en "failed")
+MAX_REPORTED_ERRORS = 1000
+
+# Ejecuta fn(session, *args) en la sesión del request: threadpool con una
+# Session sync o run_sync con una AsyncSession
+RunInSession = Callable[..., Awaitable]
+
+_MAX_LENGTHS = {
+    column.name: column.type.length
+    for column in Book.__table__.columns
+    if getattr(column.type, "length", None)
+}
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Decodifica el cuerpo (UTF-8, con o sin BOM) y lo parte en líneas"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+async def _csv_records(lines: AsyncIterator[str]):
+    header = None
+    line_no = start = 0
+    buffer = []
+    async for line in lines:
+        line_no += 1
+        if not buffer:
+            start = line_no
+        buffer.append(line)
+        text = "\n".join(buffer)
+        if text.count('"') % 2:
+            continue  # campo entre comillas con saltos de línea
+        buffer = []
+        if not text.strip():
+            continue
+
+        values = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip() for name in values]
+        elif len(values) > len(header):
+            yield start, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+        else:
+            # Celdas vacías = campo ausente (se aplican los valores por defecto)
+            yield start, {name: value for name, value in zip(header, values) if value != ""}
+    if buffer:
+        yield start, ValueError("Unterminated quoted field")
+
+
+async def _ndjson_records(lines: AsyncIterator[str]):
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield line_no, ValueError("Invalid JSON")
+            continue
+        if not isinstance(record, dict):
+            yield line_no, ValueError("Expected a JSON object")
+            continue
+        yield line_no, record
+
+
+def _describe(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'row'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+def _too_long(row: dict) -> list[str]:
+    return [
+        f"{name}: at most {length} characters"
+        for name, length in _MAX_LENGTHS.items()
+        if isinstance(row.get(name), str) and len(row[name]) > length
+    ]
+
+
+async def import_books(
+    chunks: AsyncIterator[bytes],
+    fmt: ImportFormat,
+    run: RunInSession,
+    batch_size: Optional[int] = None
+) -> dict:
+    """Valida e inserta/actualiza libros por lotes; retorna el reporte por fila"""
+    batch_size = batch_size or IMPORT_BATCH_SIZE
+    report = {"received": 0, "imported": 0, "failed": 0, "errors": []}
+
+    def fail(line: int, message: str):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line, "error": message})
+
+    category_ids = await run(crud_books.get_category_ids)
+    batch: dict[str, tuple[list[int], dict]] = {}  # ISBN -> (líneas, fila); gana la última
+
+    async def flush():
+        try:
+            await run(crud_books.upsert_books, [row for _, row in batch.values()])
+            report["imported"] += sum(len(lines) for lines, _ in batch.values())
+        except SQLAlchemyError as e:
+            message = f"Database error: {type(getattr(e, 'orig', None) or e).__name__}"
+            for lines, _ in batch.values():
+                for line in lines:
+                    fail(line, message)
+        batch.clear()
+
+    records = _csv_records if fmt == "csv" else _ndjson_records
+    async for line, record in records(iter_lines(chunks)):
+        report["received"] += 1
+        if isinstance(record, Exception):
+            fail(line, str(record))
+            continue
+        try:
+            book = schemas.BookCreate.model_validate(record)
+        except ValidationError as e:
+            fail(line, _describe(e))
+            continue
+
+        row = book.model_dump()
+        problems = _too_long(row)
+        if book.category_id is not None and book.category_id not in category_ids:
+            problems.append("category_id: category not found")
+        if problems:
+            fail(line, "; ".join(problems))
+            continue
+
+        lines = batch.pop(book.isbn, ([], None))[0]
+        batch[book.isbn] = (lines + [line], row)
+        if len(batch) >= batch_size:
+            await flush()
+
+    if batch:
+        await flush()
+    report["errors"].sort(key=lambda error: error["line"])
+    return report
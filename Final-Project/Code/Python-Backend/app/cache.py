@@ -0,0 +1,187 @@
+# app/cache.py
+"""
+Caché en memoria (por proceso) con expiración y tamaño acotado.
+
+Las cachés con nombre quedan registradas y sus contadores de aciertos y
+fallos se pueden consultar con ``cache_stats()`` (``GET /health/cache``).
+``invalidate_on_write`` avisa cuando un flush toca ciertos modelos (y de
+nuevo al terminar la transacción): ``clear_on_write`` vacía una caché y
+``discard_on_write`` descarta solo las entradas de las instancias escritas.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+from sqlalchemy import Engine, event
+from sqlalchemy.orm import Session
+
+_MISSING = object()
+
+# Nombre -> caché, para monitoreo
+_registry: dict[str, "TTLCache"] = {}
+
+
+class TTLCache:
+    """
+    Caché LRU con TTL por entrada, segura entre hilos.
+
+    Al superar ``maxsize`` se descarta la entrada usada hace más tiempo; las
+    entradas vencidas se eliminan al leerlas.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        name: Optional[str] = None
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        if name is not None:
+            _registry[name] = self
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+        """Read-through: el valor cacheado o el que retorna ``loader()`` (que se guarda)"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Guarda ``value``; ``ttl`` reemplaza el TTL por defecto para esta entrada"""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Elimina las entradas cuyo valor cumple ``predicate``; devuelve cuántas"""
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def cache_stats() -> dict:
+    """Contadores de todas las cachés con nombre"""
+    return {name: cache.stats() for name, cache in sorted(_registry.items())}
+
+
+# ==================== INVALIDACIÓN POR ESCRITURA ====================
+# (callback, modelos, filtro de instancias modificadas)
+_write_hooks: list[tuple[Callable[[Engine], None], tuple[type, ...], Optional[Callable[[Any], bool]]]] = []
+_key_hooks: list[tuple[TTLCache, type, Callable[[Session, Any], Hashable]]] = []
+
+_DIRTY_FLAG = "read_through_dirty"
+_DIRTY_KEYS = "read_through_dirty_keys"
+
+
+def invalidate_on_write(
+    callback: Callable[[Engine], None],
+    *models: type,
+    touches: Optional[Callable[[Any], bool]] = None
+) -> None:
+    """
+    Llama ``callback(engine)`` cuando un flush agrega, modifica o borra
+    instancias de ``models``, y otra vez al terminar esa transacción (commit
+    o rollback), por si entre medio otra conexión cargó los datos anteriores.
+
+    ``touches`` filtra las instancias modificadas (por ejemplo, solo si cambió
+    algún atributo en particular); las nuevas y las borradas siempre cuentan.
+    """
+    _write_hooks.append((callback, models, touches))
+
+
+def clear_on_write(cache: TTLCache, *models: type) -> None:
+    """Vacía ``cache`` cuando se escriben instancias de ``models`` (ver ``invalidate_on_write``)"""
+    invalidate_on_write(lambda engine: cache.clear(), *models)
+
+
+def discard_on_write(cache: TTLCache, model: type, key: Callable[[Session, Any], Hashable]) -> None:
+    """
+    Como ``clear_on_write``, pero por entrada: descarta ``key(session, obj)``
+    de cada instancia de ``model`` escrita en el flush y al terminar la
+    transacción.
+    """
+    _key_hooks.append((cache, model, key))
+
+
+def _written(hook, session) -> bool:
+    _, models, touches = hook
+    if any(isinstance(obj, models) for obj in (*session.new, *session.deleted)):
+        return True
+    return any(isinstance(obj, models) and (touches is None or touches(obj)) for obj in session.dirty)
+
+
+@event.listens_for(Session, "after_flush")
+def _clear_written(session, flush_context):
+    callbacks = {hook[0] for hook in _write_hooks if _written(hook, session)}
+    if callbacks:
+        connection = session.connection()
+        connection.info.setdefault(_DIRTY_FLAG, set()).update(callbacks)
+        for callback in callbacks:
+            callback(connection.engine)
+
+    changed = (*session.new, *session.deleted, *session.dirty)
+    keys = {(cache, key(session, obj)) for cache, model, key in _key_hooks for obj in changed if isinstance(obj, model)}
+    if keys:
+        session.connection().info.setdefault(_DIRTY_KEYS, set()).update(keys)
+        for cache, key in keys:
+            cache.delete(key)
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _clear_at_end_of_transaction(connection):
+    for callback in connection.info.pop(_DIRTY_FLAG, ()):
+        callback(connection.engine)
+    for cache, key in connection.info.pop(_DIRTY_KEYS, ()):
+        cache.delete(key)
@@ -0,0 +1,134 @@
+# app/compression.py
+"""
+Compresión de respuestas (gzip, y brotli si el paquete está instalado).
+
+Solo se comprimen respuestas completas (un único mensaje de cuerpo) de tipos
+de texto o JSON y de al menos COMPRESSION_MIN_SIZE bytes. Se dejan tal cual:
+
+- las respuestas chicas, donde el ahorro no compensa la latencia;
+- las respuestas en streaming (exportaciones), para no retener chunks;
+- las que ya traen ``Content-Encoding`` o no son texto.
+
+Los cuerpos grandes se comprimen en el threadpool para no bloquear el event
+loop. Al comprimir, un ETag fuerte pasa a débil (la representación cambia
+byte a byte, pero If-None-Match usa comparación débil).
+"""
+import gzip
+from typing import Optional
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "application/x-ndjson", "text/")
+
+# A partir de este tamaño la compresión sale del event loop
+OFFLOAD_SIZE = 64 * 1024
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Codificaciones soportadas, en orden de preferencia"""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Codificación a usar según Accept-Encoding (mayor q; a igual q, br antes que gzip)"""
+    weights = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name] = weight
+
+    wildcard = weights.get("*", 0.0)
+    candidates = [
+        (weights.get(encoding, wildcard), encoding)
+        for encoding in available_encodings()
+        if weights.get(encoding, wildcard) > 0
+    ]
+    # max() se queda con el primero en caso de empate: el orden de preferencia
+    return max(candidates, key=lambda candidate: candidate[0], default=(0, None))[1]
+
+
+def compress(body: bytes, encoding: str, gzip_level: int, brotli_quality: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=brotli_quality)
+    return gzip.compress(body, compresslevel=gzip_level, mtime=0)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI que comprime las respuestas según Accept-Encoding"""
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        encoding = None
+        if scope["type"] == "http":
+            encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start = None
+
+        async def send_compressed(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message  # se envía junto con el primer cuerpo
+                return
+            if start is None:
+                await send(message)
+                return
+
+            initial, start = start, None
+            if message["type"] != "http.response.body" or not self._should_compress(initial, message):
+                await send(initial)
+                await send(message)
+                return
+
+            body = message["body"]
+            if len(body) >= OFFLOAD_SIZE:
+                compressed = await run_in_threadpool(compress, body, encoding, self.gzip_level, self.brotli_quality)
+            else:
+                compressed = compress(body, encoding, self.gzip_level, self.brotli_quality)
+
+            headers = MutableHeaders(raw=list(initial["headers"]))
+            initial = {**initial, "headers": headers.raw}
+            headers.add_vary_header("Accept-Encoding")
+            if len(compressed) < len(body):
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(compressed))
+                etag = headers.get("etag")
+                if etag is not None and etag.startswith('"'):
+                    headers["ETag"] = f"W/{etag}"
+                message = {**message, "body": compressed}
+            await send(initial)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def _should_compress(self, initial: dict, message: dict) -> bool:
+        if message.get("more_body", False):
+            return False  # streaming
+        if len(message.get("body", b"")) < self.minimum_size:
+            return False
+        headers = Headers(raw=initial["headers"])
+        if "content-encoding" in headers:
+            return False
+        return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
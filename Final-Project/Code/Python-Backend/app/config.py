@@ -0,0 +1,103 @@
+# app/config.py
+"""Configuración leída de variables de entorno (o de .env)"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value not in (None, "") else default
+
+
+def env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value in (None, ""):
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def env_budgets(name: str) -> dict[str, int]:
+    """``"POST /loans/=6, DELETE /loans/{loan_id}=4"`` -> {"POST /loans/": 6, ...}"""
+    budgets = {}
+    for item in (os.getenv(name) or "").split(","):
+        route, _, budget = item.rpartition("=")
+        if route.strip():
+            budgets[" ".join(route.split())] = int(budget)
+    return budgets
+
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+
+# Modo async: AsyncEngine (asyncpg / aiosqlite) y routers async def
+DB_ASYNC = env_bool("DB_ASYNC", False)
+
+# Pool de conexiones (QueuePool); ignorado en SQLite
+DB_POOL_SIZE = env_int("DB_POOL_SIZE", 10)
+DB_MAX_OVERFLOW = env_int("DB_MAX_OVERFLOW", 20)
+DB_POOL_TIMEOUT = env_float("DB_POOL_TIMEOUT", 30.0)
+DB_POOL_PRE_PING = env_bool("DB_POOL_PRE_PING", True)
+DB_POOL_RECYCLE = env_int("DB_POOL_RECYCLE", 1800)
+# statement_timeout de PostgreSQL en milisegundos; 0 = sin límite
+DB_STATEMENT_TIMEOUT_MS = env_int("DB_STATEMENT_TIMEOUT_MS", 0)
+
+# Caché token JWT -> usuario (0 en AUTH_CACHE_TTL la desactiva)
+AUTH_CACHE_SIZE = env_int("AUTH_CACHE_SIZE", 1024)
+AUTH_CACHE_TTL = env_float("AUTH_CACHE_TTL", 60.0)
+
+# Segundos que se reutiliza la lista de categorías (0 = sin caché)
+CATEGORY_CACHE_TTL = env_float("CATEGORY_CACHE_TTL", 300.0)
+
+# Caché de GET /books/{book_id} (0 en BOOK_CACHE_TTL la desactiva); los 404
+# se recuerdan BOOK_MISS_CACHE_TTL segundos
+BOOK_CACHE_SIZE = env_int("BOOK_CACHE_SIZE", 4096)
+BOOK_CACHE_TTL = env_float("BOOK_CACHE_TTL", 60.0)
+BOOK_MISS_CACHE_TTL = env_float("BOOK_MISS_CACHE_TTL", 5.0)
+
+# Segundos que vale la versión de una tabla para los ETag del catálogo (0 = sin ETag)
+ETAG_VERSION_TTL = env_float("ETAG_VERSION_TTL", 30.0)
+# Workers de uvicorn (la misma variable que lee ``uvicorn --workers``); con más
+# de uno no hay ETag, porque las versiones son por proceso
+WEB_CONCURRENCY = env_int("WEB_CONCURRENCY", 1)
+
+# Compresión de respuestas (app/compression.py)
+COMPRESSION_ENABLED = env_bool("COMPRESSION_ENABLED", True)
+# Respuestas más chicas (bytes) se envían sin comprimir
+COMPRESSION_MIN_SIZE = env_int("COMPRESSION_MIN_SIZE", 1024)
+# gzip 1-9 y brotli 0-11: más alto = menos bytes y más CPU
+GZIP_LEVEL = env_int("GZIP_LEVEL", 6)
+BROTLI_QUALITY = env_int("BROTLI_QUALITY", 4)
+
+# Métricas de Prometheus en GET /metrics (app/metrics.py)
+METRICS_ENABLED = env_bool("METRICS_ENABLED", True)
+
+# Perfil de consultas SQL por request (app/profiler.py): X-Query-Count y Server-Timing
+QUERY_PROFILER = env_bool("QUERY_PROFILER", False)
+# Consultas por request antes de registrar un warning; por ruta con
+# QUERY_BUDGETS="POST /loans/=6, DELETE /loans/{loan_id}=4"
+QUERY_BUDGET = env_int("QUERY_BUDGET", 10)
+QUERY_BUDGETS = env_budgets("QUERY_BUDGETS")
+# Repeticiones de una misma sentencia en un request que se reportan como posible N+1
+QUERY_REPEAT_THRESHOLD = env_int("QUERY_REPEAT_THRESHOLD", 5)
+
+# Listados con consultas por columnas + TypeAdapter y ORJSONResponse (app/fast_json.py)
+FAST_JSON = env_bool("FAST_JSON", False)
+
+# Segundos que se reutilizan los contadores de /stats/dashboard (0 = sin caché)
+STATS_CACHE_TTL = env_float("STATS_CACHE_TTL", 5.0)
+
+# Arranque de cada worker (app/startup.py)
+# Migraciones pendientes al arrancar; con la base al día no se ejecuta DDL
+DB_MIGRATE_ON_STARTUP = env_bool("DB_MIGRATE_ON_STARTUP", True)
+# Conexiones del pool que se abren antes de recibir tráfico
+DB_POOL_PREWARM = env_int("DB_POOL_PREWARM", 2)
+# Segundos que se reintenta si la base todavía no responde
+DB_STARTUP_TIMEOUT = env_float("DB_STARTUP_TIMEOUT", 30.0)
+# Tiempo máximo esperado hasta estar listo (ms); si se supera se registra un warning
+STARTUP_BUDGET_MS = env_float("STARTUP_BUDGET_MS", 2000.0)
@@ -0,0 +1,109 @@
+# app/crud/aio.py
+"""
+Versiones async de las funciones CRUD.
+
+Cada función ejecuta la versión sync del módulo correspondiente con
+``AsyncSession.run_sync``: la lógica es la misma, pero la E/S pasa por el
+driver async (asyncpg / aiosqlite) y no bloquea el event loop.
+"""
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import schemas
+from app.crud import books, category, loans, stats, users
+
+
+# ==================== BOOKS ====================
+async def get_books(db: AsyncSession, limit: Optional[int] = None, after_id: Optional[int] = None):
+    return await db.run_sync(books.get_books, limit, after_id)
+
+async def get_available_books(db: AsyncSession, limit: Optional[int] = None, after_id: Optional[int] = None):
+    return await db.run_sync(books.get_available_books, limit, after_id)
+
+async def search_books(db: AsyncSession, search: str, limit: int, after: Optional[tuple[int, int]] = None):
+    return await db.run_sync(books.search_books, search, limit, after)
+
+async def get_book_by_id(db: AsyncSession, book_id: int):
+    return await db.run_sync(books.get_book_by_id, book_id)
+
+async def get_book(db: AsyncSession, book_id: int):
+    return await db.run_sync(books.get_book, book_id)
+
+async def get_books_by_ids(db: AsyncSession, book_ids: list[int]):
+    return await db.run_sync(books.get_books_by_ids, book_ids)
+
+async def create_book(db: AsyncSession, book: schemas.BookCreate):
+    return await db.run_sync(books.create_book, book)
+
+async def update_book(db: AsyncSession, book_id: int, book_update: schemas.BookCreate):
+    return await db.run_sync(books.update_book, book_id, book_update)
+
+async def delete_book(db: AsyncSession, book_id: int):
+    return await db.run_sync(books.delete_book, book_id)
+
+async def get_category_ids(db: AsyncSession):
+    return await db.run_sync(books.get_category_ids)
+
+async def upsert_books(db: AsyncSession, rows: list[dict]):
+    return await db.run_sync(books.upsert_books, rows)
+
+
+# ==================== CATEGORIES ====================
+async def get_categories(db: AsyncSession):
+    return await db.run_sync(category.get_categories)
+
+async def create_category(db: AsyncSession, category_data: schemas.CategoryCreate):
+    return await db.run_sync(category.create_category, category_data)
+
+
+# ==================== LOANS ====================
+async def get_loans(db: AsyncSession):
+    return await db.run_sync(loans.get_loans)
+
+async def get_active_loans(db: AsyncSession):
+    return await db.run_sync(loans.get_active_loans)
+
+async def create_loan(db: AsyncSession, loan: schemas.LoanCreate):
+    return await db.run_sync(loans.create_loan, loan)
+
+async def return_loan(db: AsyncSession, loan_id: int):
+    return await db.run_sync(loans.return_loan, loan_id)
+
+async def delete_loan(db: AsyncSession, loan_id: int):
+    return await db.run_sync(loans.delete_loan, loan_id)
+
+
+# ==================== STATS ====================
+async def get_dashboard_stats(db: AsyncSession):
+    return await db.run_sync(stats.get_dashboard_stats)
+
+
+# ==================== USERS ====================
+async def get_users(db: AsyncSession):
+    return await db.run_sync(users.get_users)
+
+async def get_user_by_id(db: AsyncSession, user_id: int):
+    return await db.run_sync(users.get_user_by_id, user_id)
+
+async def get_users_by_ids(db: AsyncSession, user_ids: list[int]):
+    return await db.run_sync(users.get_users_by_ids, user_ids)
+
+async def get_user_by_auth_id(db: AsyncSession, auth_id: int):
+    return await db.run_sync(users.get_user_by_auth_id, auth_id)
+
+async def get_user_by_email(db: AsyncSession, email: str):
+    return await db.run_sync(users.get_user_by_email, email)
+
+async def create_user(db: AsyncSession, user: schemas.UserCreate):
+    return await db.run_sync(users.create_user, user)
+
+async def provision_user(db: AsyncSession, email: str, auth_id: Optional[int] = None, full_name: Optional[str] = None):
+    return await db.run_sync(users.provision_user, email, auth_id, full_name)
+
+async def provision_users(db: AsyncSession, user_list: list[schemas.UserProvision]):
+    return await db.run_sync(users.provision_users, user_list)
+
+async def update_user(db: AsyncSession, user_id: int, user_update: schemas.UserCreate):
+    return await db.run_sync(users.update_user, user_id, user_update)
+
+async def delete_user(db: AsyncSession, user_id: int):
+    return await db.run_sync(users.delete_user, user_id)
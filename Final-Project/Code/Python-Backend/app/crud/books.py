@@ -1,25 +1,102 @@
-from sqlalchemy.orm import Session
+from typing import Optional
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, Query
 from app.models.book import Book
-from app.models.category import Category
-from app import schemas
+from app.models.loan import Loan
+from app import config, etag, schemas, search as search_engine
+from app.cache import TTLCache, discard_on_write
+from app.crud import category as crud_category, stats as crud_stats
 
-def get_books(db: Session):
-    return db.query(Book).all()
+# Columnas que un upsert por ISBN sobrescribe; status no se toca para no
+# "devolver" libros prestados al reimportar el catálogo
+UPSERT_COLUMNS = ("title", "author", "publication_year", "category_id")
 
-def get_available_books(db: Session):
-    return db.query(Book).filter(Book.status == "available").all()
+# Detalle de libro por (engine, book_id). Cada entrada se descarta cuando se
+# escribe el libro o un préstamo suyo (checkout / devolución cambian status);
+# los ids inexistentes se cachean BOOK_MISS_CACHE_TTL segundos
+_books = TTLCache(maxsize=config.BOOK_CACHE_SIZE, ttl=config.BOOK_CACHE_TTL, name="books")
+discard_on_write(_books, Book, lambda session, book: (session.get_bind().engine, book.book_id))
+discard_on_write(_books, Loan, lambda session, loan: (session.get_bind().engine, loan.book_id))
 
-def get_books_by_filter(db: Session, search: str):
-    search_term = f"%{search.lower()}%"
-    return db.query(Book).join(Category).filter(
-        (Book.title.ilike(search_term)) |
-        (Book.author.ilike(search_term)) |
-        (Category.name.ilike(search_term))
-    ).all()
+_NOT_CACHED = object()
+
+def _keyset(query: Query, limit: Optional[int], after_id: Optional[int]):
+    """Aplica paginación por keyset sobre book_id"""
+    if after_id is not None:
+        query = query.filter(Book.book_id > after_id)
+    query = query.order_by(Book.book_id)
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+def get_books(
+    db: Session,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    entities: tuple = (Book,)
+):
+    """``entities`` permite consultar solo algunas columnas (filas planas)"""
+    return _keyset(db.query(*entities), limit, after_id)
+
+def get_available_books(
+    db: Session,
+    limit: Optional[int] = None,
+    after_id: Optional[int] = None,
+    entities: tuple = (Book,)
+):
+    return _keyset(db.query(*entities).filter(Book.status == "available"), limit, after_id)
+
+def search_books(
+    db: Session,
+    search: str,
+    limit: int,
+    after: Optional[tuple[int, int]] = None
+):
+    """Búsqueda rankeada; retorna pares (libro, score)"""
+    return search_engine.search_books(db, search, limit, after)
 
 def get_book_by_id(db: Session, book_id: int):
     return db.query(Book).filter(Book.book_id == book_id).first()
 
+def _remember(key: tuple, book: Optional[schemas.Book]) -> None:
+    _books.set(key, book, ttl=None if book is not None else config.BOOK_MISS_CACHE_TTL)
+
+def get_book(db: Session, book_id: int) -> Optional[schemas.Book]:
+    """Libro por id desde la caché; ``None`` si no existe (también se cachea)"""
+    key = (db.get_bind().engine, book_id)
+    book = _books.get(key, _NOT_CACHED)
+    if book is _NOT_CACHED:
+        row = get_book_by_id(db, book_id)
+        book = None if row is None else schemas.Book.model_validate(row)
+        _remember(key, book)
+    return book
+
+def get_books_by_ids(db: Session, book_ids: list[int]) -> dict[int, schemas.Book]:
+    """
+    Libros por id (los que existen). Primero se consulta la caché de detalle;
+    los ids que no están se leen con un solo IN y se cachean.
+    """
+    engine = db.get_bind().engine
+    found, misses = {}, []
+    for book_id in book_ids:
+        book = _books.get((engine, book_id), _NOT_CACHED)
+        if book is _NOT_CACHED:
+            misses.append(book_id)
+        elif book is not None:
+            found[book_id] = book
+    if misses:
+        rows = db.query(Book).filter(Book.book_id.in_(misses)).all()
+        loaded = {row.book_id: schemas.Book.model_validate(row) for row in rows}
+        for book_id in misses:
+            _remember((engine, book_id), loaded.get(book_id))
+        found.update(loaded)
+    return found
+
+def invalidate() -> None:
+    """Descarta los libros cacheados"""
+    _books.clear()
+
 def create_book(db: Session, book: schemas.BookCreate):
     db_book = Book(
         title=book.title,
@@ -51,3 +128,34 @@ def delete_book(db: Session, book_id: int):
         db.commit()
         db.refresh(book)
     return book
+
+def get_category_ids(db: Session) -> set[int]:
+    return {category.category_id for category in crud_category.get_categories(db)}
+
+def upsert_books(db: Session, rows: list[dict]) -> int:
+    """
+    INSERT ... ON CONFLICT (isbn) DO UPDATE de un lote en una sola sentencia
+    (executemany con insertmanyvalues: VALUES de muchas filas por round trip).
+    """
+    if not rows:
+        return 0
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(Book)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Book.isbn],
+        set_={name: stmt.excluded[name] for name in UPSERT_COLUMNS}
+    )
+    try:
+        db.execute(stmt, rows)
+        db.commit()
+    except SQLAlchemyError:
+        db.rollback()
+        raise
+    # INSERT de Core: no pasa por el flush del ORM
+    engine = db.get_bind().engine
+    search_engine.invalidate(engine)
+    crud_stats.invalidate(engine)
+    etag.bump("book")
+    _books.clear()
+    return len(rows)
+
@@ -1,10 +1,30 @@
 from sqlalchemy.orm import Session
+from app.cache import TTLCache, clear_on_write
 from app.models.category import Category
-from app import models, schemas
+from app import config, models, schemas
 
-def get_categories(db: Session):
-    """Obtener todas las categorías"""
-    return db.query(Category).all()
+# Las categorías casi no cambian: se leen de la base una vez por engine cada
+# CATEGORY_CACHE_TTL segundos y se descartan cuando se escribe alguna
+_categories = TTLCache(maxsize=8, ttl=config.CATEGORY_CACHE_TTL, name="categories")
+clear_on_write(_categories, Category)
+
+
+def _load_categories(db: Session) -> tuple[schemas.Category, ...]:
+    rows = db.query(Category.category_id, Category.name, Category.description)\
+        .order_by(Category.category_id)\
+        .all()
+    return tuple(schemas.Category.model_validate(row._mapping) for row in rows)
+
+
+def get_categories(db: Session) -> list[schemas.Category]:
+    """Obtener todas las categorías (desde la caché si está vigente)"""
+    engine = db.get_bind().engine
+    return list(_categories.get_or_load(engine, lambda: _load_categories(db)))
+
+
+def invalidate() -> None:
+    """Descarta las categorías cacheadas"""
+    _categories.clear()
 
 
 def create_category(db: Session, category: schemas.CategoryCreate):
@@ -15,4 +35,4 @@ def create_category(db: Session, category: schemas.CategoryCreate):
     db.add(db_category)
     db.commit()
     db.refresh(db_category)
-    return db_category
\ No newline at end of file
+    return db_category
@@ -1,7 +1,9 @@
+from sqlalchemy import exists, update
 from sqlalchemy.orm import Session
 from datetime import date
 from app.models.loan import Loan
 from app.models.book import Book
+from app.models.user import User
 from app import schemas
 
 def get_loans(db: Session):
@@ -13,11 +15,24 @@ def get_active_loans(db: Session):
     return db.query(Loan).filter(Loan.status == "active").all()
 
 def create_loan(db: Session, loan: schemas.LoanCreate):
-    """Crear un préstamo si el libro está disponible"""
-    book = db.query(Book).filter(Book.book_id == loan.book_id).first()
-    if not book or book.status != "available":
-        return None  # Libro no disponible
-    
+    """
+    Crear un préstamo si el libro está disponible y el usuario activo.
+    La reserva es atómica: solo una transacción puede pasar el libro de
+    "available" a "loaned", aunque lleguen muchas a la vez.
+    """
+    claimed = db.execute(
+        update(Book)
+        .where(
+            Book.book_id == loan.book_id,
+            Book.status == "available",
+            exists().where(User.user_id == loan.user_id, User.status == "active")
+        )
+        .values(status="loaned")
+        .returning(Book.book_id)
+    ).first()
+    if claimed is None:
+        return None  # Libro no disponible (o usuario inexistente / inactivo)
+
     db_loan = Loan(
         book_id=loan.book_id,
         user_id=loan.user_id,
@@ -25,7 +40,6 @@ def create_loan(db: Session, loan: schemas.LoanCreate):
         status="active"
     )
     db.add(db_loan)
-    book.status = "loaned"
     db.commit()
     db.refresh(db_loan)
     return db_loan
@@ -0,0 +1,57 @@
+# app/crud/stats.py
+"""
+Contadores del dashboard.
+
+Los cuatro totales salen de una sola sentencia (un recorrido de ``book`` para
+total y disponibles, uno de ``app_user`` y uno de ``loan``) y se guardan unos
+segundos en memoria, así el polling del dashboard no vuelve a contar en cada
+request. Cualquier flush que toque libros, usuarios o préstamos descarta el
+valor cacheado de ese engine, y otra vez el commit o rollback de esa
+transacción (un dashboard entre ambos pudo contar las filas anteriores).
+"""
+from sqlalchemy import Engine, func, select, true
+from sqlalchemy.orm import Session
+from app import config
+from app.cache import TTLCache, invalidate_on_write
+from app.models.book import Book
+from app.models.loan import Loan
+from app.models.user import User
+
+# Un valor por engine
+_counters = TTLCache(maxsize=8, ttl=config.STATS_CACHE_TTL, name="dashboard_stats")
+
+
+def _counters_statement():
+    books = select(
+        func.count().label("total_books"),
+        func.count().filter(Book.status == "available").label("available_books")
+    ).select_from(Book).subquery()
+    users = select(func.count().label("total_users")).select_from(User).subquery()
+    loans = select(func.count().label("active_loans"))\
+        .select_from(Loan)\
+        .where(Loan.status == "active")\
+        .subquery()
+    return select(books.c.total_books, users.c.total_users, loans.c.active_loans, books.c.available_books)\
+        .select_from(books.join(users, true()).join(loans, true()))
+
+
+def get_dashboard_stats(db: Session) -> dict:
+    """Totales del dashboard (cacheados STATS_CACHE_TTL segundos)"""
+    engine = db.get_bind().engine
+    stats = _counters.get(engine)
+    if stats is None:
+        row = db.execute(_counters_statement()).one()
+        stats = {name: value or 0 for name, value in row._mapping.items()}
+        _counters.set(engine, stats)
+    return dict(stats)
+
+
+def invalidate(engine: Engine = None) -> None:
+    """Descarta los contadores cacheados (de un engine o de todos)"""
+    if engine is None:
+        _counters.clear()
+    else:
+        _counters.delete(engine)
+
+
+invalidate_on_write(invalidate, Book, User, Loan)
@@ -1,15 +1,25 @@
+from typing import Optional
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 from app.models.user import User
 from app import schemas
+from app.crud import stats as crud_stats
 
-def get_users(db: Session):
+# Filas por sentencia en provision_users (límite de parámetros de SQLite)
+PROVISION_BATCH_SIZE = 500
+
+def get_users(db: Session, entities: tuple = (User,)):
     """Obtener todos los usuarios"""
-    return db.query(User).all()
+    return db.query(*entities).all()
 
 def get_user_by_id(db: Session, user_id: int):
     """Obtener usuario por ID"""
     return db.query(User).filter(User.user_id == user_id).first()
 
+def get_users_by_ids(db: Session, user_ids: list[int]) -> dict[int, User]:
+    """Usuarios por id (los que existen) con un solo IN"""
+    return {user.user_id: user for user in db.query(User).filter(User.user_id.in_(user_ids))}
+
 def get_user_by_auth_id(db: Session, auth_id: int):
     """Obtener usuario por auth_id (ID de MySQL)"""
     return db.query(User).filter(User.auth_id == auth_id).first()
@@ -43,6 +53,56 @@ def create_user(db: Session, user: schemas.UserCreate):
     db.refresh(db_user)
     return db_user
 
+def _insert_ignoring_existing(db: Session, rows: list[dict]):
+    """INSERT ... ON CONFLICT (email) DO NOTHING RETURNING user_id"""
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    return dialect.insert(User)\
+        .values(rows)\
+        .on_conflict_do_nothing(index_elements=[User.email])\
+        .returning(User.user_id)
+
+def _provision_row(email: str, auth_id: Optional[int], full_name: Optional[str]) -> dict:
+    return {
+        "auth_id": auth_id,
+        "email": email,
+        "full_name": full_name or email.split("@")[0],
+        "status": "active"
+    }
+
+def provision_user(db: Session, email: str, auth_id: Optional[int] = None, full_name: Optional[str] = None):
+    """
+    Obtiene el usuario del email o lo crea de forma idempotente.
+    Si ya existe solo hace un SELECT (sin commit); logins simultáneos del mismo
+    email no chocan con la restricción UNIQUE gracias a ON CONFLICT DO NOTHING.
+    """
+    user = get_user_by_email(db, email)
+    if user:
+        return user
+
+    created = db.execute(_insert_ignoring_existing(db, [_provision_row(email, auth_id, full_name)])).first()
+    db.commit()
+    if created:
+        # INSERT de Core: no pasa por el flush del ORM
+        crud_stats.invalidate(db.get_bind().engine)
+    return get_user_by_email(db, email)
+
+def provision_users(db: Session, users: list[schemas.UserProvision]) -> dict:
+    """Pre-registra usuarios en lote; los emails ya existentes se ignoran"""
+    rows = {}
+    for user in users:
+        rows.setdefault(user.email, _provision_row(user.email, user.auth_id, user.full_name))
+    rows = list(rows.values())
+
+    created = 0
+    for start in range(0, len(rows), PROVISION_BATCH_SIZE):
+        batch = rows[start:start + PROVISION_BATCH_SIZE]
+        created += len(db.execute(_insert_ignoring_existing(db, batch)).all())
+    db.commit()
+    if created:
+        # INSERT de Core: no pasa por el flush del ORM
+        crud_stats.invalidate(db.get_bind().engine)
+    return {"created": created, "existing": len(rows) - created}
+
 def update_user(db: Session, user_id: int, user_update: schemas.UserCreate):
     """Actualizar usuario"""
     user = get_user_by_id(db, user_id)
@@ -1,17 +1,86 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from app import config
 
-load_dotenv()
+DATABASE_URL = config.DATABASE_URL
 
-DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """Argumentos de create_engine según el motor y la configuración del pool"""
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        # SQLite usa su propio pool (SingletonThreadPool / QueuePool sin red)
+        return {}
+
+    options = {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_pre_ping": config.DB_POOL_PRE_PING,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+    }
+    if backend == "postgresql" and config.DB_STATEMENT_TIMEOUT_MS > 0:
+        if is_async:
+            # asyncpg recibe los parámetros del servidor por separado
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(config.DB_STATEMENT_TIMEOUT_MS)}
+            }
+        else:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={config.DB_STATEMENT_TIMEOUT_MS}"
+            }
+    return options
+
+
+ASYNC_DRIVERS = {"postgresql": "asyncpg", "sqlite": "aiosqlite"}
+
+
+def async_url(url: str) -> str:
+    """Misma base de datos con el driver async (postgresql+asyncpg, sqlite+aiosqlite)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}'")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")\
+        .render_as_string(hide_password=False)
+
+
+def pool_status(bind=None) -> dict:
+    """Estado del pool: conexiones en uso, libres y overflow"""
+    pool = (bind or engine).pool
+    status = {"pool": type(pool).__name__}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            status[name] = method()
+    if hasattr(pool, "_max_overflow"):
+        status["max_overflow"] = pool._max_overflow
+    if hasattr(pool, "_timeout"):
+        status["timeout"] = pool._timeout
+    return status
+
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Engine async (solo con DB_ASYNC, así asyncpg/aiosqlite son opcionales)
+async_engine = None
+AsyncSessionLocal = None
+if config.DB_ASYNC:
+    async_engine = create_async_engine(
+        async_url(DATABASE_URL),
+        **engine_options(DATABASE_URL, is_async=True)
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine,
+        autoflush=False,
+        expire_on_commit=False  # los objetos se serializan después del commit
+    )
+
 # Dependency for FastAPI routes
 def get_db():
     db = SessionLocal()
@@ -19,3 +88,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency for async routes
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
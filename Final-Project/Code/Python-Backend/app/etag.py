@@ -0,0 +1,102 @@
+# app/etag.py
+"""
+ETags para las lecturas del catálogo (``/books/``, ``/books/available`` y
+``/categories/``).
+
+Cada tabla tiene una versión en memoria: un token aleatorio que se descarta
+con cualquier escritura (flush de libros, categorías o préstamos, ya que un
+préstamo cambia el estado del libro, y de nuevo en el commit/rollback de esa
+transacción). El ETag de una respuesta es la versión de las tablas que lee,
+así que un ``If-None-Match`` que coincide se responde con 304 desde el
+middleware, sin abrir sesión ni consultar la base.
+
+La versión es por proceso: con varios workers una escritura solo cambiaría la
+versión del worker que la hizo y los demás seguirían respondiendo 304 con
+datos viejos, así que con WEB_CONCURRENCY > 1 no se envían ETag. Además vence
+a los ETAG_VERSION_TTL segundos.
+"""
+import secrets
+from app import config
+from app.cache import TTLCache, invalidate_on_write
+from app.models.book import Book
+from app.models.category import Category
+from app.models.loan import Loan
+
+# Ruta -> tablas de las que depende la respuesta
+CATALOG_ROUTES = {
+    "/books/": ("book",),
+    "/books/available": ("book",),
+    "/categories/": ("category",),
+}
+
+_versions = TTLCache(maxsize=16, ttl=config.ETAG_VERSION_TTL, name="etag_versions")
+
+
+def version(table: str) -> str:
+    """Versión actual de ``table`` (se genera una nueva si no hay o venció)"""
+    token = _versions.get(table)
+    if token is None:
+        token = secrets.token_hex(8)
+        _versions.set(table, token)
+    return token
+
+
+def bump(*tables: str) -> None:
+    """Invalida la versión de ``tables`` (sin argumentos, la de todas)"""
+    if not tables:
+        _versions.clear()
+    for table in tables:
+        _versions.delete(table)
+
+
+invalidate_on_write(lambda engine: bump("book"), Book, Loan)  # checkout / devolución cambian book.status
+invalidate_on_write(lambda engine: bump("category"), Category)
+
+
+def enabled() -> bool:
+    """ETag solo con un worker (versiones por proceso) y ETAG_VERSION_TTL > 0"""
+    return config.ETAG_VERSION_TTL > 0 and config.WEB_CONCURRENCY <= 1
+
+
+def etag_for(tables: tuple[str, ...]) -> str:
+    return '"' + "-".join(version(table) for table in tables) + '"'
+
+
+def matches(if_none_match: str, etag: str) -> bool:
+    """Comparación débil de If-None-Match (RFC 9110 §13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+class ETagMiddleware:
+    """
+    Middleware ASGI: responde 304 a los GET del catálogo cuyo If-None-Match
+    coincide y agrega ``ETag`` a las respuestas 200 de esas rutas.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        tables = CATALOG_ROUTES.get(scope.get("path")) if scope["type"] == "http" else None
+        if tables is None or scope["method"] != "GET" or not enabled():
+            await self.app(scope, receive, send)
+            return
+
+        etag = etag_for(tables)
+        headers = [(b"etag", etag.encode()), (b"cache-control", b"no-cache")]
+        if_none_match = dict(scope["headers"]).get(b"if-none-match")
+        if if_none_match is not None and matches(if_none_match.decode("latin-1"), etag):
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        async def send_with_etag(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                message = {**message, "headers": [*message.get("headers", []), *headers]}
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
@@ -0,0 +1,108 @@
+# app/export.py
+"""
+Exportación en streaming (NDJSON o CSV) de tablas completas.
+
+Las filas se leen con ``yield_per``, que en PostgreSQL usa un cursor del lado
+del servidor (``stream_results``), y se envían por lotes a medida que llegan:
+la memoria usada no depende del tamaño de la tabla y el primer byte sale antes
+de terminar la consulta.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterator, Literal
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Table, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+ExportFormat = Literal["ndjson", "csv"]
+
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _ndjson_batch(names: list[str], rows) -> bytes:
+    lines = [json.dumps(dict(zip(names, row)), default=str) for row in rows]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _csv_batch(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _export_statement(table: Table, batch_size: int):
+    columns = list(table.columns)
+    stmt = select(*columns)\
+        .order_by(*table.primary_key.columns)\
+        .execution_options(yield_per=batch_size)
+    return stmt, [column.name for column in columns]
+
+
+def _encode(fmt: ExportFormat, names: list[str], rows) -> bytes:
+    if fmt == "csv":
+        return _csv_batch(rows)
+    return _ndjson_batch(names, rows)
+
+
+def iter_export(
+    db: Session,
+    table: Table,
+    fmt: ExportFormat,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Iterator[bytes]:
+    """Genera la tabla serializada, un lote de ``batch_size`` filas por chunk"""
+    stmt, names = _export_statement(table, batch_size)
+    if fmt == "csv":
+        yield _csv_batch([names])
+
+    result = db.execute(stmt)
+    try:
+        for rows in result.partitions():
+            yield _encode(fmt, names, rows)
+    finally:
+        result.close()
+
+
+async def aiter_export(
+    db: AsyncSession,
+    table: Table,
+    fmt: ExportFormat,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """Versión async de iter_export (AsyncSession.stream)"""
+    stmt, names = _export_statement(table, batch_size)
+    if fmt == "csv":
+        yield _csv_batch([names])
+
+    result = await db.stream(stmt)
+    try:
+        async for rows in result.partitions():
+            yield _encode(fmt, names, rows)
+    finally:
+        await result.close()
+
+
+def _response(body, fmt: ExportFormat, filename: str) -> StreamingResponse:
+    extension = "csv" if fmt == "csv" else "ndjson"
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'}
+    )
+
+
+def export_response(db: Session, table: Table, fmt: ExportFormat, filename: str) -> StreamingResponse:
+    """StreamingResponse con la tabla exportada como adjunto"""
+    return _response(iter_export(db, table, fmt), fmt, filename)
+
+
+def async_export_response(db: AsyncSession, table: Table, fmt: ExportFormat, filename: str) -> StreamingResponse:
+    """Igual que export_response, leyendo desde una AsyncSession"""
+    return _response(aiter_export(db, table, fmt), fmt, filename)
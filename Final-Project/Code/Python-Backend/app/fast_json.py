@@ -0,0 +1,78 @@
+# app/fast_json.py
+"""
+Serialización rápida de los listados (opcional, con FAST_JSON).
+
+Por defecto cada listado carga objetos ORM, FastAPI los valida uno por uno
+contra el ``response_model`` (``from_attributes``) y después codifica el
+resultado en una segunda pasada. Con FAST_JSON:
+
+- las consultas seleccionan solo las columnas que expone el schema y
+  devuelven filas planas, sin construir objetos ORM;
+- la respuesta se valida y se codifica a JSON en un solo paso con un
+  ``TypeAdapter`` cacheado por tipo de respuesta;
+- el resto de los endpoints usa ``ORJSONResponse`` (si orjson está instalado).
+
+El ``response_model`` de cada ruta se mantiene, así la documentación OpenAPI
+no cambia.
+"""
+from functools import lru_cache
+from typing import Any
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row
+from app import config
+
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse
+except ImportError:  # orjson es opcional
+    ORJSONResponse = None
+
+
+def default_response_class() -> type[Response]:
+    """Clase de respuesta por defecto de la app"""
+    if config.FAST_JSON and ORJSONResponse is not None:
+        return ORJSONResponse
+    return JSONResponse
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type: Any) -> TypeAdapter:
+    """``TypeAdapter`` de un tipo de respuesta (se construye una vez por tipo)"""
+    return TypeAdapter(response_type)
+
+
+@lru_cache(maxsize=None)
+def _columns(model, schema: type[BaseModel]) -> tuple:
+    table = model.__table__
+    return tuple(table.c[name] for name in schema.model_fields if name in table.c)
+
+
+def entities(model, schema: type[BaseModel]) -> tuple:
+    """
+    Qué consultar para un listado: el modelo completo o, con FAST_JSON, solo
+    las columnas de ``model`` que expone ``schema``.
+    """
+    return _columns(model, schema) if config.FAST_JSON else (model,)
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Row):
+        return value._mapping
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+def respond(response_type: Any, value: Any) -> Any:
+    """
+    Con FAST_JSON valida ``value`` contra ``response_type`` y lo codifica en
+    una sola pasada; si no, lo retorna tal cual para el ``response_model``.
+    """
+    if not config.FAST_JSON:
+        return value
+    adapter = type_adapter(response_type)
+    validated = adapter.validate_python(_plain(value), from_attributes=True)
+    return Response(adapter.dump_json(validated), media_type="application/json")
@@ -1,13 +1,40 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Depends, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app import config, fast_json, metrics
+from app.cache import cache_stats
+from app.compression import CompressionMiddleware
+from app.database import get_db, pool_status
+from app.etag import ETagMiddleware
+from app.profiler import QueryProfilerMiddleware
 from app.models import * # importa Category, User, Book, Loan desde models/__init__.py
 from app.routers import users, books, loans, stats, category
+from app.startup import lifespan
 
-# Crear todas las tablas (solo al inicio)
-Base.metadata.create_all(bind=engine)
+# ✅ El esquema se aplica con migraciones en el lifespan (sin DDL al importar)
+app = FastAPI(
+    title="Library System API",
+    lifespan=lifespan,
+    default_response_class=fast_json.default_response_class()
+)
+
+# ✅ ETag / 304 para las lecturas del catálogo (dentro de CORS, así los 304 llevan sus headers)
+app.add_middleware(ETagMiddleware)
 
-app = FastAPI(title="Library System API")
+# ✅ Conteo y tiempo de consultas SQL por request (desarrollo / staging)
+if config.QUERY_PROFILER:
+    app.add_middleware(QueryProfilerMiddleware)
+
+# ✅ gzip / brotli para respuestas grandes (fuera de ETag: ve el ETag que agrega)
+if config.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=config.COMPRESSION_MIN_SIZE,
+        gzip_level=config.GZIP_LEVEL,
+        brotli_quality=config.BROTLI_QUALITY
+    )
 
 # Middleware CORS
 app.add_middleware(
@@ -22,12 +49,21 @@ app.add_middleware(
     expose_headers=["*"]
 )
 
-# ✅ Routers
-app.include_router(users.router)
-app.include_router(books.router)
-app.include_router(loans.router)
-app.include_router(stats.router)
-app.include_router(category.router)
+# ✅ Métricas por ruta (el más externo: mide también los 304 y la compresión)
+if config.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+# ✅ Routers (versión async def sobre AsyncSession si DB_ASYNC está activo)
+if config.DB_ASYNC:
+    from app.routers import aio
+    for router in aio.routers:
+        app.include_router(router)
+else:
+    app.include_router(users.router)
+    app.include_router(books.router)
+    app.include_router(loans.router)
+    app.include_router(stats.router)
+    app.include_router(category.router)
 
 @app.get("/")
 def root():
@@ -36,3 +72,28 @@ def root():
 @app.get("/health")
 def health_check():
     return {"status": "healthy"}
+
+@app.get("/health/db")
+def health_db(db: Session = Depends(get_db)):
+    """Ping a la base de datos y estado del pool de conexiones"""
+    started = time.perf_counter()
+    db.execute(text("SELECT 1"))
+    latency_ms = (time.perf_counter() - started) * 1000
+    return {
+        "status": "healthy",
+        "latency_ms": round(latency_ms, 3),
+        "pool": pool_status(),
+        "startup": getattr(app.state, "startup", None)
+    }
+
+@app.get("/health/cache")
+def health_cache():
+    """Aciertos, fallos y tamaño de las cachés en memoria de este proceso"""
+    return cache_stats()
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Métricas de este proceso en formato de texto de Prometheus"""
+    if not config.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
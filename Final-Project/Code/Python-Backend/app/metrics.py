@@ -0,0 +1,233 @@
+# app/metrics.py
+"""
+Métricas en formato de texto de Prometheus (``GET /metrics``).
+
+- ``bookwise_http_requests_total`` y ``bookwise_http_request_duration_seconds``
+  por método y plantilla de ruta (``/books/{book_id}``, no la URL concreta,
+  para acotar la cardinalidad), más ``bookwise_http_requests_in_flight``.
+- Estado del pool de conexiones de ``app.database``.
+- Aciertos, fallos y tasa de acierto de las cachés con nombre.
+- ``bookwise_auth_failures_total`` por motivo (``auth_utils.decode_jwt``).
+
+Los contadores se actualizan en memoria con un lock y un ``bisect`` por
+request; pool y cachés se leen recién al generar la respuesta.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Iterable, Optional
+from starlette.routing import Match
+from app import cache, database
+
+PREFIX = "bookwise_"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name = PREFIX + name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _Value(_Metric):
+    """Un valor por combinación de labels; con ``collect`` se calcula al generar la respuesta"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        collect: Optional[Callable[[], Iterable[tuple[tuple, float]]]] = None
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: dict[tuple, float] = {}
+        self._collect = collect
+
+    def inc(self, *labels, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> list[str]:
+        if self._collect is not None:
+            values = sorted(self._collect())
+        else:
+            with self._lock:
+                values = sorted(self._values.items())
+        return [f"{self.name}{_labels(self.labelnames, labels)} {_number(value)}" for labels, value in values]
+
+
+class Counter(_Value):
+    kind = "counter"
+
+
+class Gauge(_Value):
+    kind = "gauge"
+
+    def dec(self, *labels, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [conteo por bucket (no acumulado, el último es +Inf), suma]
+        self._series: dict[tuple, list] = {}
+
+    def observe(self, value: float, *labels) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        names = self.labelnames + ("le",)
+        lines = []
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_labels(names, (*labels, _number(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+# ==================== COLECTORES ====================
+def _pool_connections():
+    for engine_name, bind in (("sync", database.engine), ("async", database.async_engine)):
+        if bind is None:
+            continue
+        status = database.pool_status(getattr(bind, "sync_engine", bind))
+        for state in ("checkedout", "checkedin", "overflow", "size"):
+            if state in status:
+                yield (engine_name, state), status[state]
+
+
+def _cache_counter(field: str):
+    def collect():
+        for name, stats in cache.cache_stats().items():
+            yield (name,), stats[field]
+    return collect
+
+
+def _cache_hit_ratio():
+    for name, stats in cache.cache_stats().items():
+        lookups = stats["hits"] + stats["misses"]
+        yield (name,), stats["hits"] / lookups if lookups else 0.0
+
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by route template and status",
+                   ("method", "route", "status"))
+LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency by route template",
+                    ("method", "route"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served")
+AUTH_FAILURES = Counter("auth_failures_total", "Rejected JWTs by reason", ("reason",))
+
+METRICS = [
+    REQUESTS,
+    LATENCY,
+    IN_FLIGHT,
+    AUTH_FAILURES,
+    Gauge("db_pool_connections", "Connection pool state", ("engine", "state"), collect=_pool_connections),
+    Counter("cache_hits_total", "In-process cache hits", ("cache",), collect=_cache_counter("hits")),
+    Counter("cache_misses_total", "In-process cache misses", ("cache",), collect=_cache_counter("misses")),
+    Gauge("cache_entries", "In-process cache entries", ("cache",), collect=_cache_counter("size")),
+    Gauge("cache_hit_ratio", "In-process cache hits / lookups", ("cache",), collect=_cache_hit_ratio),
+]
+
+
+def render() -> str:
+    """Todas las métricas en formato de texto de Prometheus"""
+    lines = []
+    for metric in METRICS:
+        lines += metric.header()
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+def route_template(scope) -> str:
+    """Plantilla de la ruta del request (``unmatched`` si no corresponde a ninguna)"""
+    route = scope.get("route")
+    if route is None:
+        # Respondido antes del router (p. ej. un 304 del middleware de ETag)
+        routes = getattr(scope.get("app"), "routes", ())
+        route = next((candidate for candidate in routes if candidate.matches(scope)[0] == Match.FULL), None)
+    return getattr(route, "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Middleware ASGI: cuenta requests, mide latencia y requests en curso"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # si la app falla antes de responder
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            IN_FLIGHT.dec()
+            route = route_template(scope)
+            REQUESTS.inc(scope["method"], route, str(status))
+            LATENCY.observe(elapsed, scope["method"], route)
@@ -0,0 +1,119 @@
+# app/migrate.py
+"""
+Aplica las migraciones de Alembic (``migrations/``) hasta la última versión.
+
+Uso:
+    python -m app.migrate
+
+Las bases creadas antes de tener migraciones (con ``create_all``) no tienen la
+tabla ``alembic_version``: se marcan con la revisión inicial y luego se
+aplican las siguientes.
+
+En PostgreSQL la migración se hace bajo un advisory lock: si varios workers
+arrancan a la vez, solo uno ejecuta el DDL y los demás ven la base ya migrada.
+"""
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import Connection, Engine, inspect
+
+ALEMBIC_INI = Path(__file__).resolve().parent.parent / "alembic.ini"
+BASELINE_REVISION = "0001"
+# Clave del pg_advisory_lock que serializa las migraciones (arbitraria, fija)
+MIGRATION_LOCK_KEY = 7_284_113
+MIGRATION_LOCK_POLL = 0.2  # segundos entre intentos de tomar el lock
+
+
+def include_object_for(dialect_name: str):
+    """
+    Filtro de autogenerate: ignora los índices declarados solo para otro
+    dialecto (``Index(...).ddl_if(dialect="postgresql")``).
+    """
+    def include_object(obj, name, type_, reflected, compare_to):
+        if type_ == "index" and not reflected:
+            ddl_if = getattr(obj, "_ddl_if", None)
+            if ddl_if is not None and ddl_if.dialect and ddl_if.dialect != dialect_name:
+                return False
+        return True
+    return include_object
+
+
+def alembic_config(connection=None, configure_logger: bool = True) -> Config:
+    config = Config(str(ALEMBIC_INI))
+    if connection is not None:
+        config.attributes["connection"] = connection
+    # Dentro de la app no se reemplaza la configuración de logging de uvicorn
+    config.attributes["configure_logger"] = configure_logger
+    return config
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """Última revisión de ``migrations/versions`` (se lee una vez por proceso)"""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """Revisión aplicada a la base (None si no tiene ``alembic_version``)"""
+    return MigrationContext.configure(connection).get_current_revision()
+
+
+def is_current(engine: Engine) -> bool:
+    with engine.connect() as connection:
+        return current_revision(connection) == head_revision()
+
+
+@contextmanager
+def migration_lock(engine: Engine):
+    """Un solo proceso migra a la vez (``pg_advisory_lock``; en SQLite no hace nada)"""
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    # En autocommit y con pg_try_advisory_lock: una transacción abierta o un
+    # pg_advisory_lock en espera retienen un snapshot, y CREATE INDEX
+    # CONCURRENTLY (0003) esperaría por él sin fin
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        while not connection.exec_driver_sql(f"SELECT pg_try_advisory_lock({MIGRATION_LOCK_KEY})").scalar():
+            time.sleep(MIGRATION_LOCK_POLL)
+        try:
+            yield
+        finally:
+            connection.exec_driver_sql(f"SELECT pg_advisory_unlock({MIGRATION_LOCK_KEY})")
+
+
+def ensure_schema(engine: Engine) -> bool:
+    """
+    Aplica las migraciones pendientes. Si la base ya está en la última
+    revisión solo se lee ``alembic_version`` (sin DDL) y retorna False.
+    """
+    if is_current(engine):
+        return False
+    with migration_lock(engine):
+        # Otro worker pudo migrar mientras se esperaba el lock
+        if is_current(engine):
+            return False
+        upgrade(engine, configure_logger=False)
+    return True
+
+
+def upgrade(engine: Engine, revision: str = "head", configure_logger: bool = True) -> None:
+    """Lleva la base de ``engine`` hasta ``revision``"""
+    tables = set(inspect(engine).get_table_names())
+    with engine.connect() as connection:
+        config = alembic_config(connection, configure_logger)
+        if "alembic_version" not in tables and "book" in tables:
+            command.stamp(config, BASELINE_REVISION)
+        command.upgrade(config, revision)
+        connection.commit()
+
+
+if __name__ == "__main__":
+    from app.database import engine
+    with migration_lock(engine):
+        upgrade(engine)
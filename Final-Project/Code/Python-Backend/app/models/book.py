@@ -1,7 +1,21 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, DDL, event, func, literal_column
+import sqlalchemy.dialects.postgresql  # noqa: F401 - registra to_tsvector antes de construir el índice
 from sqlalchemy.orm import relationship
 from app.database import Base
 
+# Configuración de texto de PostgreSQL usada por el índice y por las consultas.
+# Debe ser un literal (no un parámetro) para que el planner use el índice de expresión.
+SEARCH_CONFIG = literal_column("'simple'")
+
+
+def search_vector(*columns):
+    """to_tsvector('simple', col1 || ' ' || col2 ...)"""
+    document = columns[0]
+    for column in columns[1:]:
+        document = document + literal_column("' '") + column
+    return func.to_tsvector(SEARCH_CONFIG, document)
+
+
 class Book(Base):
     __tablename__ = "book"
     book_id = Column(Integer, primary_key=True, index=True)
@@ -10,7 +24,43 @@ class Book(Base):
     publication_year = Column(Integer)
     isbn = Column(String(50), unique=True, nullable=False)
     status = Column(String(20), default="available")
-    category_id = Column(Integer, ForeignKey("category.category_id"))
+    category_id = Column(Integer, ForeignKey("category.category_id"), index=True)
 
     category = relationship("Category", back_populates="books")
-    loans = relationship("Loan", back_populates="book")
\ No newline at end of file
+    loans = relationship("Loan", back_populates="book")
+
+    __table_args__ = (
+        # /books/available: índice parcial ordenado por book_id (keyset)
+        Index(
+            "ix_book_available",
+            book_id,
+            postgresql_where=status == "available",
+            sqlite_where=status == "available"
+        ),
+        # Índices de búsqueda (solo PostgreSQL): texto completo y trigramas
+        Index(
+            "ix_book_search_document",
+            search_vector(title, author),
+            postgresql_using="gin"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_book_title_trgm",
+            title,
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_book_author_trgm",
+            author,
+            postgresql_using="gin",
+            postgresql_ops={"author": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
+# pg_trgm debe existir antes de crear los índices gin_trgm_ops
+event.listen(
+    Book.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
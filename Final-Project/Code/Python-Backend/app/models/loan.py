@@ -1,11 +1,11 @@
-from sqlalchemy import Column, Integer, Date, String, ForeignKey
+from sqlalchemy import Column, Integer, Date, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 class Loan(Base):
     __tablename__ = "loan"
     loan_id = Column(Integer, primary_key=True, index=True)
-    book_id = Column(Integer, ForeignKey("book.book_id"))
+    book_id = Column(Integer, ForeignKey("book.book_id"), index=True)
     user_id = Column(Integer, ForeignKey("app_user.user_id"))
     loan_date = Column(Date)
     return_date = Column(Date)
@@ -13,3 +13,15 @@ class Loan(Base):
 
     book = relationship("Book", back_populates="loans")
     user = relationship("User", back_populates="loans")
+
+    __table_args__ = (
+        # /loans/me (user_id) y préstamos activos de un usuario (user_id, status)
+        Index("ix_loan_user_id_status", user_id, status),
+        # /loans/active: solo entra una fracción pequeña de la tabla
+        Index(
+            "ix_loan_active",
+            loan_id,
+            postgresql_where=status == "active",
+            sqlite_where=status == "active"
+        ),
+    )
@@ -5,7 +5,7 @@ from app.database import Base
 class User(Base):
     __tablename__ = "app_user"
     user_id = Column(Integer, primary_key=True, index=True)
-    auth_id = Column(Integer)
+    auth_id = Column(Integer, index=True)
     full_name = Column(String(100), nullable=False)
     email = Column(String(150), unique=True, nullable=False)
     phone = Column(String(20))
@@ -0,0 +1,91 @@
+# app/pagination.py
+"""
+Paginación por cursor (keyset) para los listados.
+
+El cursor es opaco para el cliente: codifica el último ``book_id`` entregado
+y la siguiente página se pide con ``WHERE book_id > :ultimo ORDER BY book_id``,
+por lo que el costo no crece con el número de página.
+"""
+import base64
+import binascii
+from typing import Optional
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_CURSOR_PREFIX = "k:"
+_RANK_PREFIX = "r:"
+
+
+def _encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str, prefix: str) -> list[int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid cursor")
+
+    if not raw.startswith(prefix):
+        raise ValueError("Invalid cursor")
+    try:
+        values = [int(part) for part in raw[len(prefix):].split(":")]
+    except ValueError:
+        raise ValueError("Invalid cursor")
+    if any(value < 0 for value in values):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_cursor(last_id: int) -> str:
+    """Codifica el último id entregado como cursor opaco"""
+    return _encode(f"{_CURSOR_PREFIX}{last_id}")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Decodifica un cursor; lanza ValueError si no es válido"""
+    if not cursor:
+        return None
+    values = _decode(cursor, _CURSOR_PREFIX)
+    if len(values) != 1:
+        raise ValueError("Invalid cursor")
+    return values[0]
+
+
+def encode_rank_cursor(score: int, last_id: int) -> str:
+    """Cursor para resultados ordenados por (score DESC, id ASC)"""
+    return _encode(f"{_RANK_PREFIX}{score}:{last_id}")
+
+
+def decode_rank_cursor(cursor: Optional[str]) -> Optional[tuple[int, int]]:
+    """Decodifica un cursor de búsqueda; lanza ValueError si no es válido"""
+    if not cursor:
+        return None
+    values = _decode(cursor, _RANK_PREFIX)
+    if len(values) != 2:
+        raise ValueError("Invalid cursor")
+    return values[0], values[1]
+
+
+def build_page(rows: list, limit: int, key: str) -> dict:
+    """
+    Arma el sobre de respuesta a partir de ``limit + 1`` filas.
+    La fila extra solo indica que existe una página siguiente.
+    """
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], key))
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def build_ranked_page(rows: list, limit: int, key: str) -> dict:
+    """Igual que build_page pero para filas (objeto, score) de una búsqueda"""
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        item, score = rows[-1]
+        next_cursor = encode_rank_cursor(score, getattr(item, key))
+    return {"items": [item for item, _ in rows], "next_cursor": next_cursor}
@@ -0,0 +1,142 @@
+# app/profiler.py
+"""
+Perfil de consultas SQL por request (para desarrollo y staging).
+
+Con QUERY_PROFILER activo, los eventos ``before_cursor_execute`` /
+``after_cursor_execute`` de todos los engines cuentan las sentencias del
+request en curso, su tiempo total y la más lenta. La respuesta lleva:
+
+- ``X-Query-Count``: cantidad de sentencias;
+- ``Server-Timing``: ``db`` (tiempo en la base) y ``app`` (tiempo total).
+
+Al terminar se registra un warning si la ruta supera su presupuesto de
+consultas (QUERY_BUDGET o el de QUERY_BUDGETS para esa ruta) o si una misma
+sentencia se repite QUERY_REPEAT_THRESHOLD veces o más (posible N+1).
+
+El request activo se guarda en un ContextVar: el threadpool de los handlers
+sync y el ``run_sync`` de los async copian el contexto, así que las
+consultas se atribuyen al request correcto.
+"""
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Optional
+from sqlalchemy import Engine, event
+from starlette.datastructures import MutableHeaders
+from app import config
+from app.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryProfile"]] = ContextVar("query_profile", default=None)
+
+_START_KEY = "profiler_query_start"
+
+
+class QueryProfile:
+    """Consultas ejecutadas durante un request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.slowest = (0.0, "")
+        self.statements = Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.statements[statement] += 1
+        if elapsed > self.slowest[0]:
+            self.slowest = (elapsed, statement)
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Sentencias que se repiten al menos ``threshold`` veces"""
+        return [(statement, times) for statement, times in self.statements.most_common() if times >= threshold]
+
+
+def current() -> Optional[QueryProfile]:
+    return _current.get()
+
+
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    starts = conn.info.get(_START_KEY)
+    if profile is not None and starts:
+        profile.record(statement, time.perf_counter() - starts.pop())
+
+
+def install() -> None:
+    """Registra los eventos en todos los engines (idempotente)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_execute):
+        event.listen(Engine, "before_cursor_execute", _before_execute)
+        event.listen(Engine, "after_cursor_execute", _after_execute)
+
+
+def budget_for(method: str, route: str) -> int:
+    return config.QUERY_BUDGETS.get(f"{method} {route}", config.QUERY_BUDGET)
+
+
+def server_timing(profile: QueryProfile, elapsed: float) -> str:
+    return f'db;dur={profile.total * 1000:.1f};desc="{profile.count} queries", app;dur={elapsed * 1000:.1f}'
+
+
+def _shorten(statement: str, length: int = 200) -> str:
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+class QueryProfilerMiddleware:
+    """
+    Middleware ASGI: headers de consultas por request y warnings de presupuesto.
+    ``on_request(method, route, profile)`` se llama al terminar cada request
+    (los tests lo usan para verificar presupuestos).
+    """
+
+    def __init__(self, app, on_request: Optional[Callable[[str, str, QueryProfile], None]] = None):
+        self.app = app
+        self.on_request = on_request
+        install()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        profile = QueryProfile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=list(message["headers"]))
+                message = {**message, "headers": headers.raw}
+                headers["X-Query-Count"] = str(profile.count)
+                headers.append("Server-Timing", server_timing(profile, time.perf_counter() - started))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            _current.reset(token)
+            self._report(scope, profile, time.perf_counter() - started)
+
+    def _report(self, scope, profile: QueryProfile, elapsed: float) -> None:
+        method, route = scope["method"], route_template(scope)
+        if self.on_request is not None:
+            self.on_request(method, route, profile)
+        budget = budget_for(method, route)
+        if profile.count > budget:
+            logger.warning(
+                "%s %s ran %d queries (budget %d) in %.1f ms of %.1f ms; slowest %.1f ms: %s",
+                method, route, profile.count, budget, profile.total * 1000, elapsed * 1000,
+                profile.slowest[0] * 1000, _shorten(profile.slowest[1])
+            )
+        for statement, times in profile.repeated(config.QUERY_REPEAT_THRESHOLD):
+            logger.warning("%s %s ran the same statement %d times (possible N+1): %s",
+                           method, route, times, _shorten(statement))
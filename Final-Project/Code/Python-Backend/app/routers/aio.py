@@ -0,0 +1,236 @@
+# app/routers/aio.py
+"""
+Routers async (se usan en lugar de los sync cuando DB_ASYNC está activo).
+
+Cada endpoint es ``async def`` y ejecuta el handler sync equivalente sobre la
+AsyncSession con ``run_sync``, de modo que validaciones y códigos de error son
+exactamente los mismos; la diferencia es que la E/S de base de datos no ocupa
+un hilo del threadpool mientras espera.
+"""
+from typing import Optional
+from fastapi import APIRouter, Body, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import schemas
+from app.bulk_import import ImportFormat, import_books
+from app.auth_utils import get_current_user_async, get_current_librarian_async
+from app.database import get_async_db
+from app.export import ExportFormat, async_export_response
+from app.models.book import Book
+from app.models.loan import Loan
+from app.models.user import User
+from app.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.routers import books, category, loans, stats, users
+
+
+async def _run(db: AsyncSession, handler, *args, **kwargs):
+    """Ejecuta un handler sync con la sesión sync subyacente"""
+    return await db.run_sync(lambda session: handler(*args, db=session, **kwargs))
+
+
+# ==================== BOOKS ====================
+books_router = APIRouter(prefix="/books", tags=["Books"])
+
+@books_router.get("/", response_model=schemas.BookPage)
+async def get_all_books(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _run(db, books.get_all_books, limit, cursor)
+
+@books_router.get("/available", response_model=schemas.BookPage)
+async def get_available_books(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _run(db, books.get_available_books, limit, cursor)
+
+@books_router.get("/search", response_model=schemas.BookPage)
+async def search_books(
+    search: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await _run(db, books.search_books, search, limit, cursor)
+
+@books_router.get("/batch", response_model=schemas.BookBatch)
+async def get_books_batch(ids: str, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, books.get_books_batch, ids)
+
+@books_router.post("/batch", response_model=schemas.BookBatch)
+async def post_books_batch(ids: list[int] = Body(...), db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, books.post_books_batch, ids)
+
+@books_router.get("/export")
+async def export_books(format: ExportFormat = "ndjson", db: AsyncSession = Depends(get_async_db)):
+    return async_export_response(db, Book.__table__, format, "books")
+
+@books_router.get("/{book_id}", response_model=schemas.Book)
+async def get_book(book_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, books.get_book, book_id)
+
+@books_router.post("/", response_model=schemas.Book)
+async def create_book(book: schemas.BookCreate, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, books.create_book, book)
+
+@books_router.post("/bulk", response_model=schemas.BulkImportResult)
+async def bulk_import_books(request: Request, format: ImportFormat = "ndjson", db: AsyncSession = Depends(get_async_db)):
+    return await import_books(request.stream(), format, db.run_sync)
+
+@books_router.put("/{book_id}", response_model=schemas.Book)
+async def update_book(book_id: int, book: schemas.BookCreate, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, books.update_book, book_id, book)
+
+@books_router.delete("/{book_id}")
+async def delete_book(book_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, books.delete_book, book_id)
+
+
+# ==================== CATEGORIES ====================
+category_router = APIRouter(prefix="/categories", tags=["Categories"])
+
+@category_router.get("/", response_model=list[schemas.Category])
+async def get_all_categories(db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, category.get_all_categories)
+
+@category_router.post("/", response_model=schemas.Category)
+async def create_category(category_data: schemas.CategoryCreate, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, category.create_category, category_data)
+
+
+# ==================== LOANS ====================
+loans_router = APIRouter(prefix="/loans", tags=["Loans"])
+
+@loans_router.get("/", response_model=list[schemas.Loan])
+async def get_all_loans(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_librarian_async)
+):
+    return await _run(db, loans.get_all_loans, current_user=current_user)
+
+@loans_router.get("/export")
+async def export_loans(
+    format: ExportFormat = "ndjson",
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_librarian_async)
+):
+    return async_export_response(db, Loan.__table__, format, "loans")
+
+@loans_router.get("/me", response_model=list[schemas.Loan])
+async def get_my_loans(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await _run(db, loans.get_my_loans, current_user=current_user)
+
+@loans_router.get("/active", response_model=list[schemas.Loan])
+async def get_active_loans(db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, loans.get_active_loans)
+
+@loans_router.post("/", response_model=schemas.Loan)
+async def create_loan(loan: schemas.LoanCreate, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, loans.create_loan, loan)
+
+@loans_router.put("/return/{loan_id}", response_model=schemas.Loan)
+async def return_loan(loan_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, loans.return_loan, loan_id)
+
+@loans_router.get("/{loan_id}", response_model=schemas.Loan)
+async def get_loan(loan_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, loans.get_loan, loan_id)
+
+@loans_router.delete("/{loan_id}")
+async def delete_loan(loan_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await _run(db, loans.delete_loan, loan_id)
+
+
+# ==================== STATS ====================
+stats_router = APIRouter(prefix="/stats", tags=["Statistics"])
+
+@stats_router.get("/dashboard")
+async def get_dashboard_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async)
+):
+    return await _run(db, stats.get_dashboard_stats, current_user=current_user)
+
+
+# ==================== USERS ====================
+users_router = APIRouter(prefix="/users", tags=["Users"])
+
+@users_router.get("/", response_model=list[schemas.User])
+async def get_all_users(
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return await _run(db, users.get_all_users, current_user=current_user)
+
+@users_router.get("/export")
+async def export_users(
+    format: ExportFormat = "ndjson",
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return async_export_response(db, User.__table__, format, "users")
+
+@users_router.get("/batch", response_model=schemas.UserBatch)
+async def get_users_batch(
+    ids: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return await _run(db, users.get_users_batch, ids, current_user=current_user)
+
+@users_router.post("/batch", response_model=schemas.UserBatch)
+async def post_users_batch(
+    ids: list[int] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return await _run(db, users.post_users_batch, ids, current_user=current_user)
+
+@users_router.get("/{user_id}", response_model=schemas.User)
+async def get_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return await _run(db, users.get_user, user_id, current_user=current_user)
+
+@users_router.post("/", response_model=schemas.User)
+async def create_user(
+    user: schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return await _run(db, users.create_user, user, current_user=current_user)
+
+@users_router.post("/provision", response_model=schemas.ProvisionResult)
+async def provision_users(
+    user_list: list[schemas.UserProvision],
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return await _run(db, users.provision_users, user_list, current_user=current_user)
+
+@users_router.put("/{user_id}", response_model=schemas.User)
+async def update_user(
+    user_id: int,
+    user: schemas.UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return await _run(db, users.update_user, user_id, user, current_user=current_user)
+
+@users_router.delete("/{user_id}")
+async def delete_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user = Depends(get_current_librarian_async)
+):
+    return await _run(db, users.delete_user, user_id, current_user=current_user)
+
+
+routers = [users_router, books_router, loans_router, stats_router, category_router]
@@ -1,27 +1,113 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Optional, Union
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app import schemas
+from app import batch, fast_json, schemas
+from app.bulk_import import ImportFormat, import_books
 from app.crud import books as crud_books
 from app.database import get_db
+from app.export import ExportFormat, export_response
+from app.models.book import Book
+from app.pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE,
+    decode_cursor, decode_rank_cursor, build_page, build_ranked_page
+)
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
-@router.get("/", response_model=list[schemas.Book])
-def get_all_books(db: Session = Depends(get_db)):
-    return crud_books.get_books(db)
 
-@router.get("/available", response_model=list[schemas.Book])
-def get_available_books(db: Session = Depends(get_db)):
-    return crud_books.get_available_books(db)
+def _after_id(cursor: Optional[str]) -> Optional[int]:
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/search", response_model=list[schemas.Book])
-def search_books(search: str, db: Session = Depends(get_db)):
-    return crud_books.get_books_by_filter(db, search)
+
+def _after_rank(cursor: Optional[str]) -> Optional[tuple[int, int]]:
+    try:
+        return decode_rank_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _batch(ids: Union[str, list[int]], db: Session) -> dict:
+    try:
+        return batch.resolve(ids, lambda unique: crud_books.get_books_by_ids(db, unique))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/", response_model=schemas.BookPage)
+def get_all_books(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    books = crud_books.get_books(
+        db, limit=limit + 1, after_id=_after_id(cursor),
+        entities=fast_json.entities(Book, schemas.Book)
+    )
+    return fast_json.respond(schemas.BookPage, build_page(books, limit, "book_id"))
+
+@router.get("/available", response_model=schemas.BookPage)
+def get_available_books(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    books = crud_books.get_available_books(
+        db, limit=limit + 1, after_id=_after_id(cursor),
+        entities=fast_json.entities(Book, schemas.Book)
+    )
+    return fast_json.respond(schemas.BookPage, build_page(books, limit, "book_id"))
+
+@router.get("/search", response_model=schemas.BookPage)
+def search_books(
+    search: str,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Resultados ordenados por relevancia (título > autor > categoría)"""
+    results = crud_books.search_books(db, search, limit + 1, _after_rank(cursor))
+    return fast_json.respond(schemas.BookPage, build_ranked_page(results, limit, "book_id"))
+
+@router.get("/batch", response_model=schemas.BookBatch)
+def get_books_batch(ids: str, db: Session = Depends(get_db)):
+    """Varios libros por id (``?ids=1,2,3``) en el orden pedido; ``missing`` lista los que no existen"""
+    return _batch(ids, db)
+
+@router.post("/batch", response_model=schemas.BookBatch)
+def post_books_batch(ids: list[int] = Body(...), db: Session = Depends(get_db)):
+    """Como GET /books/batch, con la lista de ids en el cuerpo (para listas largas)"""
+    return _batch(ids, db)
+
+@router.get("/export")
+def export_books(format: ExportFormat = "ndjson", db: Session = Depends(get_db)):
+    """Exporta todo el catálogo en streaming (NDJSON o CSV)"""
+    return export_response(db, Book.__table__, format, "books")
+
+@router.get("/{book_id}", response_model=schemas.Book)
+def get_book(book_id: int, db: Session = Depends(get_db)):
+    """Detalle de un libro (desde la caché en memoria, igual que los 404)"""
+    book = crud_books.get_book(db, book_id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    return book
 
 @router.post("/", response_model=schemas.Book)
 def create_book(book: schemas.BookCreate, db: Session = Depends(get_db)):
     return crud_books.create_book(db, book)
 
+@router.post("/bulk", response_model=schemas.BulkImportResult)
+async def bulk_import_books(request: Request, format: ImportFormat = "ndjson", db: Session = Depends(get_db)):
+    """Importa libros en lote (CSV o NDJSON en el cuerpo); upsert por ISBN"""
+    return await import_books(
+        request.stream(),
+        format,
+        lambda fn, *args: run_in_threadpool(fn, db, *args)
+    )
+
 @router.put("/{book_id}", response_model=schemas.Book)
 def update_book(book_id: int, book: schemas.BookCreate, db: Session = Depends(get_db)):
     updated_book = crud_books.update_book(db, book_id, book)
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from app import schemas
+from app import fast_json, schemas
 from app.crud import category as crud_category
 from app.database import get_db
 
@@ -8,7 +8,7 @@ router = APIRouter(prefix="/categories", tags=["Categories"])
 
 @router.get("/", response_model=list[schemas.Category])
 def get_all_categories(db: Session = Depends(get_db)):
-    return crud_category.get_categories(db)
+    return fast_json.respond(list[schemas.Category], crud_category.get_categories(db))
 
 
 @router.post("/", response_model=schemas.Category)
@@ -6,8 +6,10 @@ from app.database import get_db
 from app.models.user import User  # ✅ Importación explícita
 from app.models.book import Book  # ✅ Importación explícita
 from app.models.loan import Loan  # ✅ Importación explícita
-from app import schemas
+from app import fast_json, schemas
 from app.auth_utils import get_current_user, get_current_librarian
+from app.crud import loans as crud_loans
+from app.export import ExportFormat, export_response
 
 router = APIRouter(prefix="/loans", tags=["Loans"])
 
@@ -18,7 +20,18 @@ def get_all_loans(
     current_user: User = Depends(get_current_librarian)
 ):
     """Obtiene todos los préstamos (solo bibliotecarios)."""
-    return db.query(Loan).all()
+    loans = db.query(*fast_json.entities(Loan, schemas.Loan)).all()
+    return fast_json.respond(list[schemas.Loan], loans)
+
+
+@router.get("/export")
+def export_loans(
+    format: ExportFormat = "ndjson",
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_librarian)
+):
+    """Exporta todos los préstamos en streaming (solo bibliotecarios)."""
+    return export_response(db, Loan.__table__, format, "loans")
 
 
 @router.get("/me", response_model=list[schemas.Loan])
@@ -27,9 +40,10 @@ def get_my_loans(
     current_user: User = Depends(get_current_user)
 ):
     """Obtiene los préstamos del usuario autenticado."""
-    return db.query(Loan)\
+    loans = db.query(*fast_json.entities(Loan, schemas.Loan))\
         .filter(Loan.user_id == current_user.user_id)\
         .all()
+    return fast_json.respond(list[schemas.Loan], loans)
 
 
 @router.get("/active", response_model=list[schemas.Loan])
@@ -37,21 +51,14 @@ def get_active_loans(
     db: Session = Depends(get_db)
 ):
     """Obtiene todos los préstamos activos."""
-    return db.query(Loan)\
+    loans = db.query(*fast_json.entities(Loan, schemas.Loan))\
         .filter(Loan.status == "active")\
         .all()
+    return fast_json.respond(list[schemas.Loan], loans)
 
 
-@router.post("/", response_model=schemas.Loan)
-def create_loan(
-    loan: schemas.LoanCreate, 
-    db: Session = Depends(get_db)
-):
-    """
-    Crea un préstamo para cualquier usuario.
-    El user_id viene en el body del request.
-    """
-    # ✅ Verificar que el usuario objetivo existe y está activo
+def _raise_checkout_error(db: Session, loan: schemas.LoanCreate):
+    """Explica por qué no se pudo reservar el libro (404 / 400)"""
     target_user = db.query(User).filter(User.user_id == loan.user_id).first()
     if not target_user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -59,29 +66,26 @@ def create_loan(
     if target_user.status != "active":
         raise HTTPException(status_code=400, detail="User is not active")
     
-    # Verificar que el libro existe y está disponible
     book = db.query(Book).filter(Book.book_id == loan.book_id).first()
     if not book:
         raise HTTPException(status_code=404, detail="Book not found")
     
-    if book.status != "available":
-        raise HTTPException(status_code=400, detail="Book is not available")
-    
-    # ✅ Crear el préstamo con el user_id del body (usuario seleccionado)
-    new_loan = Loan(
-        book_id=loan.book_id,
-        user_id=loan.user_id,  # ✅ Usar el user_id del body
-        loan_date=loan.loan_date or datetime.now().date(),
-        status="active"
-    )
-    
-    # Cambiar el estado del libro a "loaned"
-    book.status = "loaned"
-    
-    db.add(new_loan)
-    db.commit()
-    db.refresh(new_loan)
-    
+    raise HTTPException(status_code=400, detail="Book is not available")
+
+
+@router.post("/", response_model=schemas.Loan)
+def create_loan(
+    loan: schemas.LoanCreate, 
+    db: Session = Depends(get_db)
+):
+    """
+    Crea un préstamo para cualquier usuario.
+    El user_id viene en el body del request.
+    """
+    # ✅ Reserva atómica (UPDATE condicional), con el user_id del body
+    new_loan = crud_loans.create_loan(db, loan)
+    if new_loan is None:
+        _raise_checkout_error(db, loan)
     return new_loan
 
 
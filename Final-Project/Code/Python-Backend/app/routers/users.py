@@ -1,19 +1,58 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Union
+from fastapi import APIRouter, Body, Depends, HTTPException
 from sqlalchemy.orm import Session
-from app import schemas
+from app import batch, fast_json, schemas
 from app.crud import users as crud_users
 from app.database import get_db
 from app.auth_utils import get_current_librarian
+from app.export import ExportFormat, export_response
+from app.models.user import User
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+
+def _batch(ids: Union[str, list[int]], db: Session) -> dict:
+    try:
+        return batch.resolve(ids, lambda unique: crud_users.get_users_by_ids(db, unique))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/", response_model=list[schemas.User])
 def get_all_users(
     db: Session = Depends(get_db),
     current_user = Depends(get_current_librarian)  # ✅ Solo librarians
 ):
     """Obtener todos los usuarios (solo librarians)"""
-    return crud_users.get_users(db)
+    users = crud_users.get_users(db, fast_json.entities(User, schemas.User))
+    return fast_json.respond(list[schemas.User], users)
+
+@router.get("/export")
+def export_users(
+    format: ExportFormat = "ndjson",
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_librarian)  # ✅ Solo librarians
+):
+    """Exportar todos los usuarios en streaming (solo librarians)"""
+    return export_response(db, User.__table__, format, "users")
+
+@router.get("/batch", response_model=schemas.UserBatch)
+def get_users_batch(
+    ids: str,
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_librarian)  # ✅ Solo librarians
+):
+    """Varios usuarios por id (``?ids=1,2,3``) en el orden pedido (solo librarians)"""
+    return _batch(ids, db)
+
+@router.post("/batch", response_model=schemas.UserBatch)
+def post_users_batch(
+    ids: list[int] = Body(...),
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_librarian)  # ✅ Solo librarians
+):
+    """Como GET /users/batch, con la lista de ids en el cuerpo (solo librarians)"""
+    return _batch(ids, db)
 
 @router.get("/{user_id}", response_model=schemas.User)
 def get_user(
@@ -39,6 +78,15 @@ def create_user(
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/provision", response_model=schemas.ProvisionResult)
+def provision_users(
+    users: list[schemas.UserProvision],
+    db: Session = Depends(get_db),
+    current_user = Depends(get_current_librarian)  # ✅ Solo librarians
+):
+    """Pre-registrar usuarios en lote desde el servicio de autenticación (idempotente)"""
+    return crud_users.provision_users(db, users)
+
 @router.put("/{user_id}", response_model=schemas.User)
 def update_user(
     user_id: int,
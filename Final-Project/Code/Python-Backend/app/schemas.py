@@ -30,6 +30,24 @@ class Book(BookBase):
     book_id: int
     model_config = ConfigDict(from_attributes=True)
 
+class BookPage(BaseModel):
+    items: list[Book]
+    next_cursor: Optional[str] = None
+
+class BookBatch(BaseModel):
+    items: list[Book]
+    missing: list[int]
+
+class BulkImportError(BaseModel):
+    line: int
+    error: str
+
+class BulkImportResult(BaseModel):
+    received: int
+    imported: int
+    failed: int
+    errors: list[BulkImportError]
+
 
 class UserBase(BaseModel):
     full_name: str
@@ -45,6 +63,19 @@ class User(UserBase):
     user_id: int
     model_config = ConfigDict(from_attributes=True)
 
+class UserBatch(BaseModel):
+    items: list[User]
+    missing: list[int]
+
+class UserProvision(BaseModel):
+    email: str
+    auth_id: Optional[int] = None
+    full_name: Optional[str] = None
+
+class ProvisionResult(BaseModel):
+    created: int
+    existing: int
+
 
 class LoanBase(BaseModel):
     book_id: int
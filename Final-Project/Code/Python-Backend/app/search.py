@@ -0,0 +1,224 @@
+# app/search.py
+"""
+Motor de búsqueda de libros.
+
+- PostgreSQL: índice GIN sobre ``to_tsvector('simple', title || ' ' || author)``
+  con búsqueda por prefijo, más índices de trigramas (pg_trgm) para coincidencias
+  aproximadas.
+- SQLite (desarrollo y tests): índice invertido en memoria construido a partir
+  de la tabla ``book`` y reconstruido cuando cambian libros o categorías.
+
+Ambos motores puntúan igual para que el cursor (score, book_id) sea estable:
+3 si todos los términos están en el título, 2 si están en el autor y 1 si están
+en el nombre de la categoría.
+"""
+import re
+import threading
+import weakref
+from bisect import bisect_left
+from typing import Optional
+from sqlalchemy import Engine, and_, case, func, inspect, or_, select, union
+from sqlalchemy.orm import Session
+from app.cache import invalidate_on_write
+from app.crud import category as crud_category
+from app.models.book import Book, SEARCH_CONFIG, search_vector
+from app.models.category import Category
+
+TITLE_WEIGHT = 3
+AUTHOR_WEIGHT = 2
+CATEGORY_WEIGHT = 1
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Optional[str]) -> list[str]:
+    """Separa un texto en términos en minúscula"""
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+class InvertedIndex:
+    """Índice invertido término -> ids de libro, por campo"""
+
+    FIELDS = ("title", "author", "category")
+
+    def __init__(self, rows):
+        self.postings = {field: {} for field in self.FIELDS}
+        for book_id, title, author, category_name in rows:
+            values = {"title": title, "author": author, "category": category_name}
+            for field in self.FIELDS:
+                postings = self.postings[field]
+                for token in tokenize(values[field]):
+                    postings.setdefault(token, set()).add(book_id)
+        self.vocabulary = {
+            field: sorted(postings) for field, postings in self.postings.items()
+        }
+
+    def _expand(self, field: str, term: str) -> list[str]:
+        """Términos del vocabulario que empiezan con ``term`` o, si no hay, que lo contienen"""
+        words = self.vocabulary[field]
+        start = bisect_left(words, term)
+        matches = []
+        for word in words[start:]:
+            if not word.startswith(term):
+                break
+            matches.append(word)
+        if not matches:
+            matches = [word for word in words if term in word]
+        return matches
+
+    def _ids(self, field: str, term: str) -> set:
+        postings = self.postings[field]
+        ids = set()
+        for word in self._expand(field, term):
+            ids |= postings[word]
+        return ids
+
+    def _all_terms(self, field: str, terms: list[str]) -> set:
+        result = None
+        for term in terms:
+            ids = self._ids(field, term)
+            result = ids if result is None else result & ids
+            if not result:
+                return set()
+        return result or set()
+
+    def search(self, terms: list[str]) -> list[tuple[int, int]]:
+        """Retorna [(score, book_id)] ordenado por score DESC, book_id ASC"""
+        if not terms:
+            return []
+
+        document = None
+        for term in terms:
+            ids = self._ids("title", term) | self._ids("author", term)
+            document = ids if document is None else document & ids
+        in_title = self._all_terms("title", terms)
+        in_author = self._all_terms("author", terms)
+        in_category = self._all_terms("category", terms)
+
+        scored = [
+            (
+                TITLE_WEIGHT * (book_id in in_title)
+                + AUTHOR_WEIGHT * (book_id in in_author)
+                + CATEGORY_WEIGHT * (book_id in in_category),
+                book_id
+            )
+            for book_id in (document | in_category)
+        ]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return scored
+
+
+# Un índice por engine; se descarta cuando cambian libros o categorías
+_indexes: "weakref.WeakKeyDictionary[Engine, InvertedIndex]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def invalidate(engine: Engine) -> None:
+    """Descarta el índice en memoria de un engine"""
+    with _lock:
+        _indexes.pop(engine, None)
+
+
+def _get_index(db: Session) -> InvertedIndex:
+    engine = db.get_bind().engine
+    with _lock:
+        index = _indexes.get(engine)
+    if index is None:
+        rows = db.query(Book.book_id, Book.title, Book.author, Category.name)\
+            .outerjoin(Category, Book.category_id == Category.category_id)\
+            .all()
+        index = InvertedIndex(rows)
+        with _lock:
+            _indexes[engine] = index
+    return index
+
+
+_INDEXED_ATTRS = {Book: ("title", "author", "category_id"), Category: ("name",)}
+
+
+def _touches_index(obj) -> bool:
+    # Cambios como book.status en un préstamo no afectan el índice
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _INDEXED_ATTRS[type(obj)])
+
+
+# Se descarta en el flush y otra vez en el commit/rollback: una búsqueda de
+# otra conexión entre ambos pudo reconstruir el índice con las filas anteriores
+invalidate_on_write(invalidate, Book, Category, touches=_touches_index)
+
+
+def _search_sqlite(db: Session, terms: list[str], limit: int, after: Optional[tuple[int, int]]):
+    scored = _get_index(db).search(terms)
+    if after is not None:
+        last_score, last_id = after
+        scored = [
+            (score, book_id) for score, book_id in scored
+            if score < last_score or (score == last_score and book_id > last_id)
+        ]
+    scored = scored[:limit]
+    if not scored:
+        return []
+
+    books = db.query(Book).filter(Book.book_id.in_([book_id for _, book_id in scored])).all()
+    by_id = {book.book_id: book for book in books}
+    return [(by_id[book_id], score) for score, book_id in scored if book_id in by_id]
+
+
+def _matching_category_ids(db: Session, terms: list[str]) -> list[int]:
+    """Categorías (cacheadas) con todos los términos como prefijo de alguna palabra del nombre"""
+    matches = []
+    for category in crud_category.get_categories(db):
+        words = tokenize(category.name)
+        if all(any(word.startswith(term) for word in words) for term in terms):
+            matches.append(category.category_id)
+    return matches
+
+
+def _search_postgresql(db: Session, search: str, terms: list[str], limit: int, after: Optional[tuple[int, int]]):
+    # 'term1:* & term2:*' -> búsqueda por prefijo de todos los términos
+    query = func.to_tsquery(SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+
+    in_category = Book.category_id.in_(_matching_category_ids(db, terms))
+
+    score = (
+        case((search_vector(Book.title).op("@@")(query), TITLE_WEIGHT), else_=0)
+        + case((search_vector(Book.author).op("@@")(query), AUTHOR_WEIGHT), else_=0)
+        + case((in_category, CATEGORY_WEIGHT), else_=0)
+    )
+
+    # Un OR sobre índices distintos suele terminar en seq scan; cada rama del
+    # UNION usa su propio índice (GIN tsvector, GIN trigramas, category_id).
+    matching_ids = union(
+        select(Book.book_id).where(search_vector(Book.title, Book.author).op("@@")(query)),
+        select(Book.book_id).where(Book.title.op("%")(search)),
+        select(Book.book_id).where(Book.author.op("%")(search)),
+        select(Book.book_id).where(in_category)
+    )
+
+    q = db.query(Book, score.label("score")).filter(Book.book_id.in_(matching_ids))
+    if after is not None:
+        last_score, last_id = after
+        q = q.filter(or_(score < last_score, and_(score == last_score, Book.book_id > last_id)))
+
+    rows = q.order_by(score.desc(), Book.book_id).limit(limit).all()
+    return [(book, int(row_score)) for book, row_score in rows]
+
+
+def search_books(
+    db: Session,
+    search: str,
+    limit: int,
+    after: Optional[tuple[int, int]] = None
+) -> list[tuple[Book, int]]:
+    """
+    Busca libros por título, autor o categoría.
+    Retorna hasta ``limit`` pares (libro, score) posteriores al cursor ``after``.
+    """
+    terms = tokenize(search)
+    if not terms:
+        return []
+    if db.get_bind().dialect.name == "postgresql":
+        return _search_postgresql(db, search, terms, limit, after)
+    return _search_sqlite(db, terms, limit, after)
@@ -0,0 +1,95 @@
+# app/startup.py
+"""
+Arranque de cada worker (lifespan de FastAPI).
+
+Importar ``app.main`` no abre conexiones. Al arrancar el worker:
+
+1. Con DB_MIGRATE_ON_STARTUP se aplican las migraciones pendientes; si la
+   base ya está en la última revisión solo se lee ``alembic_version``.
+2. Se abren DB_POOL_PREWARM conexiones del pool, así los primeros requests
+   no pagan el connect.
+3. El tiempo hasta estar listo queda en ``app.state.startup`` (lo muestra
+   ``/health/db``); si supera STARTUP_BUDGET_MS se registra un warning.
+
+Mientras la base no responda se reintenta hasta DB_STARTUP_TIMEOUT segundos.
+"""
+import logging
+import time
+from contextlib import AsyncExitStack, ExitStack, asynccontextmanager
+from typing import Callable, TypeVar
+from fastapi import FastAPI
+from sqlalchemy import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.concurrency import run_in_threadpool
+from app import config, database, migrate
+
+logger = logging.getLogger(__name__)
+
+RETRY_INTERVAL = 0.5
+
+T = TypeVar("T")
+
+
+def retry_until_reachable(fn: Callable[[], T], timeout: float, interval: float = RETRY_INTERVAL) -> T:
+    """Ejecuta ``fn`` reintentando mientras la base no acepte conexiones"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return fn()
+        except OperationalError as e:
+            if time.monotonic() + interval > deadline:
+                raise
+            logger.warning("Database not reachable yet (%s), retrying", type(e.orig or e).__name__)
+            time.sleep(interval)
+
+
+def _prewarm_size(pool, size: int) -> int:
+    # Las conexiones por encima de pool_size se cerrarían al devolverlas
+    limit = getattr(pool, "size", None)
+    return max(min(size, limit()) if callable(limit) else size, 0)
+
+
+def prewarm_pool(bind: Engine, size: int) -> int:
+    """Abre ``size`` conexiones a la vez y las deja libres en el pool"""
+    size = _prewarm_size(bind.pool, size)
+    with ExitStack() as stack:
+        for _ in range(size):
+            stack.enter_context(bind.connect()).exec_driver_sql("SELECT 1")
+    return size
+
+
+async def prewarm_async_pool(bind: AsyncEngine, size: int) -> int:
+    """Igual que ``prewarm_pool`` para el engine async"""
+    size = _prewarm_size(bind.sync_engine.pool, size)
+    async with AsyncExitStack() as stack:
+        for _ in range(size):
+            connection = await stack.enter_async_context(bind.connect())
+            await connection.exec_driver_sql("SELECT 1")
+    return size
+
+
+def _prepare_database() -> dict:
+    report = {"migrated": None, "prewarmed": 0}
+    if config.DB_MIGRATE_ON_STARTUP:
+        report["migrated"] = migrate.ensure_schema(database.engine)
+    if database.async_engine is None:
+        report["prewarmed"] = prewarm_pool(database.engine, config.DB_POOL_PREWARM)
+    return report
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    report = await run_in_threadpool(retry_until_reachable, _prepare_database, config.DB_STARTUP_TIMEOUT)
+    if database.async_engine is not None:
+        report["prewarmed"] = await prewarm_async_pool(database.async_engine, config.DB_POOL_PREWARM)
+
+    report["ready_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    app.state.startup = report
+    if report["ready_ms"] > config.STARTUP_BUDGET_MS:
+        logger.warning("Startup took %.0f ms (budget %.0f ms)", report["ready_ms"], config.STARTUP_BUDGET_MS)
+    else:
+        logger.info("Ready in %.0f ms (migrated=%s, prewarmed=%d)",
+                    report["ready_ms"], report["migrated"], report["prewarmed"])
+    yield
@@ -0,0 +1,109 @@
+# benchmarks/bulk_import.py
+"""
+Mide la importación masiva de libros (``app.bulk_import``) frente a la ruta
+de un libro por request (``crud.books.create_book``).
+
+Genera ``--rows`` libros en NDJSON o CSV, los pasa por ``import_books`` en
+chunks de 64 KB (como llegarían en el cuerpo del request) y reporta filas por
+segundo. La línea base importa ``--baseline`` libros con ``create_book`` y
+extrapola el tiempo para ``--rows``. Cada ejecución usa ISBNs nuevos, así que
+se miden inserciones y no actualizaciones, y al terminar borra sus libros.
+
+Por defecto se usa un archivo SQLite propio; otra base se indica con
+``--url`` (nunca se toma de DATABASE_URL).
+
+Uso:
+    python -m benchmarks.bulk_import --url postgresql+psycopg2://... --rows 100000 --max-seconds 60
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import time
+import uuid
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from app import schemas
+from app.bulk_import import import_books
+from app.crud import books as crud_books
+from app.database import Base
+from app.models.book import Book
+
+CHUNK_SIZE = 64 * 1024
+SCRATCH_URL = "sqlite:///./bulk_bench.db"
+
+
+def generate(rows: int, fmt: str, prefix: str) -> bytes:
+    records = [
+        {"title": f"Bulk title {i}", "author": f"Author {i % 997}", "isbn": f"{prefix}-{i}", "publication_year": 1900 + i % 120}
+        for i in range(rows)
+    ]
+    if fmt == "ndjson":
+        return "".join(json.dumps(record) + "\n" for record in records).encode()
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(records[0]))
+    writer.writeheader()
+    writer.writerows(records)
+    return buffer.getvalue().encode()
+
+
+async def _chunks(body: bytes):
+    for start in range(0, len(body), CHUNK_SIZE):
+        yield body[start:start + CHUNK_SIZE]
+
+
+def bulk(db, body: bytes, fmt: str) -> dict:
+    async def run(fn, *args):
+        return fn(db, *args)
+    return asyncio.run(import_books(_chunks(body), fmt, run))
+
+
+def baseline(db, rows: int, prefix: str) -> float:
+    started = time.perf_counter()
+    for i in range(rows):
+        crud_books.create_book(db, schemas.BookCreate(title=f"Single {i}", author="Author", isbn=f"{prefix}-s{i}"))
+    return time.perf_counter() - started
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=SCRATCH_URL, help="benchmark database (default: a scratch SQLite file)")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="csv")
+    parser.add_argument("--baseline", type=int, default=500, help="books imported one by one (0 = skip)")
+    parser.add_argument("--max-seconds", type=float, help="exit 1 if the bulk import is slower")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    prefix = uuid.uuid4().hex[:8]
+    try:
+        body = generate(args.rows, args.format, prefix)
+        print(f"{args.rows} books, {len(body) / 1e6:.1f} MB of {args.format}")
+
+        started = time.perf_counter()
+        report = bulk(db, body, args.format)
+        elapsed = time.perf_counter() - started
+        print(f"bulk:     {elapsed:.2f}s ({report['imported'] / elapsed:,.0f} rows/s), "
+              f"imported {report['imported']}, failed {report['failed']}")
+
+        if args.baseline:
+            single = baseline(db, args.baseline, prefix)
+            projected = single / args.baseline * args.rows
+            print(f"per-row:  {single:.2f}s for {args.baseline} books, ~{projected:.0f}s projected for {args.rows}")
+    finally:
+        db.rollback()
+        db.execute(delete(Book).where(Book.isbn.like(f"{prefix}-%")))
+        db.commit()
+        db.close()
+
+    if args.max_seconds is not None and elapsed > args.max_seconds:
+        print(f"bulk import took {elapsed:.2f}s (limit {args.max_seconds}s)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+# benchmarks/compression.py
+"""
+Costo de CPU contra bytes ahorrados de la compresión de respuestas.
+
+Genera cuerpos JSON representativos (una página de ``/books/``, la lista de
+categorías y ``/loans/`` con distintos tamaños) con los mismos schemas que la
+API y, para cada nivel de gzip y de brotli (si está instalado), mide el tiempo
+de compresión, el tamaño resultante y el tiempo total estimado (comprimir +
+transferir) en un enlace de ``--link-kbps`` kilobits por segundo.
+
+Uso:
+    python -m benchmarks.compression --link-kbps 2000
+"""
+import argparse
+import time
+from datetime import date
+from app import compression, schemas
+from app.fast_json import type_adapter
+
+GZIP_LEVELS = (1, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def payloads() -> dict[str, bytes]:
+    books = [
+        {"book_id": i, "title": f"The Collected Works Volume {i}", "author": f"Author {i % 97}",
+         "isbn": f"978-{i:010d}", "publication_year": 1900 + i % 120, "status": "available",
+         "category_id": i % 12 or None}
+        for i in range(1, 501)
+    ]
+    categories = [{"category_id": i, "name": f"Category {i}", "description": None} for i in range(1, 21)]
+
+    def loans(count):
+        return [
+            {"loan_id": i, "book_id": i, "user_id": i % 300 + 1, "loan_date": date(2024, 1 + i % 12, 1 + i % 28),
+             "return_date": None, "status": "active"}
+            for i in range(1, count + 1)
+        ]
+
+    def encode(response_type, value):
+        adapter = type_adapter(response_type)
+        return adapter.dump_json(adapter.validate_python(value))
+
+    return {
+        "categories (20)": encode(list[schemas.Category], categories),
+        "books page (500)": encode(schemas.BookPage, {"items": books, "next_cursor": "azo1MDA"}),
+        "loans (5k)": encode(list[schemas.Loan], loans(5_000)),
+        "loans (50k)": encode(list[schemas.Loan], loans(50_000)),
+    }
+
+
+def settings() -> list[tuple[str, int]]:
+    options = [("gzip", level) for level in GZIP_LEVELS]
+    if compression.brotli is not None:
+        options += [("br", quality) for quality in BROTLI_QUALITIES]
+    return options
+
+
+def best_time(fn, repeat: int) -> tuple[float, bytes]:
+    best, result = float("inf"), b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--link-kbps", type=float, default=2000, help="simulated link speed")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    bytes_per_second = args.link_kbps * 1000 / 8
+
+    if compression.brotli is None:
+        print("brotli not installed: gzip only")
+    for name, body in payloads().items():
+        identity_ms = len(body) / bytes_per_second * 1000
+        print(f"\n{name}: {len(body):,} bytes, {identity_ms:,.0f} ms to transfer uncompressed")
+        print(f"  {'encoding':10s} {'bytes':>11s} {'ratio':>6s} {'cpu ms':>8s} {'total ms':>9s}")
+        for encoding, level in settings():
+            cpu, compressed = best_time(lambda: compression.compress(body, encoding, level, level), args.repeat)
+            total_ms = cpu * 1000 + len(compressed) / bytes_per_second * 1000
+            print(f"  {encoding + '-' + str(level):10s} {len(compressed):>11,} {len(body) / len(compressed):>6.1f} "
+                  f"{cpu * 1000:>8.2f} {total_ms:>9,.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
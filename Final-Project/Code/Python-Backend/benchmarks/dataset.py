@@ -0,0 +1,337 @@
+# benchmarks/dataset.py
+"""
+Genera un dataset sintético a escala de producción (category, app_user,
+book y loan) para validar el rendimiento con volúmenes reales.
+
+Los volúmenes de referencia son 1M libros, 200k usuarios y 20M préstamos;
+``--scale`` los multiplica (por defecto 0.01) y ``--books``, ``--users`` y
+``--loans`` los fijan. Con la misma ``--seed`` el resultado es idéntico.
+
+Distribuciones:
+
+- popularidad de libros y actividad de usuarios con ley de Zipf (pocos
+  títulos y lectores concentran la mayoría de los préstamos);
+- autores de cola larga (Zipf sobre un autor cada ~8 libros) y categorías
+  con peso desigual;
+- fechas de préstamo estacionales a lo largo de ``--years`` años hasta
+  ``--end-date``: picos al inicio de cada semestre, valle en vacaciones y
+  menos movimiento el fin de semana; devolución a los ~2 semanas (lognormal);
+- ``--active-ratio`` de los libros tiene un préstamo activo reciente (uno por
+  libro, con ``book.status = 'loaned'``); el resto del historial está devuelto.
+
+Las filas se generan en chunks (sin materializar los 20M préstamos) y se
+cargan con ``COPY`` en PostgreSQL (foreign keys e índices secundarios se
+recrean al final de cada tabla, en la misma transacción) o con executemany
+en una sola transacción en SQLite. Las tablas deben estar vacías
+(``--truncate`` las vacía). Por defecto se usa un archivo SQLite propio;
+cualquier otra base se indica con ``--url`` (nunca se toma de DATABASE_URL).
+
+Uso:
+    python -m benchmarks.dataset --url postgresql+psycopg2://... --scale 1
+    python -m benchmarks.dataset --url sqlite:///./dataset_bench.db --scale 0.05 --truncate
+"""
+import argparse
+import csv
+import io
+import itertools
+import random
+import time
+from datetime import date, timedelta
+from typing import Iterator
+from sqlalchemy import Table, create_engine, delete, func, select, text
+from sqlalchemy.engine import Engine
+from app import migrate
+from app.models import Book, Category, Loan, User
+
+PRODUCTION = {"books": 1_000_000, "users": 200_000, "loans": 20_000_000}
+CHUNK_ROWS = 50_000
+SCRATCH_URL = "sqlite:///./dataset_bench.db"
+
+CATEGORIES = (
+    "Fiction", "Science Fiction", "Fantasy", "Mystery", "Romance", "History", "Biography", "Science",
+    "Mathematics", "Computer Science", "Engineering", "Philosophy", "Psychology", "Economics", "Law",
+    "Medicine", "Poetry", "Drama", "Children", "Young Adult", "Art", "Music", "Travel", "Cooking",
+    "Religion", "Politics", "Education", "Languages", "Sports", "Reference",
+)
+FIRST_NAMES = (
+    "Ana", "Luis", "María", "Juan", "Camila", "Andrés", "Laura", "Carlos", "Valentina", "Diego", "Sofía",
+    "Felipe", "Daniela", "Santiago", "Paula", "Mateo", "Isabella", "Sebastián", "Lucía", "Nicolás",
+    "Emma", "Liam", "Olivia", "Noah", "Ava", "James", "Mia", "Lucas", "Chloe", "Ethan",
+)
+LAST_NAMES = (
+    "García", "Rodríguez", "Martínez", "López", "González", "Pérez", "Sánchez", "Ramírez", "Torres",
+    "Flórez", "Rivera", "Gómez", "Díaz", "Vargas", "Castro", "Rojas", "Moreno", "Jiménez", "Herrera",
+    "Smith", "Johnson", "Brown", "Taylor", "Wilson", "Clark", "Lewis", "Walker", "Young", "King",
+)
+TITLE_WORDS = (
+    "Shadow", "River", "Garden", "Empire", "Silence", "Storm", "Memory", "City", "Night", "Ocean", "Fire",
+    "Mountain", "Dream", "Winter", "Light", "Stone", "Glass", "Forest", "Machine", "Crown", "Secret",
+    "Journey", "Mirror", "Song", "Island", "Theory", "History", "Science", "Love", "War", "Time", "Star",
+)
+TITLE_PATTERNS = (
+    "The {a} of {b}", "{a} and {b}", "A {a} in the {b}", "The Last {a}", "{a}: A {b} Story",
+    "Beyond the {a}", "Introduction to {a}", "The {a} {b}",
+)
+
+# Peso relativo de cada mes (calendario académico) y de cada día de la semana (lunes = 0)
+MONTH_WEIGHTS = (1.3, 1.6, 1.5, 1.3, 1.1, 0.6, 0.5, 1.4, 1.6, 1.4, 1.2, 0.5)
+WEEKDAY_WEIGHTS = (1.2, 1.2, 1.1, 1.1, 1.0, 0.6, 0.3)
+
+
+def zipf_cum_weights(count: int, exponent: float) -> list[float]:
+    """Pesos acumulados de Zipf (rango 1 = el más frecuente) para ``random.choices``"""
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def day_cum_weights(start: date, end: date) -> tuple[list[date], list[float]]:
+    days = [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+    weights = (MONTH_WEIGHTS[day.month - 1] * WEEKDAY_WEIGHTS[day.weekday()] for day in days)
+    return days, list(itertools.accumulate(weights))
+
+
+def isbn13(number: int) -> str:
+    digits = f"978{number:09d}"
+    check = -sum(int(digit) * (1 if index % 2 == 0 else 3) for index, digit in enumerate(digits)) % 10
+    return f"{digits}{check}"
+
+
+def chunked(rows: Iterator[dict], size: int = CHUNK_ROWS) -> Iterator[list[dict]]:
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+class Dataset:
+    """Generador determinista de filas (ids explícitos desde 1)"""
+
+    def __init__(self, books: int, users: int, loans: int, seed: int = 0, years: int = 3,
+                 end_date: date = date(2025, 6, 30), active_ratio: float = 0.03):
+        self.books, self.users, self.loans = books, users, loans
+        self.seed = seed
+        self.start_date = end_date.replace(year=end_date.year - years) + timedelta(days=1)
+        self.end_date = end_date
+        rng = self._rng("popularity")
+        # El rango de popularidad no sigue al book_id / user_id
+        self.book_by_rank = list(range(1, books + 1))
+        rng.shuffle(self.book_by_rank)
+        self.user_by_rank = list(range(1, users + 1))
+        rng.shuffle(self.user_by_rank)
+        # Los libros populares tienen más probabilidad de estar prestados ahora
+        active = min(int(books * active_ratio), loans)
+        self.active_books = self._distinct(rng, self.book_by_rank, zipf_cum_weights(books, 0.9), active)
+
+    def _rng(self, stream: str) -> random.Random:
+        return random.Random(f"{self.seed}:{stream}")
+
+    @staticmethod
+    def _distinct(rng: random.Random, population: list[int], cum_weights: list[float], count: int) -> list[int]:
+        chosen: dict[int, None] = {}
+        while len(chosen) < count:
+            for item in rng.choices(population, cum_weights=cum_weights, k=count - len(chosen)):
+                chosen.setdefault(item)
+        return list(chosen)
+
+    def category_rows(self) -> Iterator[dict]:
+        for category_id, name in enumerate(CATEGORIES, start=1):
+            yield {"category_id": category_id, "name": name, "description": f"{name} titles"}
+
+    def user_rows(self) -> Iterator[dict]:
+        rng = self._rng("users")
+        for user_id in range(1, self.users + 1):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            yield {
+                "user_id": user_id,
+                "auth_id": user_id,
+                "full_name": f"{first} {last}",
+                "email": f"reader{user_id}@library.test",
+                "phone": f"3{rng.randrange(100_000_000, 999_999_999)}",
+                "status": "active" if rng.random() < 0.97 else "inactive",
+            }
+
+    def book_rows(self) -> Iterator[dict]:
+        rng = self._rng("books")
+        authors = max(1, self.books // 8)
+        author_weights = zipf_cum_weights(authors, 1.1)
+        category_ids = list(range(1, len(CATEGORIES) + 1))
+        category_weights = zipf_cum_weights(len(CATEGORIES), 0.8)
+        loaned = set(self.active_books)
+        for book_id in range(1, self.books + 1):
+            author = rng.choices(range(authors), cum_weights=author_weights)[0]
+            title = rng.choice(TITLE_PATTERNS).format(a=rng.choice(TITLE_WORDS), b=rng.choice(TITLE_WORDS))
+            yield {
+                "book_id": book_id,
+                "title": f"{title} {book_id}" if rng.random() < 0.5 else title,
+                "author": f"{FIRST_NAMES[author % len(FIRST_NAMES)]} {LAST_NAMES[author // len(FIRST_NAMES) % len(LAST_NAMES)]} {author}",
+                "publication_year": min(2025, int(rng.triangular(1850, 2025, 2012))),
+                "isbn": isbn13(book_id),
+                "status": "loaned" if book_id in loaned else "available",
+                "category_id": rng.choices(category_ids, cum_weights=category_weights)[0],
+            }
+
+    def loan_rows(self) -> Iterator[dict]:
+        rng = self._rng("loans")
+        book_weights = zipf_cum_weights(self.books, 0.9)
+        user_weights = zipf_cum_weights(self.users, 0.8)
+        days, day_weights = day_cum_weights(self.start_date, self.end_date - timedelta(days=21))
+        history = self.loans - len(self.active_books)
+
+        loan_id = 0
+        for offset in range(0, history, CHUNK_ROWS):
+            size = min(CHUNK_ROWS, history - offset)
+            book_ids = rng.choices(self.book_by_rank, cum_weights=book_weights, k=size)
+            user_ids = rng.choices(self.user_by_rank, cum_weights=user_weights, k=size)
+            loan_dates = rng.choices(days, cum_weights=day_weights, k=size)
+            for book_id, user_id, loan_date in zip(book_ids, user_ids, loan_dates):
+                loan_id += 1
+                duration = timedelta(days=min(90, 1 + int(rng.lognormvariate(2.6, 0.5))))
+                yield {
+                    "loan_id": loan_id,
+                    "book_id": book_id,
+                    "user_id": user_id,
+                    "loan_date": loan_date,
+                    "return_date": min(loan_date + duration, self.end_date),
+                    "status": "returned",
+                }
+
+        # Un préstamo activo por libro prestado, de las últimas tres semanas
+        for book_id in self.active_books:
+            loan_id += 1
+            yield {
+                "loan_id": loan_id,
+                "book_id": book_id,
+                "user_id": rng.choices(self.user_by_rank, cum_weights=user_weights)[0],
+                "loan_date": self.end_date - timedelta(days=rng.randrange(21)),
+                "return_date": None,
+                "status": "active",
+            }
+
+    def tables(self) -> list[tuple[Table, Iterator[dict]]]:
+        """Tablas en orden de carga (respetando las foreign keys)"""
+        return [
+            (Category.__table__, self.category_rows()),
+            (User.__table__, self.user_rows()),
+            (Book.__table__, self.book_rows()),
+            (Loan.__table__, self.loan_rows()),
+        ]
+
+
+# ==================== CARGA ====================
+# Índices que no respaldan una constraint (PK / UNIQUE): se pueden borrar y recrear
+SECONDARY_INDEXES = """
+    SELECT indexname, indexdef FROM pg_indexes AS i
+    WHERE schemaname = current_schema() AND tablename = %s
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conindid = quote_ident(i.indexname)::regclass)
+"""
+FOREIGN_KEYS = "SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE conrelid = %s::regclass AND contype = 'f'"
+
+
+def _copy_postgresql(engine: Engine, table: Table, rows: Iterator[dict]) -> int:
+    columns = [column.name for column in table.columns]
+    sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    loaded = 0
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cursor:
+            # Validar las foreign keys y construir los índices al final (una pasada)
+            # es mucho más rápido que hacerlo fila a fila durante el COPY
+            cursor.execute(FOREIGN_KEYS, (table.name,))
+            foreign_keys = cursor.fetchall()
+            for name, _ in foreign_keys:
+                cursor.execute(f"ALTER TABLE {table.name} DROP CONSTRAINT {name}")
+            cursor.execute(SECONDARY_INDEXES, (table.name,))
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f"DROP INDEX {name}")
+            for chunk in chunked(rows):
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                # NULL en CSV es el campo vacío sin comillas
+                writer.writerows([["" if row[column] is None else row[column] for column in columns] for row in chunk])
+                buffer.seek(0)
+                cursor.copy_expert(sql, buffer)
+                loaded += len(chunk)
+            for _, definition in indexes:
+                cursor.execute(definition)
+            for name, definition in foreign_keys:
+                cursor.execute(f"ALTER TABLE {table.name} ADD CONSTRAINT {name} {definition}")
+            # Los ids son explícitos: la secuencia sigue desde el máximo
+            primary_key = table.primary_key.columns.values()[0].name
+            cursor.execute(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{primary_key}'), "
+                f"COALESCE(MAX({primary_key}), 1)) FROM {table.name}"
+            )
+        raw.commit()
+    finally:
+        raw.close()
+    return loaded
+
+
+def _insert_many(engine: Engine, table: Table, rows: Iterator[dict]) -> int:
+    loaded = 0
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.exec_driver_sql("PRAGMA synchronous = OFF")
+        for chunk in chunked(rows):
+            conn.execute(table.insert(), chunk)
+            loaded += len(chunk)
+    return loaded
+
+
+def load(engine: Engine, dataset: Dataset) -> dict[str, tuple[int, float]]:
+    """Carga todas las tablas; devuelve tabla -> (filas, segundos)"""
+    loader = _copy_postgresql if engine.dialect.name == "postgresql" else _insert_many
+    report = {}
+    for table, rows in dataset.tables():
+        started = time.perf_counter()
+        report[table.name] = (loader(engine, table, rows), time.perf_counter() - started)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    return report
+
+
+def truncate(engine: Engine) -> None:
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("TRUNCATE loan, book, app_user, category"))
+            return
+        for model in (Loan, Book, User, Category):
+            conn.execute(delete(model))
+
+
+def is_empty(engine: Engine) -> bool:
+    with engine.connect() as conn:
+        return all(conn.scalar(select(func.count()).select_from(model)) == 0 for model in (Loan, Book, User, Category))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=SCRATCH_URL, help="benchmark database (default: a scratch SQLite file)")
+    parser.add_argument("--scale", type=float, default=0.01, help="fraction of 1M books / 200k users / 20M loans")
+    parser.add_argument("--books", type=int)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--loans", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--years", type=int, default=3, help="years of loan history")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date(2025, 6, 30))
+    parser.add_argument("--active-ratio", type=float, default=0.03, help="fraction of books currently on loan")
+    parser.add_argument("--truncate", action="store_true", help="delete existing rows first")
+    args = parser.parse_args()
+
+    volumes = {name: getattr(args, name) or max(1, int(count * args.scale)) for name, count in PRODUCTION.items()}
+    engine = create_engine(args.url)
+    migrate.ensure_schema(engine)
+    if args.truncate:
+        truncate(engine)
+    elif not is_empty(engine):
+        parser.error("the tables already have rows (use --truncate)")
+
+    dataset = Dataset(**volumes, seed=args.seed, years=args.years, end_date=args.end_date,
+                      active_ratio=args.active_ratio)
+    print(f"{engine.dialect.name}: {volumes['books']:,} books, {volumes['users']:,} users, {volumes['loans']:,} loans")
+    for table, (rows, seconds) in load(engine, dataset).items():
+        print(f"  {table:10s} {rows:>12,} rows {seconds:>8.1f} s {rows / max(seconds, 1e-9):>12,.0f} rows/s")
+    engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,274 @@
+# benchmarks/load.py
+"""
+Prueba de carga con escenarios autenticados.
+
+Los planes de JMeter (``Workshop4/jmeter``) solo cubren rutas públicas porque
+no pueden generar JWT. Acá cada usuario virtual firma su token con la misma
+clave que valida la API (``auth_utils.DECODED_KEY``) y repite, durante
+``--duration`` segundos, escenarios elegidos según ``--mix``:
+
+- ``browse``: ``/books/`` (dos páginas), ``/books/available``, ``/categories/``;
+- ``search``: ``/books/search`` con un término al azar;
+- ``checkout``: un libro disponible -> ``POST /loans/`` -> ``/loans/me``;
+- ``return``: ``/loans/me`` -> ``PUT /loans/return/{loan_id}``;
+- ``admin``: ``/users/``, ``/loans/``, ``/loans/active``, ``/stats/dashboard``.
+
+Antes de medir se preparan los datos por la API: el bibliotecario y los
+lectores se registran (``/loans/me`` y ``/users/provision``) y, si hay menos
+de ``--books`` libros (según el COUNT de ``/stats/dashboard``), se cargan por
+``/books/bulk``.
+
+Por defecto la app corre en el mismo proceso (httpx sobre ASGI, con su
+lifespan) contra un archivo SQLite propio; otra base se indica con
+``--database-url`` (nunca se toma de DATABASE_URL). Con ``--url`` se prueba
+un servidor ya levantado. El reporte lista p50/p95/p99 y requests por segundo por endpoint.
+
+Uso:
+    python -m benchmarks.load --database-url postgresql+psycopg2://... --users 20 --duration 30
+    python -m benchmarks.load --url http://localhost:8000 --mix browse=5,checkout=2,return=2,admin=1
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import httpx
+import jwt
+
+ADMIN_EMAIL = "load-admin@library.test"
+READER_EMAIL = "load-reader-{}@library.test"
+SEARCH_TERMS = ("history", "science", "love", "war", "garden", "city", "night", "music", "1984", "python")
+SCRATCH_URL = "sqlite:///./load_bench.db"
+
+# Respuestas esperables bajo carga (columna "taken"): dos lectores pueden pedir el mismo libro
+EXPECTED_CONFLICTS = {"POST /loans/": {400}, "PUT /loans/return/{loan_id}": {400}}
+
+
+def mint_token(email: str, rol: str = "USER", user_id: int = 0, ttl: timedelta = timedelta(hours=2)) -> str:
+    """JWT firmado como los emite el servicio de autenticación"""
+    from app.auth_utils import ALGORITHM, DECODED_KEY
+    payload = {"id": user_id, "username": email, "rol": rol, "exp": datetime.now(timezone.utc) + ttl}
+    return jwt.encode(payload, DECODED_KEY, algorithm=ALGORITHM)
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentil por rango más cercano de una lista ya ordenada"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def parse_mix(value: str) -> dict[str, int]:
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name.strip()!r} (use {', '.join(SCENARIOS)})")
+        mix[name.strip()] = int(weight or 1)
+    return mix
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    conflicts: int = 0
+
+
+class Recorder:
+    """Latencias por endpoint (nombre con la plantilla de la ruta)"""
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStats] = {}
+
+    def add(self, name: str, elapsed: float, status: Optional[int]) -> None:
+        stats = self.endpoints.setdefault(name, EndpointStats())
+        stats.latencies.append(elapsed)
+        if status is None or status >= 500 or (status >= 400 and status not in EXPECTED_CONFLICTS.get(name, ())):
+            stats.errors += 1
+        elif status >= 400:
+            stats.conflicts += 1
+
+    def summary(self, duration: float) -> list[dict]:
+        rows = []
+        for name, stats in sorted(self.endpoints.items()):
+            latencies = sorted(stats.latencies)
+            rows.append({
+                "endpoint": name,
+                "requests": len(latencies),
+                "rps": round(len(latencies) / duration, 1),
+                "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+                "errors": stats.errors,
+                "conflicts": stats.conflicts,
+            })
+        return rows
+
+
+class VirtualUser:
+    """Un lector (o el bibliotecario) con su token y su cliente HTTP"""
+
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, token: str, user_id: Optional[int], rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.user_id = user_id
+        self.rng = rng
+
+    async def request(self, method: str, path: str, name: Optional[str] = None, **kwargs) -> Optional[httpx.Response]:
+        name = name or f"{method} {path.split('?')[0]}"
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, path, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.add(name, time.perf_counter() - started, None)
+            return None
+        self.recorder.add(name, time.perf_counter() - started, response.status_code)
+        return response
+
+
+# ==================== ESCENARIOS ====================
+async def browse(user: VirtualUser) -> None:
+    page = await user.request("GET", "/books/?limit=50")
+    if page is not None and page.status_code == 200 and page.json()["next_cursor"]:
+        await user.request("GET", f"/books/?limit=50&cursor={page.json()['next_cursor']}")
+    await user.request("GET", "/books/available?limit=50")
+    await user.request("GET", "/categories/")
+
+
+async def search(user: VirtualUser) -> None:
+    await user.request("GET", f"/books/search?search={user.rng.choice(SEARCH_TERMS)}")
+
+
+async def checkout(user: VirtualUser) -> None:
+    available = await user.request("GET", "/books/available?limit=100")
+    if available is None or available.status_code != 200 or not available.json()["items"]:
+        return
+    book = user.rng.choice(available.json()["items"])
+    await user.request("POST", "/loans/", json={"book_id": book["book_id"], "user_id": user.user_id})
+    await user.request("GET", "/loans/me")
+
+
+async def return_book(user: VirtualUser) -> None:
+    mine = await user.request("GET", "/loans/me")
+    if mine is None or mine.status_code != 200:
+        return
+    active = [loan for loan in mine.json() if loan["status"] == "active"]
+    if active:
+        loan = user.rng.choice(active)
+        await user.request("PUT", f"/loans/return/{loan['loan_id']}", name="PUT /loans/return/{loan_id}")
+
+
+async def admin(user: VirtualUser) -> None:
+    await user.request("GET", "/users/")
+    await user.request("GET", "/loans/")
+    await user.request("GET", "/loans/active")
+    await user.request("GET", "/stats/dashboard")
+
+
+SCENARIOS = {"browse": browse, "search": search, "checkout": checkout, "return": return_book, "admin": admin}
+ADMIN_SCENARIOS = {"admin"}
+
+
+# ==================== PREPARACIÓN ====================
+async def prepare(client: httpx.AsyncClient, readers: int, books: int) -> tuple[str, dict[str, int]]:
+    """Registra bibliotecario y lectores, carga libros; devuelve token admin y email -> user_id"""
+    admin_token = mint_token(ADMIN_EMAIL, rol="ADMIN")
+    headers = {"Authorization": f"Bearer {admin_token}"}
+    (await client.get("/loans/me", headers=headers)).raise_for_status()  # registra al bibliotecario
+
+    emails = [READER_EMAIL.format(index) for index in range(readers)]
+    response = await client.post("/users/provision", headers=headers,
+                                 json=[{"email": email, "full_name": f"Load Reader {index}"} for index, email in enumerate(emails)])
+    response.raise_for_status()
+    response = await client.get("/users/", headers=headers)
+    response.raise_for_status()
+    user_ids = {user["email"]: user["user_id"] for user in response.json()}
+
+    response = await client.get("/stats/dashboard", headers=headers)
+    response.raise_for_status()
+    if response.json()["total_books"] < books:
+        rows = "\n".join(f"Load Book {index} {SEARCH_TERMS[index % len(SEARCH_TERMS)]},Author {index % 50},LOAD-{index}"
+                         for index in range(books))
+        response = await client.post("/books/bulk?format=csv", content=f"title,author,isbn\n{rows}\n")
+        response.raise_for_status()
+    return admin_token, {email: user_ids[email] for email in emails}
+
+
+@asynccontextmanager
+async def open_client(url: Optional[str]):
+    """Cliente HTTP contra ``url`` o contra la app en este proceso (con su lifespan)"""
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+            yield client
+        return
+
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=30) as client:
+            yield client
+
+
+async def run(url: Optional[str], users: int, duration: float, mix: dict[str, int], books: int, seed: int) -> tuple[list[dict], float]:
+    recorder = Recorder()
+    async with open_client(url) as client:
+        admin_token, readers = await prepare(client, users, books)
+        names, weights = list(mix), list(mix.values())
+        deadline = time.perf_counter() + duration
+
+        async def loop(index: int, email: str) -> None:
+            rng = random.Random(seed + index)
+            reader = VirtualUser(client, recorder, mint_token(email), readers[email], rng)
+            librarian = VirtualUser(client, recorder, admin_token, None, rng)
+            while time.perf_counter() < deadline:
+                name = rng.choices(names, weights)[0]
+                await SCENARIOS[name](librarian if name in ADMIN_SCENARIOS else reader)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(loop(index, email) for index, email in enumerate(readers)))
+        elapsed = time.perf_counter() - started
+    return recorder.summary(elapsed), elapsed
+
+
+def print_report(rows: list[dict], elapsed: float) -> None:
+    total = sum(row["requests"] for row in rows)
+    print(f"{total:,} requests in {elapsed:.1f} s ({total / elapsed:,.1f} req/s)\n")
+    print(f"{'endpoint':32s} {'requests':>9s} {'req/s':>8s} {'p50 ms':>8s} {'p95 ms':>8s} {'p99 ms':>8s} {'errors':>7s} {'taken':>7s}")
+    for row in rows:
+        print(f"{row['endpoint']:32s} {row['requests']:>9,} {row['rps']:>8,.1f} {row['p50_ms']:>8.1f} "
+              f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['errors']:>7} {row['conflicts']:>7}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="base URL of a running API (default: run the app in-process)")
+    parser.add_argument("--database-url", default=SCRATCH_URL,
+                        help="database for the in-process app (default: a scratch SQLite file)")
+    parser.add_argument("--users", type=int, default=10, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds of load")
+    parser.add_argument("--mix", type=parse_mix, default="browse=4,search=3,checkout=2,return=2,admin=1")
+    parser.add_argument("--books", type=int, default=200, help="minimum catalog size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"] = args.database_url  # antes de importar la app
+
+    rows, elapsed = asyncio.run(run(args.url, args.users, args.duration, args.mix, args.books, args.seed))
+    print_report(rows, elapsed)
+    if args.json:
+        with open(args.json, "w") as output:
+            json.dump({"duration_s": round(elapsed, 3), "users": args.users, "endpoints": rows}, output, indent=2)
+    return 1 if any(row["errors"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,174 @@
+# benchmarks/search_plan.py
+"""
+Compara los planes de ejecución de la búsqueda de libros sobre un catálogo grande.
+
+Siembra (una sola vez) ``--rows`` libros en la base indicada y, para cada
+variante de la consulta, muestra el plan, el tiempo mediano y si recorre
+``book`` completo:
+
+- legacy: el JOIN interno + cadena de OR original
+- engine: ``app.search.search_books`` (tsvector/trigramas o índice en memoria)
+
+Uso:
+    python -m benchmarks.search_plan --url postgresql+psycopg2://... --rows 500000 --check
+
+En SQLite un ``LIKE '%x%'`` nunca puede usar un índice B-tree, así que la
+comprobación de seq scans solo es significativa en PostgreSQL con pg_trgm.
+Por defecto se usa un archivo SQLite propio: PostgreSQL (o cualquier otra
+base) se indica con ``--url``, nunca se toma de DATABASE_URL.
+"""
+import argparse
+import random
+import statistics
+import time
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from app.database import Base
+from app.models import Book, Category
+from app import search as search_engine
+
+WORDS = [
+    "shadow", "river", "empire", "garden", "silent", "winter", "glass", "storm",
+    "memory", "ocean", "letters", "stone", "fire", "night", "city", "dream",
+    "island", "machine", "forest", "crown", "secret", "journey", "mirror", "light",
+]
+SURNAMES = [
+    "garcia", "martinez", "lopez", "smith", "orwell", "tolkien", "herbert",
+    "austen", "marquez", "borges", "woolf", "kafka", "atwood", "morrison",
+]
+BATCH_SIZE = 10_000
+SCRATCH_URL = "sqlite:///./search_bench.db"
+
+
+def seed(engine, rows: int, seed_value: int = 42) -> None:
+    """Crea el esquema y completa la tabla book hasta ``rows`` filas"""
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(seed_value)
+
+    with engine.begin() as conn:
+        existing = conn.execute(select(func.count()).select_from(Book)).scalar()
+        if existing >= rows:
+            return
+        category_ids = conn.execute(select(Category.category_id)).scalars().all()
+        if not category_ids:
+            conn.execute(insert(Category), [
+                {"name": f"Category {i} {WORDS[i % len(WORDS)]}", "description": None}
+                for i in range(50)
+            ])
+            category_ids = conn.execute(select(Category.category_id)).scalars().all()
+
+        for start in range(existing, rows, BATCH_SIZE):
+            batch = []
+            for i in range(start, min(start + BATCH_SIZE, rows)):
+                batch.append({
+                    "title": " ".join(rng.sample(WORDS, 3)).title(),
+                    "author": f"{rng.choice(SURNAMES).title()} {rng.randint(1, 5000)}",
+                    "isbn": f"BENCH-{i:09d}",
+                    "status": "available",
+                    # ~5% sin categoría, justo los que el JOIN interno perdía
+                    "category_id": None if rng.random() < 0.05 else rng.choice(category_ids),
+                })
+            conn.execute(insert(Book), batch)
+
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.exec_driver_sql("ANALYZE book")
+            conn.exec_driver_sql("ANALYZE category")
+
+
+def legacy_filter(db, search: str):
+    term = f"%{search.lower()}%"
+    return db.query(Book).join(Category).filter(
+        (Book.title.ilike(term)) |
+        (Book.author.ilike(term)) |
+        (Category.name.ilike(term))
+    ).order_by(Book.book_id).limit(50).all()
+
+
+VARIANTS = {
+    "legacy": legacy_filter,
+    "engine": lambda db, search: search_engine.search_books(db, search, 50),
+}
+
+
+def explain(db, fn, search: str):
+    """Ejecuta ``fn`` capturando su última sentencia y retorna el plan"""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    connection = db.connection()
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        fn(db, search)
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+    statement, parameters = captured[-1]
+    if connection.dialect.name == "postgresql":
+        prefix = "EXPLAIN (ANALYZE, BUFFERS) "
+    else:
+        prefix = "EXPLAIN QUERY PLAN "
+    rows = connection.exec_driver_sql(prefix + statement, parameters).fetchall()
+    return [str(row[-1]) for row in rows]
+
+
+def full_scan(plan: list[str]) -> bool:
+    for line in plan:
+        if "Seq Scan on book" in line:
+            return True
+        if line.strip().startswith("SCAN book") and "USING" not in line:
+            return True
+    return False
+
+
+def run(url: str, rows: int, terms: list[str], repeat: int, check: bool) -> int:
+    engine = create_engine(url)
+    print(f"Seeding {rows} books into {engine.url.render_as_string(hide_password=True)} ...")
+    started = time.perf_counter()
+    seed(engine, rows)
+    print(f"  ready in {time.perf_counter() - started:.1f}s")
+
+    db = sessionmaker(bind=engine)()
+    failures = 0
+    try:
+        for term in terms:
+            print(f"\n=== search={term!r}")
+            for name, fn in VARIANTS.items():
+                fn(db, term)  # calentar cachés / índice en memoria
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    results = fn(db, term)
+                    timings.append((time.perf_counter() - started) * 1000)
+                plan = explain(db, fn, term)
+                scanned = full_scan(plan)
+                print(f"--- {name}: {len(results)} rows, median {statistics.median(timings):.2f} ms, "
+                      f"max {max(timings):.2f} ms, full scan of book: {'YES' if scanned else 'no'}")
+                for line in plan:
+                    print(f"      {line}")
+                if check and name != "legacy" and scanned:
+                    failures += 1
+    finally:
+        db.close()
+
+    if check and failures:
+        print(f"\n{failures} query variant(s) fell back to a full scan of book")
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=SCRATCH_URL, help="benchmark database (default: a scratch SQLite file)")
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--term", action="append", dest="terms")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--check", action="store_true", help="exit 1 if a new variant scans book")
+    args = parser.parse_args()
+    return run(args.url, args.rows, args.terms or ["orwell", "storm", "category 7"], args.repeat, args.check)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+# benchmarks/serialization.py
+"""
+Compara la serialización de los listados con y sin FAST_JSON.
+
+Carga ``--rows`` préstamos activos (y sus libros) y mide ``GET /loans/active``
+y ``GET /books/?limit=500`` con la ruta por defecto (objetos ORM validados
+por el ``response_model`` y codificados en una segunda pasada) y con la ruta
+rápida de ``app.fast_json`` (columnas + ``TypeAdapter`` cacheado). Cada
+medición es la mejor de ``--repeat`` requests; también se verifica que ambas
+rutas respondan el mismo JSON.
+
+Por defecto usa un archivo SQLite propio; para otra base hay que pasar
+``--url`` (nunca toma DATABASE_URL). Las tablas deben estar vacías, salvo
+con ``--truncate``, que borra sus filas.
+
+Uso:
+    python -m benchmarks.serialization --url postgresql+psycopg2://.../bench --rows 50000 --truncate
+"""
+import argparse
+import json
+import os
+import time
+from datetime import date
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+SCRATCH_URL = "sqlite:///./serialization_bench.db"
+PATHS = ("/loans/active", "/books/?limit=500")
+
+
+def seed(db, rows: int) -> None:
+    from app.models.book import Book
+    from app.models.loan import Loan
+    from app.models.user import User
+    user = User(full_name="Bench Reader", email="bench@library.com", status="active")
+    db.add(user)
+    db.flush()
+    db.execute(Book.__table__.insert(), [
+        {"book_id": i, "title": f"Title {i}", "author": f"Author {i % 997}", "isbn": f"SER-{i}",
+         "publication_year": 1900 + i % 120, "status": "loaned"}
+        for i in range(1, rows + 1)
+    ])
+    db.execute(Loan.__table__.insert(), [
+        {"book_id": i, "user_id": user.user_id, "loan_date": date(2024, 1, 1), "status": "active"}
+        for i in range(1, rows + 1)
+    ])
+    if db.get_bind().dialect.name == "postgresql":
+        # Los ids son explícitos: la secuencia sigue desde el máximo
+        db.execute(text("SELECT setval(pg_get_serial_sequence('book', 'book_id'), (SELECT MAX(book_id) FROM book))"))
+    db.commit()
+
+
+def best_of(client: TestClient, path: str, repeat: int) -> tuple[float, bytes]:
+    best, body = float("inf"), b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        best = min(best, time.perf_counter() - started)
+        response.raise_for_status()
+        body = response.content
+    return best, body
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=SCRATCH_URL, help="benchmark database (default: a scratch SQLite file)")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--truncate", action="store_true", help="delete existing rows first")
+    args = parser.parse_args()
+    # La app (y las migraciones de su lifespan) usan la base del benchmark
+    os.environ["DATABASE_URL"] = args.url
+
+    from app import config, migrate
+    from app.database import SessionLocal, engine
+    from app.main import app
+    from benchmarks.dataset import is_empty, truncate
+
+    migrate.ensure_schema(engine)
+    if args.truncate:
+        truncate(engine)
+    elif not is_empty(engine):
+        parser.error("the tables already have rows (use --truncate)")
+    with SessionLocal() as db:
+        seed(db, args.rows)
+
+    fast_json_setting = config.FAST_JSON
+    try:
+        with TestClient(app) as client:
+            for path in PATHS:
+                config.FAST_JSON = False
+                default, default_body = best_of(client, path, args.repeat)
+                config.FAST_JSON = True
+                fast, fast_body = best_of(client, path, args.repeat)
+                same = "same payload" if json.loads(default_body) == json.loads(fast_body) else "PAYLOAD DIFFERS"
+                print(f"{path:20s} default {default * 1000:8.1f} ms   fast {fast * 1000:8.1f} ms   "
+                      f"x{default / fast:.1f}   ({len(fast_body) / 1e6:.1f} MB, {same})")
+    finally:
+        config.FAST_JSON = fast_json_setting
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+# migrations/env.py
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from app import config as app_config
+from app.migrate import include_object_for
+from app.models import Base
+
+config = context.config
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def _configure(dialect_name: str, **kwargs):
+    context.configure(
+        target_metadata=target_metadata,
+        include_object=include_object_for(dialect_name),
+        compare_type=True,
+        render_as_batch=dialect_name == "sqlite",
+        **kwargs
+    )
+
+
+def run_migrations_offline() -> None:
+    """Genera el SQL sin conectarse (alembic upgrade head --sql)"""
+    url = config.get_main_option("sqlalchemy.url") or app_config.DATABASE_URL
+    _configure(make_url(url).get_backend_name(), url=url, literal_binds=True, dialect_opts={"paramstyle": "named"})
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    # Una conexión ya abierta (tests, app.migrate) tiene prioridad sobre la URL
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        _configure(connection.dialect.name, connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+        return
+
+    url = config.get_main_option("sqlalchemy.url") or app_config.DATABASE_URL
+    engine = create_engine(url)
+    with engine.connect() as connection:
+        _configure(connection.dialect.name, connection=connection)
+        with context.begin_transaction():
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
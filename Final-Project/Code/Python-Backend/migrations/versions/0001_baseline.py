@@ -0,0 +1,64 @@
+"""Esquema inicial (tablas creadas antes con Base.metadata.create_all)
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-10-20
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "category",
+        sa.Column("category_id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("description", sa.String()),
+    )
+    op.create_index("ix_category_category_id", "category", ["category_id"])
+
+    op.create_table(
+        "app_user",
+        sa.Column("user_id", sa.Integer(), primary_key=True),
+        sa.Column("auth_id", sa.Integer()),
+        sa.Column("full_name", sa.String(100), nullable=False),
+        sa.Column("email", sa.String(150), nullable=False, unique=True),
+        sa.Column("phone", sa.String(20)),
+        sa.Column("status", sa.String(20)),
+    )
+    op.create_index("ix_app_user_user_id", "app_user", ["user_id"])
+
+    op.create_table(
+        "book",
+        sa.Column("book_id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(150), nullable=False),
+        sa.Column("author", sa.String(100), nullable=False),
+        sa.Column("publication_year", sa.Integer()),
+        sa.Column("isbn", sa.String(50), nullable=False, unique=True),
+        sa.Column("status", sa.String(20)),
+        sa.Column("category_id", sa.Integer(), sa.ForeignKey("category.category_id")),
+    )
+    op.create_index("ix_book_book_id", "book", ["book_id"])
+
+    op.create_table(
+        "loan",
+        sa.Column("loan_id", sa.Integer(), primary_key=True),
+        sa.Column("book_id", sa.Integer(), sa.ForeignKey("book.book_id")),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("app_user.user_id")),
+        sa.Column("loan_date", sa.Date()),
+        sa.Column("return_date", sa.Date()),
+        sa.Column("status", sa.String(20)),
+    )
+    op.create_index("ix_loan_loan_id", "loan", ["loan_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("loan")
+    op.drop_table("book")
+    op.drop_table("app_user")
+    op.drop_table("category")
@@ -0,0 +1,45 @@
+"""Índices de búsqueda de libros (categoría, texto completo y trigramas)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-10-21
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS: las bases creadas con create_all ya pueden tener estos índices
+    op.create_index("ix_book_category_id", "book", ["category_id"], if_not_exists=True)
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_book_search_document",
+        "book",
+        [sa.text("to_tsvector('simple', title || ' ' || author)")],
+        postgresql_using="gin",
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_book_title_trgm", "book", ["title"],
+        postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}, if_not_exists=True
+    )
+    op.create_index(
+        "ix_book_author_trgm", "book", ["author"],
+        postgresql_using="gin", postgresql_ops={"author": "gin_trgm_ops"}, if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_book_author_trgm", table_name="book")
+        op.drop_index("ix_book_title_trgm", table_name="book")
+        op.drop_index("ix_book_search_document", table_name="book")
+    op.drop_index("ix_book_category_id", table_name="book")
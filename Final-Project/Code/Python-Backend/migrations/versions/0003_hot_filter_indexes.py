@@ -0,0 +1,54 @@
+"""Índices de las columnas filtradas en cada request
+
+- loan(user_id, status): /loans/me
+- loan(book_id): devolución y borrado de préstamos por libro
+- loan(loan_id) WHERE status = 'active': /loans/active y el dashboard
+- book(book_id) WHERE status = 'available': /books/available (keyset por book_id)
+- app_user(auth_id): get_user_by_auth_id
+
+En PostgreSQL se crean con CONCURRENTLY para no bloquear escrituras. IF NOT
+EXISTS cubre las bases creadas con el antiguo ``create_all``: se marcan con la
+revisión inicial (app/migrate.py) pero sus tablas pueden traer ya estos índices.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-10-24
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+ACTIVE = sa.text("status = 'active'")
+AVAILABLE = sa.text("status = 'available'")
+
+INDEXES = [
+    ("ix_loan_user_id_status", "loan", ["user_id", "status"], None),
+    ("ix_loan_book_id", "loan", ["book_id"], None),
+    ("ix_loan_active", "loan", ["loan_id"], ACTIVE),
+    ("ix_book_available", "book", ["book_id"], AVAILABLE),
+    ("ix_app_user_auth_id", "app_user", ["auth_id"], None),
+]
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        # CREATE INDEX CONCURRENTLY no puede correr dentro de una transacción
+        with op.get_context().autocommit_block():
+            for name, table, columns, where in INDEXES:
+                op.create_index(
+                    name, table, columns,
+                    postgresql_where=where, postgresql_concurrently=True, if_not_exists=True
+                )
+        return
+
+    for name, table, columns, where in INDEXES:
+        op.create_index(name, table, columns, sqlite_where=where, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
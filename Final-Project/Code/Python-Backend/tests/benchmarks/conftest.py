@@ -0,0 +1,95 @@
+# tests/benchmarks/conftest.py
+"""
+Micro-benchmarks (pytest-benchmark) de la capa CRUD y de los endpoints.
+
+Cada benchmark corre sobre datasets sintéticos de ``benchmarks.dataset`` con
+BENCH_SIZES libros (por defecto 100, 1000 y 10000; usuarios = libros / 5 y
+préstamos = libros * 2), en una base SQLite por tamaño. Como los tests, cada
+benchmark trabaja dentro de una transacción que se revierte al final.
+
+Solo se ejecutan con ``--benchmark-only`` (ver tests/conftest.py).
+"""
+import itertools
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+from benchmarks.dataset import Dataset, load
+from app.database import Base, get_db
+from app.main import app
+from app.models import Book, User
+
+SIZES = [int(size) for size in os.getenv("BENCH_SIZES", "100,1000,10000").split(",")]
+
+_ids = itertools.count(1)
+
+
+def unique(prefix: str) -> str:
+    """Valor distinto en cada ronda (ISBN, email, nombre de categoría)"""
+    return f"{prefix}-{next(_ids)}"
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"{size}-books")
+def dataset_engine(request, tmp_path_factory):
+    """Base SQLite con el dataset sintético de ``size`` libros"""
+    size = request.param
+    engine = create_engine(
+        f"sqlite:///{tmp_path_factory.mktemp('bench') / f'{size}_bench.db'}",
+        connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=engine)
+    load(engine, Dataset(books=size, users=max(1, size // 5), loans=size * 2))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def bench_db(dataset_engine):
+    """Sesión sobre el dataset; los commits del código medido se revierten al final"""
+    connection = dataset_engine.connect()
+    transaction = connection.begin()
+    session = sessionmaker(autocommit=False, autoflush=False, bind=connection)()
+    try:
+        yield session
+    finally:
+        session.close()
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture
+def bench_client(bench_db):
+    """TestClient con get_db apuntando a ``bench_db``"""
+    def override_get_db():
+        yield bench_db
+
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        yield client
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def reader(bench_db):
+    """Primer lector activo del dataset: (user_id, email)"""
+    return bench_db.execute(
+        select(User.user_id, User.email).where(User.status == "active").order_by(User.user_id).limit(1)
+    ).one()
+
+
+@pytest.fixture
+def reader_headers(create_token, reader):
+    return {"Authorization": f"Bearer {create_token(reader.email, user_id=reader.user_id)}"}
+
+
+@pytest.fixture
+def librarian_headers(create_token, reader):
+    """El mismo lector con rol ADMIN (el bibliotecario debe existir en la base)"""
+    return {"Authorization": f"Bearer {create_token(reader.email, user_id=reader.user_id, rol='ADMIN')}"}
+
+
+@pytest.fixture
+def available_book_ids(bench_db):
+    """Libros disponibles, para que cada ronda de un checkout use uno distinto"""
+    return iter(bench_db.scalars(select(Book.book_id).where(Book.status == "available").order_by(Book.book_id)).all())
@@ -0,0 +1,185 @@
+# tests/benchmarks/test_crud.py
+import pytest
+from sqlalchemy import select
+from app import schemas
+from app.crud import books as crud_books, category as crud_category, loans as crud_loans, users as crud_users
+from app.models import User
+from tests.benchmarks.conftest import unique
+
+# Rondas de los benchmarks que necesitan preparar estado (un libro disponible, un préstamo activo)
+WRITE_ROUNDS = 20
+# Id que no existe en ningún tamaño del dataset
+MISSING_ID = 10**9
+# Ids de los benchmarks por lote (existen desde el dataset de 100 libros)
+BATCH_IDS = list(range(1, 51))
+
+
+def _book(**overrides) -> schemas.BookCreate:
+    return schemas.BookCreate(**{"title": "Benchmark Book", "author": "Bench Writer", "isbn": unique("BENCH"),
+                                 "publication_year": 2020, "category_id": 1, **overrides})
+
+
+def _user() -> schemas.UserCreate:
+    email = f"{unique('bench')}@library.test"
+    return schemas.UserCreate(full_name="Bench Reader", email=email)
+
+
+@pytest.mark.benchmark(group="crud.books")
+class TestBooks:
+    """Funciones de app/crud/books.py"""
+
+    def test_get_books_page(self, benchmark, bench_db):
+        assert len(benchmark(crud_books.get_books, bench_db, 50)) == 50
+
+    def test_get_books_all(self, benchmark, bench_db):
+        assert benchmark(crud_books.get_books, bench_db)
+
+    def test_get_available_books(self, benchmark, bench_db):
+        assert benchmark(crud_books.get_available_books, bench_db, 50)
+
+    def test_search_books(self, benchmark, bench_db):
+        benchmark(crud_books.search_books, bench_db, "river", 20)
+
+    def test_get_book_by_id(self, benchmark, bench_db):
+        assert benchmark(crud_books.get_book_by_id, bench_db, 1) is not None
+
+    def test_get_book_cached(self, benchmark, bench_db):
+        crud_books.get_book(bench_db, 1)
+        assert benchmark(crud_books.get_book, bench_db, 1) is not None
+
+    def test_get_book_cold(self, benchmark, bench_db):
+        def cold():
+            crud_books.invalidate()
+            return crud_books.get_book(bench_db, 1)
+        assert benchmark(cold) is not None
+
+    def test_get_book_missing_cached(self, benchmark, bench_db):
+        crud_books.get_book(bench_db, MISSING_ID)
+        assert benchmark(crud_books.get_book, bench_db, MISSING_ID) is None
+
+    def test_get_book_missing_cold(self, benchmark, bench_db):
+        def cold():
+            crud_books.invalidate()
+            return crud_books.get_book(bench_db, MISSING_ID)
+        assert benchmark(cold) is None
+
+    def test_get_books_by_ids_cached(self, benchmark, bench_db):
+        crud_books.get_books_by_ids(bench_db, BATCH_IDS)
+        assert len(benchmark(crud_books.get_books_by_ids, bench_db, BATCH_IDS)) == len(BATCH_IDS)
+
+    def test_get_books_by_ids_cold(self, benchmark, bench_db):
+        def cold():
+            crud_books.invalidate()
+            return crud_books.get_books_by_ids(bench_db, BATCH_IDS)
+        assert len(benchmark(cold)) == len(BATCH_IDS)
+
+    def test_get_category_ids(self, benchmark, bench_db):
+        assert benchmark(crud_books.get_category_ids, bench_db)
+
+    def test_create_book(self, benchmark, bench_db):
+        benchmark(lambda: crud_books.create_book(bench_db, _book()))
+
+    def test_update_book(self, benchmark, bench_db):
+        benchmark(lambda: crud_books.update_book(bench_db, 1, _book(title="Renamed")))
+
+    def test_delete_book(self, benchmark, bench_db):
+        def setup():
+            return (bench_db, crud_books.create_book(bench_db, _book()).book_id), {}
+        assert benchmark.pedantic(crud_books.delete_book, setup=setup, rounds=WRITE_ROUNDS) is not None
+
+    def test_upsert_books(self, benchmark, bench_db):
+        def rows():
+            return [{**_book().model_dump(), "status": "available"} for _ in range(500)]
+        benchmark.pedantic(crud_books.upsert_books, setup=lambda: ((bench_db, rows()), {}), rounds=WRITE_ROUNDS)
+
+
+@pytest.mark.benchmark(group="crud.loans")
+class TestLoans:
+    """Funciones de app/crud/loans.py"""
+
+    def test_get_loans(self, benchmark, bench_db):
+        assert benchmark(crud_loans.get_loans, bench_db)
+
+    def test_get_active_loans(self, benchmark, bench_db):
+        assert benchmark(crud_loans.get_active_loans, bench_db)
+
+    def test_create_loan(self, benchmark, bench_db, available_book_ids):
+        def setup():
+            return (bench_db, schemas.LoanCreate(book_id=next(available_book_ids), user_id=1)), {}
+        result = benchmark.pedantic(crud_loans.create_loan, setup=setup, rounds=WRITE_ROUNDS)
+        assert result is not None
+
+    def test_return_loan(self, benchmark, bench_db, available_book_ids):
+        def setup():
+            loan = crud_loans.create_loan(bench_db, schemas.LoanCreate(book_id=next(available_book_ids), user_id=1))
+            return (bench_db, loan.loan_id), {}
+        assert benchmark.pedantic(crud_loans.return_loan, setup=setup, rounds=WRITE_ROUNDS).status == "returned"
+
+    def test_delete_loan(self, benchmark, bench_db, available_book_ids):
+        def setup():
+            loan = crud_loans.create_loan(bench_db, schemas.LoanCreate(book_id=next(available_book_ids), user_id=1))
+            return (bench_db, loan.loan_id), {}
+        assert benchmark.pedantic(crud_loans.delete_loan, setup=setup, rounds=WRITE_ROUNDS) is not None
+
+
+@pytest.mark.benchmark(group="crud.users")
+class TestUsers:
+    """Funciones de app/crud/users.py"""
+
+    def test_get_users(self, benchmark, bench_db):
+        assert benchmark(crud_users.get_users, bench_db)
+
+    def test_get_user_by_id(self, benchmark, bench_db):
+        assert benchmark(crud_users.get_user_by_id, bench_db, 1) is not None
+
+    def test_get_users_by_ids(self, benchmark, bench_db):
+        user_ids = list(range(1, 21))
+        assert len(benchmark(crud_users.get_users_by_ids, bench_db, user_ids)) == len(user_ids)
+
+    def test_get_user_by_auth_id(self, benchmark, bench_db):
+        assert benchmark(crud_users.get_user_by_auth_id, bench_db, 1) is not None
+
+    def test_get_user_by_email(self, benchmark, bench_db):
+        assert benchmark(crud_users.get_user_by_email, bench_db, "reader1@library.test") is not None
+
+    def test_create_user(self, benchmark, bench_db):
+        benchmark(lambda: crud_users.create_user(bench_db, _user()))
+
+    def test_provision_user_existing(self, benchmark, bench_db):
+        assert benchmark(crud_users.provision_user, bench_db, "reader1@library.test").user_id == 1
+
+    def test_provision_user_new(self, benchmark, bench_db):
+        benchmark(lambda: crud_users.provision_user(bench_db, f"{unique('login')}@library.test"))
+
+    def test_provision_users_batch(self, benchmark, bench_db):
+        def setup():
+            users = [schemas.UserProvision(email=f"{unique('sync')}@library.test") for _ in range(100)]
+            return (bench_db, users), {}
+        assert benchmark.pedantic(crud_users.provision_users, setup=setup, rounds=WRITE_ROUNDS)["created"] == 100
+
+    def test_update_user(self, benchmark, bench_db):
+        user = bench_db.scalar(select(User).where(User.user_id == 1))
+        update = schemas.UserCreate(full_name="Renamed Reader", email=user.email)
+        benchmark(crud_users.update_user, bench_db, 1, update)
+
+    def test_delete_user(self, benchmark, bench_db):
+        def setup():
+            return (bench_db, crud_users.create_user(bench_db, _user()).user_id), {}
+        assert benchmark.pedantic(crud_users.delete_user, setup=setup, rounds=WRITE_ROUNDS) is not None
+
+
+@pytest.mark.benchmark(group="crud.category")
+class TestCategories:
+    """Funciones de app/crud/category.py"""
+
+    def test_get_categories_cached(self, benchmark, bench_db):
+        assert len(benchmark(crud_category.get_categories, bench_db)) == 30
+
+    def test_get_categories_cold(self, benchmark, bench_db):
+        def cold():
+            crud_category.invalidate()
+            return crud_category.get_categories(bench_db)
+        assert len(benchmark(cold)) == 30
+
+    def test_create_category(self, benchmark, bench_db):
+        benchmark(lambda: crud_category.create_category(bench_db, schemas.CategoryCreate(name=unique("Genre"))))
@@ -0,0 +1,62 @@
+# tests/benchmarks/test_routes.py
+"""Endpoints de punta a punta (TestClient, con middlewares y serialización)"""
+import pytest
+from app import schemas
+from app.crud import loans as crud_loans
+
+WRITE_ROUNDS = 20
+
+
+def _ok(response):
+    assert response.status_code == 200, response.text
+    return response
+
+
+@pytest.mark.benchmark(group="routes.public")
+class TestPublicRoutes:
+    """Rutas sin autenticación"""
+
+    @pytest.mark.parametrize("path", [
+        "/books/?limit=50",
+        "/books/1",
+        "/books/batch?ids=" + ",".join(str(book_id) for book_id in range(1, 51)),
+        "/books/available?limit=50",
+        "/books/search?search=river",
+        "/categories/",
+        "/loans/active",
+    ])
+    def test_get(self, benchmark, bench_client, path):
+        benchmark(lambda: _ok(bench_client.get(path)))
+
+
+@pytest.mark.benchmark(group="routes.auth")
+class TestAuthenticatedRoutes:
+    """Rutas con JWT (lector y bibliotecario)"""
+
+    def test_my_loans(self, benchmark, bench_client, reader_headers):
+        benchmark(lambda: _ok(bench_client.get("/loans/me", headers=reader_headers)))
+
+    def test_dashboard(self, benchmark, bench_client, reader_headers):
+        benchmark(lambda: _ok(bench_client.get("/stats/dashboard", headers=reader_headers)))
+
+    @pytest.mark.parametrize("path", ["/loans/", "/users/"])
+    def test_librarian_lists(self, benchmark, bench_client, librarian_headers, path):
+        benchmark(lambda: _ok(bench_client.get(path, headers=librarian_headers)))
+
+
+@pytest.mark.benchmark(group="routes.loans")
+class TestLoanRoutes:
+    """Checkout y devolución; cada ronda usa un libro disponible distinto"""
+
+    def test_checkout(self, benchmark, bench_client, reader, available_book_ids):
+        def setup():
+            return ({"book_id": next(available_book_ids), "user_id": reader.user_id},), {}
+        benchmark.pedantic(lambda payload: _ok(bench_client.post("/loans/", json=payload)),
+                           setup=setup, rounds=WRITE_ROUNDS)
+
+    def test_return(self, benchmark, bench_client, bench_db, reader, available_book_ids):
+        def setup():
+            loan = crud_loans.create_loan(bench_db, schemas.LoanCreate(book_id=next(available_book_ids), user_id=reader.user_id))
+            return (loan.loan_id,), {}
+        benchmark.pedantic(lambda loan_id: _ok(bench_client.put(f"/loans/return/{loan_id}")),
+                           setup=setup, rounds=WRITE_ROUNDS)
@@ -3,8 +3,10 @@ import pytest
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from fastapi.testclient import TestClient
+from app import config
 from app.database import Base, get_db
 from app.main import app
+from app.profiler import QueryProfilerMiddleware
 import jwt
 import base64
 from datetime import datetime, timedelta, timezone
@@ -19,6 +21,9 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Las rutas usan este engine (get_db sobreescrito): el lifespan no migra el de la app
+config.DB_MIGRATE_ON_STARTUP = False
+
 # Configuración de JWT para tests
 SECRET_KEY = "MTkxNTYyMDIzMTE4NTUxNDc5MTQ1NTE4OTE0NzE5NTEzOTE0MTE4"
 ALGORITHM = "HS256"
@@ -34,6 +39,25 @@ def setup_database():
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Las cachés en memoria son globales: cada test empieza sin entradas"""
+    from app.auth_utils import clear_user_cache
+    from app import etag
+    from app.crud import books as crud_books, category as crud_category, stats as crud_stats
+    clear_user_cache()
+    crud_stats.invalidate()
+    crud_category.invalidate()
+    crud_books.invalidate()
+    etag.bump()
+    yield
+    clear_user_cache()
+    crud_stats.invalidate()
+    crud_category.invalidate()
+    crud_books.invalidate()
+    etag.bump()
+
+
 @pytest.fixture(scope="function")
 def db_session():
     """
@@ -52,8 +76,14 @@ def db_session():
         connection.close()
 
 
+@pytest.fixture
+def query_counts():
+    """("MÉTODO /ruta/{plantilla}", QueryProfile) de cada request hecho con ``client``"""
+    return []
+
+
 @pytest.fixture(scope="function")
-def client(db_session):
+def client(db_session, query_counts):
     """Cliente de prueba de FastAPI con base de datos mockeada"""
     def override_get_db():
         try:
@@ -62,13 +92,43 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
-    
-    with TestClient(app) as test_client:
+
+    # ✅ Cuenta las consultas de cada request (para @pytest.mark.query_budget)
+    def record(method, route, profile):
+        query_counts.append((f"{method} {route}", profile))
+
+    with TestClient(QueryProfilerMiddleware(app, on_request=record)) as test_client:
         yield test_client
     
     app.dependency_overrides.clear()
 
 
+def pytest_ignore_collect(collection_path, config):
+    """tests/benchmarks solo corre con --benchmark-only (pytest-benchmark)"""
+    if collection_path.name == "benchmarks" and not config.getoption("benchmark_only", default=False):
+        return True
+    return None
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Con @pytest.mark.query_budget(n, route=None), falla si un request supera n consultas"""
+    result = yield
+    for marker in item.iter_markers("query_budget"):
+        if "query_counts" not in item.funcargs:
+            pytest.fail("query_budget needs the client fixture")
+        max_queries = marker.args[0] if marker.args else marker.kwargs["max_queries"]
+        route = marker.kwargs.get("route")
+        requests = [(name, profile) for name, profile in item.funcargs["query_counts"] if route in (None, name)]
+        if route is not None and not requests:
+            pytest.fail(f"query_budget: no request to {route}")
+        for name, profile in requests:
+            if profile.count > max_queries:
+                statements = "\n".join(f"  {statement}" for statement in profile.statements.elements())
+                pytest.fail(f"{name} ran {profile.count} queries (budget {max_queries}):\n{statements}")
+    return result
+
+
 @pytest.fixture
 def create_token():
     """Factory para crear tokens JWT de prueba"""
@@ -5,6 +5,8 @@ import base64
 from datetime import datetime, timedelta, timezone
 from fastapi import HTTPException
 from app.auth_utils import decode_jwt, get_current_user, get_current_librarian
+from app import schemas
+from app.crud import users as crud_users
 
 SECRET_KEY = "MTkxNTYyMDIzMTE4NTUxNDc5MTQ1NTE4OTE0NzE5NTEzOTE0MTE4"
 DECODED_KEY = base64.b64decode(SECRET_KEY)
@@ -154,4 +156,101 @@ class TestGetCurrentLibrarian:
         
         with pytest.raises(HTTPException) as exc:
             get_current_librarian(credentials, db_session)
-        assert exc.value.status_code == 404
\ No newline at end of file
+        assert exc.value.status_code == 404
+
+
+class TestUserCache:
+    """Pruebas de la caché token -> usuario"""
+
+    @staticmethod
+    def _credentials(token):
+        from fastapi.security import HTTPAuthorizationCredentials
+        return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    @staticmethod
+    def _count_queries(db_session):
+        from sqlalchemy import event
+        statements = []
+        bind = db_session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(bind, "before_cursor_execute", listener)
+        return statements, lambda: event.remove(bind, "before_cursor_execute", listener)
+
+    def test_second_call_skips_query(self, db_session, sample_user, user_token):
+        """La segunda resolución del mismo token no consulta la BD"""
+        credentials = self._credentials(user_token)
+        first = get_current_user(credentials, db_session)
+
+        statements, stop = self._count_queries(db_session)
+        try:
+            second = get_current_user(credentials, db_session)
+        finally:
+            stop()
+
+        assert statements == []
+        assert second.user_id == first.user_id
+        assert second.email == sample_user.email
+
+    def test_cached_user_in_new_session(self, db_session, sample_user, user_token):
+        """En otra sesión el usuario cacheado queda adjunto y sin cambios pendientes"""
+        from sqlalchemy.orm import Session
+        credentials = self._credentials(user_token)
+        get_current_user(credentials, db_session)
+
+        other = Session(bind=db_session.get_bind())
+        try:
+            user = get_current_user(credentials, other)
+            assert user in other
+            assert not other.dirty
+            assert user.full_name == sample_user.full_name
+        finally:
+            other.close()
+
+    def test_librarian_uses_cached_payload_for_role(self, db_session, admin_user, admin_token, user_token, sample_user):
+        """El rol se sigue validando con el payload cacheado"""
+        get_current_user(self._credentials(user_token), db_session)
+        with pytest.raises(HTTPException) as exc:
+            get_current_librarian(self._credentials(user_token), db_session)
+        assert exc.value.status_code == 403
+
+        admin_credentials = self._credentials(admin_token)
+        assert get_current_librarian(admin_credentials, db_session).user_id == admin_user.user_id
+        assert get_current_librarian(admin_credentials, db_session).user_id == admin_user.user_id
+
+    def test_update_user_invalidates(self, db_session, sample_user, user_token):
+        """update_user descarta el usuario cacheado"""
+        credentials = self._credentials(user_token)
+        get_current_user(credentials, db_session)
+
+        crud_users.update_user(db_session, sample_user.user_id, schemas.UserCreate(
+            full_name="Renamed", email=sample_user.email
+        ))
+        db_session.expunge_all()
+        assert get_current_user(credentials, db_session).full_name == "Renamed"
+
+    def test_delete_user_invalidates(self, db_session, sample_user, user_token):
+        """delete_user (desactivar) descarta el usuario cacheado"""
+        credentials = self._credentials(user_token)
+        get_current_user(credentials, db_session)
+
+        crud_users.delete_user(db_session, sample_user.user_id)
+        db_session.expunge_all()
+        assert get_current_user(credentials, db_session).status == "inactive"
+
+    def test_any_orm_write_invalidates(self, db_session, sample_user, user_token):
+        """Una escritura del usuario por fuera de crud.users también descarta el usuario cacheado"""
+        credentials = self._credentials(user_token)
+        get_current_user(credentials, db_session)
+
+        sample_user.status = "inactive"
+        db_session.commit()
+        db_session.expunge_all()
+        assert get_current_user(credentials, db_session).status == "inactive"
+
+    def test_entry_never_outlives_token(self, db_session, sample_user):
+        """Un token ya vencido no se cachea"""
+        from app import auth_utils
+        expired = datetime.now(timezone.utc) - timedelta(seconds=1)
+        auth_utils._cache_user("token", {"exp": expired.timestamp()}, sample_user, db_session)
+        assert len(auth_utils._user_cache) == 0
+        assert len(auth_utils._user_rows) == 0
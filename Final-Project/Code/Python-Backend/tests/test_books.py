@@ -1,5 +1,6 @@
 # tests/test_books.py
 import pytest
+from app import batch
 from app.crud import books as crud_books
 from app.schemas import BookCreate
 
@@ -87,29 +88,43 @@ class TestBookCRUD:
         assert book is not None
         assert book.book_id == sample_book.book_id
     
+    @staticmethod
+    def _search(db_session, term):
+        return [book for book, _ in crud_books.search_books(db_session, term, 10)]
+
     def test_search_books_by_title(self, db_session, sample_book):
         """Debe buscar libros por título"""
-        results = crud_books.get_books_by_filter(db_session, "1984")
+        results = self._search(db_session, "1984")
         assert len(results) == 1
         assert results[0].title == sample_book.title
     
     def test_search_books_by_author(self, db_session, sample_book):
         """Debe buscar libros por autor"""
-        results = crud_books.get_books_by_filter(db_session, "Orwell")
+        results = self._search(db_session, "Orwell")
         assert len(results) == 1
         assert results[0].author == sample_book.author
     
     def test_search_books_by_category(self, db_session, sample_book, sample_category):
         """Debe buscar libros por categoría"""
-        results = crud_books.get_books_by_filter(db_session, "Fiction")
+        results = self._search(db_session, "Fiction")
         assert len(results) == 1
     
+    def test_search_books_without_category(self, db_session, sample_book):
+        """Los libros sin categoría no deben perderse en la búsqueda"""
+        from app.models.book import Book
+        orphan = Book(title="Animal Farm", author="George Orwell", isbn="978-0451526342")
+        db_session.add(orphan)
+        db_session.commit()
+
+        results = self._search(db_session, "orwell")
+        assert {b.isbn for b in results} == {sample_book.isbn, orphan.isbn}
+
     def test_search_books_case_insensitive(self, db_session, sample_book):
         """La búsqueda debe ser case-insensitive"""
-        results = crud_books.get_books_by_filter(db_session, "orwell")
+        results = self._search(db_session, "orwell")
         assert len(results) == 1
         
-        results = crud_books.get_books_by_filter(db_session, "ORWELL")
+        results = self._search(db_session, "ORWELL")
         assert len(results) == 1
 
 
@@ -120,7 +135,7 @@ class TestBookEndpoints:
         """GET /books/ debe retornar todos los libros"""
         response = client.get("/books/")
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["title"] == sample_book.title
     
@@ -128,7 +143,7 @@ class TestBookEndpoints:
         """GET /books/available debe retornar solo libros disponibles"""
         response = client.get("/books/available")
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["status"] == "available"
     
@@ -136,7 +151,7 @@ class TestBookEndpoints:
         """GET /books/search debe buscar libros"""
         response = client.get("/books/search?search=1984")
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
     
     def test_create_book_endpoint(self, client, db_session, sample_category):
@@ -193,11 +208,190 @@ class TestBookEndpoints:
         
         # Verificar que el libro está marcado como inactivo
         get_response = client.get(f"/books/")
-        books = get_response.json()
+        books = get_response.json()["items"]
         deleted_book = next(b for b in books if b["book_id"] == sample_book.book_id)
         assert deleted_book["status"] == "inactive"
     
     def test_delete_nonexistent_book_endpoint(self, client):
         """DELETE /books/{id} debe retornar 404 para libro inexistente"""
         response = client.delete("/books/9999")
-        assert response.status_code == 404
\ No newline at end of file
+        assert response.status_code == 404
+
+
+class TestBookDetail:
+    """GET /books/{id} con caché por libro"""
+
+    def _get(self, client, query_counts, book_id):
+        query_counts.clear()
+        response = client.get(f"/books/{book_id}")
+        return response, query_counts[-1][1].count
+
+    def test_get_book_endpoint(self, client, sample_book):
+        response = client.get(f"/books/{sample_book.book_id}")
+        assert response.status_code == 200
+        assert response.json()["title"] == sample_book.title
+
+    def test_second_read_is_cached(self, client, sample_book, query_counts):
+        assert self._get(client, query_counts, sample_book.book_id)[1] == 1
+        response, queries = self._get(client, query_counts, sample_book.book_id)
+        assert (response.status_code, queries) == (200, 0)
+
+    def test_missing_book_is_cached(self, client, query_counts):
+        assert self._get(client, query_counts, 9999)[0].status_code == 404
+        response, queries = self._get(client, query_counts, 9999)
+        assert (response.status_code, queries) == (404, 0)
+
+    def test_created_book_replaces_cached_404(self, client, db_session, sample_category):
+        from sqlalchemy import func
+        from app.models.book import Book
+        next_id = (db_session.query(func.max(Book.book_id)).scalar() or 0) + 1
+        assert client.get(f"/books/{next_id}").status_code == 404
+        book_id = client.post("/books/", json={"title": "New", "author": "A", "isbn": "DETAIL-1"}).json()["book_id"]
+        assert book_id == next_id
+        assert client.get(f"/books/{book_id}").status_code == 200
+
+    def test_update_and_delete_invalidate(self, client, sample_book):
+        client.get(f"/books/{sample_book.book_id}")
+        client.put(f"/books/{sample_book.book_id}", json={
+            "title": "Renamed", "author": sample_book.author, "isbn": sample_book.isbn
+        })
+        assert client.get(f"/books/{sample_book.book_id}").json()["title"] == "Renamed"
+        client.delete(f"/books/{sample_book.book_id}")
+        assert client.get(f"/books/{sample_book.book_id}").json()["status"] == "inactive"
+
+    def test_loans_invalidate_status(self, client, sample_book, sample_user):
+        client.get(f"/books/{sample_book.book_id}")
+        loan = client.post("/loans/", json={"book_id": sample_book.book_id, "user_id": sample_user.user_id}).json()
+        assert client.get(f"/books/{sample_book.book_id}").json()["status"] == "loaned"
+        client.put(f"/loans/return/{loan['loan_id']}")
+        assert client.get(f"/books/{sample_book.book_id}").json()["status"] == "available"
+
+
+class TestBookBatch:
+    """GET/POST /books/batch: varios libros por id en una consulta"""
+
+    @pytest.fixture
+    def three_books(self, db_session, sample_category):
+        from app.models.book import Book
+        books = [Book(title=f"Batch {index}", author="A", isbn=f"BATCH-{index}") for index in range(3)]
+        db_session.add_all(books)
+        db_session.commit()
+        return [book.book_id for book in books]
+
+    def test_keeps_order_and_reports_missing(self, client, three_books):
+        first, second, third = three_books
+        response = client.get(f"/books/batch?ids={third},9999,{first},{third}")
+        assert response.status_code == 200
+        assert [book["book_id"] for book in response.json()["items"]] == [third, first]
+        assert response.json()["missing"] == [9999]
+
+    def test_post_variant(self, client, three_books):
+        response = client.post("/books/batch", json=three_books)
+        assert [book["book_id"] for book in response.json()["items"]] == three_books
+        assert response.json()["missing"] == []
+
+    def test_only_cache_misses_are_queried(self, client, three_books, query_counts):
+        first, second, third = three_books
+        client.get(f"/books/{first}")
+        query_counts.clear()
+        client.get(f"/books/batch?ids={first},{second}")
+        assert query_counts[-1][1].count == 1
+        assert "IN" in next(iter(query_counts[-1][1].statements))
+        query_counts.clear()
+        client.get(f"/books/batch?ids={second},{first},9999")
+        client.get("/books/batch?ids=9999")
+        assert [profile.count for _, profile in query_counts] == [1, 0]
+
+    def test_invalid_ids(self, client):
+        assert client.get("/books/batch?ids=1,abc").status_code == 400
+        assert client.post("/books/batch", json=list(range(batch.MAX_BATCH_IDS + 1))).status_code == 400
+
+
+class TestBookPagination:
+    """Pruebas de paginación por cursor de libros"""
+
+    @pytest.fixture
+    def many_books(self, db_session, sample_category):
+        from app.models.book import Book
+        books = [
+            Book(
+                title=f"Paged Book {i}",
+                author=f"Author {i}",
+                isbn=f"PAGE-{i}",
+                status="available" if i % 2 == 0 else "loaned",
+                category_id=sample_category.category_id
+            )
+            for i in range(7)
+        ]
+        db_session.add_all(books)
+        db_session.commit()
+        return books
+
+    def test_crud_keyset_returns_ordered_slice(self, db_session, many_books):
+        """El CRUD debe devolver libros ordenados después del id dado"""
+        first = crud_books.get_books(db_session, limit=3)
+        assert [b.book_id for b in first] == sorted(b.book_id for b in first)
+        assert len(first) == 3
+
+        rest = crud_books.get_books(db_session, after_id=first[-1].book_id)
+        assert len(rest) == 4
+        assert rest[0].book_id > first[-1].book_id
+
+    def test_walk_all_pages(self, client, many_books):
+        """Seguir next_cursor debe recorrer todos los libros sin repetir"""
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/books/", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            assert len(page["items"]) <= 3
+            seen.extend(b["book_id"] for b in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == sorted(b.book_id for b in many_books)
+
+    def test_last_page_has_no_cursor(self, client, many_books):
+        """Una página que contiene el resto no debe traer next_cursor"""
+        response = client.get("/books/", params={"limit": 7})
+        page = response.json()
+        assert len(page["items"]) == 7
+        assert page["next_cursor"] is None
+
+    def test_available_pages_filter_status(self, client, many_books):
+        """La paginación de disponibles solo debe incluir libros disponibles"""
+        response = client.get("/books/available", params={"limit": 2})
+        page = response.json()
+        assert len(page["items"]) == 2
+        assert page["next_cursor"] is not None
+
+        response = client.get(
+            "/books/available",
+            params={"limit": 2, "cursor": page["next_cursor"]}
+        )
+        page = response.json()
+        assert len(page["items"]) == 2
+        assert page["next_cursor"] is None
+        assert all(b["status"] == "available" for b in page["items"])
+
+    def test_search_pagination(self, client, many_books):
+        """La búsqueda también debe paginar con cursor"""
+        response = client.get("/books/search", params={"search": "Paged", "limit": 5})
+        page = response.json()
+        assert len(page["items"]) == 5
+        assert page["next_cursor"] is not None
+
+    def test_invalid_cursor(self, client):
+        """Un cursor malformado debe retornar 400"""
+        response = client.get("/books/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    def test_limit_out_of_range(self, client):
+        """Un limit fuera de rango debe ser rechazado"""
+        response = client.get("/books/", params={"limit": 0})
+        assert response.status_code == 422
@@ -0,0 +1,131 @@
+# tests/test_bulk_import.py
+import asyncio
+import json
+from app import bulk_import
+from app.crud import books as crud_books
+from app.models.book import Book
+
+
+def ndjson(*rows):
+    return "\n".join(json.dumps(row) for row in rows) + "\n"
+
+
+class TestLineParsing:
+    """Pruebas de lectura del cuerpo en streaming"""
+
+    @staticmethod
+    def _collect(chunks):
+        async def stream():
+            for chunk in chunks:
+                yield chunk
+
+        async def collect():
+            return [line async for line in bulk_import.iter_lines(stream())]
+        return asyncio.run(collect())
+
+    def test_lines_split_across_chunks(self):
+        """Una línea (y un carácter UTF-8) puede quedar partida entre chunks"""
+        data = "título,a\r\nsegundo,b".encode()
+        chunks = [data[:2], data[2:9], data[9:]]
+        assert self._collect(chunks) == ["título,a", "segundo,b"]
+
+    def test_utf8_bom_is_removed(self):
+        assert self._collect([b"\xef\xbb\xbftitle\n"]) == ["title"]
+
+
+class TestBulkImportEndpoint:
+    """Pruebas de POST /books/bulk"""
+
+    def test_ndjson_import(self, client, db_session, sample_category):
+        body = ndjson(
+            {"title": "Dune", "author": "Frank Herbert", "isbn": "B-1", "category_id": sample_category.category_id},
+            {"title": "Emma", "author": "Jane Austen", "isbn": "B-2", "publication_year": 1815},
+        )
+        response = client.post("/books/bulk", content=body)
+        assert response.status_code == 200
+        assert response.json() == {"received": 2, "imported": 2, "failed": 0, "errors": []}
+
+        books = crud_books.get_books(db_session)
+        assert [(book.isbn, book.status) for book in books] == [("B-1", "available"), ("B-2", "available")]
+
+    def test_csv_import_with_quoted_newline(self, client, db_session):
+        body = (
+            "title,author,isbn,publication_year\r\n"
+            '"Poems, Vol. 1\nand 2",Anon,C-1,\r\n'
+            "Emma,Jane Austen,C-2,1815\r\n"
+        )
+        response = client.post("/books/bulk?format=csv", content=body.encode())
+        assert response.json()["imported"] == 2
+
+        first = db_session.query(Book).filter(Book.isbn == "C-1").one()
+        assert first.title == "Poems, Vol. 1\nand 2"
+        assert first.publication_year is None
+
+    def test_upsert_by_isbn(self, client, db_session, sample_book):
+        """Un ISBN existente se actualiza sin tocar el estado del libro"""
+        sample_book.status = "loaned"
+        db_session.commit()
+
+        body = ndjson({"title": "Nineteen Eighty-Four", "author": "George Orwell", "isbn": sample_book.isbn})
+        assert client.post("/books/bulk", content=body).json()["imported"] == 1
+
+        db_session.expire_all()
+        book = db_session.query(Book).filter(Book.isbn == sample_book.isbn).one()
+        assert book.book_id == sample_book.book_id
+        assert book.title == "Nineteen Eighty-Four"
+        assert book.status == "loaned"
+
+    def test_duplicate_isbn_in_same_batch(self, client, db_session):
+        """Dentro del mismo cuerpo gana la última fila del ISBN"""
+        body = ndjson(
+            {"title": "Old", "author": "A", "isbn": "D-1"},
+            {"title": "New", "author": "A", "isbn": "D-1"},
+        )
+        assert client.post("/books/bulk", content=body).json()["imported"] == 2
+        assert db_session.query(Book).filter(Book.isbn == "D-1").one().title == "New"
+
+    def test_per_row_error_report(self, client, db_session):
+        body = "\n".join([
+            json.dumps({"title": "Valid", "author": "A", "isbn": "E-1"}),
+            "{not json",
+            json.dumps({"title": "No ISBN", "author": "A"}),
+            json.dumps({"title": "Bad category", "author": "A", "isbn": "E-2", "category_id": 999}),
+            json.dumps({"title": "x" * 151, "author": "A", "isbn": "E-3"}),
+            json.dumps(["not", "an", "object"]),
+        ])
+        report = client.post("/books/bulk", content=body).json()
+
+        assert report["received"] == 6
+        assert report["imported"] == 1
+        assert report["failed"] == 5
+        errors = {error["line"]: error["error"] for error in report["errors"]}
+        assert errors[2] == "Invalid JSON"
+        assert "isbn" in errors[3]
+        assert "category" in errors[4]
+        assert "title" in errors[5]
+        assert errors[6] == "Expected a JSON object"
+        assert [book.isbn for book in crud_books.get_books(db_session)] == ["E-1"]
+
+    def test_csv_errors_use_file_line_numbers(self, client):
+        body = "title,author,isbn\nOk,A,F-1\nToo,many,columns,here\nMissing author,,F-2\n"
+        report = client.post("/books/bulk?format=csv", content=body).json()
+        assert report["imported"] == 1
+        assert [error["line"] for error in report["errors"]] == [3, 4]
+
+    def test_batches(self, client, db_session, monkeypatch):
+        """Las filas se escriben en lotes de IMPORT_BATCH_SIZE"""
+        calls = []
+        original = crud_books.upsert_books
+        monkeypatch.setattr(bulk_import, "IMPORT_BATCH_SIZE", 2)
+        monkeypatch.setattr(crud_books, "upsert_books", lambda db, rows: calls.append(len(rows)) or original(db, rows))
+
+        body = ndjson(*[{"title": f"T{index}", "author": "A", "isbn": f"G-{index}"} for index in range(5)])
+        assert client.post("/books/bulk", content=body).json()["imported"] == 5
+        assert calls == [2, 2, 1]
+
+    def test_invalidates_search_index(self, client, sample_book):
+        """Los libros importados aparecen en la búsqueda"""
+        client.get("/books/search?search=orwell")
+        client.post("/books/bulk", content=ndjson({"title": "Animal Farm", "author": "George Orwell", "isbn": "H-1"}))
+        titles = [book["title"] for book in client.get("/books/search?search=orwell").json()["items"]]
+        assert "Animal Farm" in titles
@@ -0,0 +1,145 @@
+# tests/test_cache.py
+from app.cache import TTLCache, cache_stats, clear_on_write, discard_on_write, invalidate_on_write
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTTLCache:
+    """Pruebas de la caché LRU con expiración"""
+
+    def test_get_and_set(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=30)
+        clock.now = 15
+        assert cache.get("a") is None
+        assert cache.get("b") == 2
+        assert len(cache) == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_non_positive_ttl_is_not_stored(self):
+        cache = TTLCache(maxsize=2, ttl=0)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=-1)
+        assert len(cache) == 0
+
+    def test_delete_and_discard_where(self):
+        cache = TTLCache(maxsize=10, ttl=10)
+        for key in range(5):
+            cache.set(key, {"user_id": key % 2})
+        cache.delete(0)
+        assert cache.discard_where(lambda value: value["user_id"] == 1) == 2
+        assert len(cache) == 2
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_get_or_load_counts_hits_and_misses(self):
+        cache = TTLCache(maxsize=2, ttl=10)
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return "value"
+
+        assert cache.get_or_load("a", loader) == "value"
+        assert cache.get_or_load("a", loader) == "value"
+        assert len(loads) == 1
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_named_caches_are_reported(self):
+        cache = TTLCache(maxsize=3, ttl=10, name="test_reference")
+        cache.get_or_load("a", lambda: 1)
+        assert cache_stats()["test_reference"] == {"size": 1, "maxsize": 3, "ttl": 10, "hits": 0, "misses": 1}
+        assert "categories" in cache_stats()
+
+
+class TestClearOnWrite:
+    """Pruebas de la invalidación por escritura"""
+
+    def test_flush_of_watched_model_clears(self, db_session):
+        from app.models.category import Category
+        cache = TTLCache(maxsize=2, ttl=10)
+        clear_on_write(cache, Category)
+        cache.set("categories", ["cached"])
+
+        db_session.add(Category(name="Essays"))
+        db_session.flush()
+        assert cache.get("categories") is None
+
+    def test_other_models_keep_entries(self, db_session):
+        from app.models.book import Book
+        from app.models.category import Category
+        cache = TTLCache(maxsize=2, ttl=10)
+        clear_on_write(cache, Category)
+        cache.set("categories", ["cached"])
+
+        db_session.add(Book(title="T", author="A", isbn="CW-1"))
+        db_session.flush()
+        assert cache.get("categories") == ["cached"]
+
+    def test_discard_on_write_drops_only_written_keys(self, db_session):
+        from app.models.book import Book
+        cache = TTLCache(maxsize=4, ttl=10)
+        discard_on_write(cache, Book, lambda session, book: book.isbn)
+        cache.set("KEY-1", "cached")
+        cache.set("KEY-2", "cached")
+
+        db_session.add(Book(title="T", author="A", isbn="KEY-1"))
+        db_session.flush()
+        assert cache.get("KEY-1") is None
+        assert cache.get("KEY-2") == "cached"
+
+    def test_touches_filters_modified_instances(self, db_session, sample_book):
+        from app.models.book import Book
+        calls = []
+        invalidate_on_write(calls.append, Book, touches=lambda book: book.title == "Renamed")
+
+        sample_book.status = "loaned"
+        db_session.flush()
+        assert calls == []
+        sample_book.title = "Renamed"
+        db_session.flush()
+        assert len(calls) == 1
+        db_session.add(Book(title="New", author="A", isbn="TOUCH-1"))
+        db_session.flush()
+        assert len(calls) == 2
+
+    def test_callback_runs_again_at_commit(self, tmp_path):
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from app.database import Base
+        from app.models.category import Category
+        bind = create_engine(f"sqlite:///{tmp_path / 'hooks.db'}")
+        Base.metadata.create_all(bind)
+        calls = []
+        invalidate_on_write(calls.append, Category)
+
+        with Session(bind) as session:
+            session.add(Category(name="Essays"))
+            session.flush()
+            assert calls == [bind]
+            session.commit()
+        bind.dispose()
+        assert calls == [bind, bind]
@@ -0,0 +1,137 @@
+# tests/test_compression.py
+import gzip
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app import compression
+from app.compression import CompressionMiddleware, negotiate
+
+LARGE = {"items": [{"title": f"Book {index}", "author": "Writer"} for index in range(200)]}
+
+
+@pytest.fixture
+def compressed_client():
+    """App mínima con el middleware de compresión"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500, gzip_level=6, brotli_quality=4)
+
+    @app.get("/large")
+    def large():
+        return LARGE
+
+    @app.get("/huge")
+    def huge():
+        return {"items": ["x" * 100] * 1000}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse((b"line\n" * 200 for _ in range(3)), media_type="application/x-ndjson")
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\x89PNG" + b"\x00" * 2000, media_type="image/png")
+
+    @app.get("/tagged")
+    def tagged():
+        return JSONResponse(LARGE, headers={"ETag": '"v1"'})
+
+    with TestClient(app) as client:
+        yield client
+
+
+def _get(client, path, accept="gzip"):
+    return client.get(path, headers={"Accept-Encoding": accept})
+
+
+class TestNegotiate:
+    """Pruebas de la negociación de Accept-Encoding"""
+
+    def test_prefers_brotli_when_available(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", object())
+        assert negotiate("gzip, deflate, br") == "br"
+        assert negotiate("gzip;q=1.0, br;q=0.5") == "gzip"
+
+    def test_gzip_without_brotli(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        assert negotiate("gzip, br") == "gzip"
+        assert negotiate("br") is None
+
+    def test_rejected_and_missing(self):
+        assert negotiate("") is None
+        assert negotiate("identity") is None
+        assert negotiate("gzip;q=0") is None
+        assert negotiate("gzip;q=oops") is None
+
+    def test_wildcard(self, monkeypatch):
+        monkeypatch.setattr(compression, "brotli", None)
+        assert negotiate("*") == "gzip"
+        assert negotiate("*, gzip;q=0") is None
+
+
+class TestCompressionMiddleware:
+    """Pruebas del middleware de compresión"""
+
+    def test_large_json_is_gzipped(self, compressed_client):
+        response = _get(compressed_client, "/large")
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == LARGE
+
+    def test_large_body_compressed_off_the_event_loop(self, compressed_client):
+        response = _get(compressed_client, "/huge")
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(response.json()["items"]) == 1000
+
+    def test_brotli(self, compressed_client):
+        pytest.importorskip("brotli")
+        response = _get(compressed_client, "/large", accept="br, gzip")
+        assert response.headers["content-encoding"] == "br"
+        assert response.json() == LARGE
+
+    @pytest.mark.parametrize("path", ["/small", "/stream", "/binary"])
+    def test_skipped(self, compressed_client, path):
+        response = _get(compressed_client, path)
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+
+    def test_stream_is_intact(self, compressed_client):
+        assert _get(compressed_client, "/stream").content == b"line\n" * 600
+
+    def test_client_without_gzip(self, compressed_client):
+        response = _get(compressed_client, "/large", accept="identity")
+        assert "content-encoding" not in response.headers
+        assert response.json() == LARGE
+
+    def test_strong_etag_becomes_weak(self, compressed_client):
+        assert _get(compressed_client, "/tagged").headers["etag"] == 'W/"v1"'
+        assert _get(compressed_client, "/tagged", accept="identity").headers["etag"] == '"v1"'
+
+    def test_gzip_output_is_deterministic(self):
+        body = b'{"a": 1}' * 100
+        first = compression.compress(body, "gzip", 6, 4)
+        assert first == compression.compress(body, "gzip", 6, 4)
+        assert gzip.decompress(first) == body
+
+
+class TestAppCompression:
+    """La app real comprime los listados y mantiene los 304"""
+
+    def test_catalog_page_compressed_and_revalidated(self, client, db_session):
+        from app.models.book import Book
+        for index in range(30):
+            db_session.add(Book(title=f"Compressed {index}", author="Writer", isbn=f"GZ-{index}"))
+        db_session.commit()
+
+        response = _get(client, "/books/")
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"].startswith('W/"')
+        assert len(response.json()["items"]) == 30
+
+        cached = client.get("/books/", headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["etag"]})
+        assert cached.status_code == 304
@@ -0,0 +1,72 @@
+# tests/test_database.py
+from sqlalchemy import create_engine
+from app import config
+from app.database import engine_options, pool_status
+
+
+class TestEngineOptions:
+    """Pruebas de la configuración del pool de conexiones"""
+
+    def test_sqlite_has_no_pool_options(self):
+        """SQLite no recibe argumentos de pool"""
+        assert engine_options("sqlite:///:memory:") == {}
+
+    def test_postgresql_pool_from_config(self, monkeypatch):
+        """PostgreSQL debe usar los valores configurados"""
+        monkeypatch.setattr(config, "DB_POOL_SIZE", 40)
+        monkeypatch.setattr(config, "DB_MAX_OVERFLOW", 60)
+        monkeypatch.setattr(config, "DB_POOL_TIMEOUT", 5.0)
+        monkeypatch.setattr(config, "DB_POOL_PRE_PING", False)
+        monkeypatch.setattr(config, "DB_POOL_RECYCLE", 600)
+        monkeypatch.setattr(config, "DB_STATEMENT_TIMEOUT_MS", 0)
+
+        options = engine_options("postgresql+psycopg2://u:p@db:5432/bookwise")
+        assert options == {
+            "pool_size": 40,
+            "max_overflow": 60,
+            "pool_timeout": 5.0,
+            "pool_pre_ping": False,
+            "pool_recycle": 600,
+        }
+
+    def test_postgresql_statement_timeout(self, monkeypatch):
+        """Un statement timeout > 0 se pasa como opción de conexión"""
+        monkeypatch.setattr(config, "DB_STATEMENT_TIMEOUT_MS", 2500)
+        options = engine_options("postgresql://u:p@db/bookwise")
+        assert options["connect_args"] == {"options": "-c statement_timeout=2500"}
+
+    def test_env_helpers(self, monkeypatch):
+        """Los helpers deben leer y convertir variables de entorno"""
+        monkeypatch.setenv("TEST_INT", "7")
+        monkeypatch.setenv("TEST_BOOL", "off")
+        monkeypatch.setenv("TEST_EMPTY", "")
+        assert config.env_int("TEST_INT", 1) == 7
+        assert config.env_int("TEST_EMPTY", 3) == 3
+        assert config.env_bool("TEST_BOOL", True) is False
+        assert config.env_float("TEST_MISSING", 1.5) == 1.5
+
+
+class TestPoolStatus:
+    """Pruebas del reporte de estado del pool"""
+
+    def test_queue_pool_counters(self, tmp_path):
+        """Debe reportar conexiones en uso y overflow de un QueuePool"""
+        bind = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2, max_overflow=1)
+        try:
+            with bind.connect():
+                status = pool_status(bind)
+            assert status["pool"] == "QueuePool"
+            assert status["size"] == 2
+            assert status["checkedout"] == 1
+            assert status["max_overflow"] == 1
+        finally:
+            bind.dispose()
+
+    def test_health_db_endpoint(self, client):
+        """GET /health/db debe hacer ping y reportar el pool"""
+        response = client.get("/health/db")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert "pool" in data
+        assert data["latency_ms"] >= 0
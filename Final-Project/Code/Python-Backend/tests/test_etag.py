@@ -0,0 +1,149 @@
+# tests/test_etag.py
+import pytest
+from sqlalchemy import event
+from app import config, etag
+from app.cache import TTLCache
+
+
+@pytest.fixture
+def statements(db_session):
+    """Sentencias SQL ejecutadas durante el test"""
+    executed = []
+    bind = db_session.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(bind, "before_cursor_execute", capture)
+    yield executed
+    event.remove(bind, "before_cursor_execute", capture)
+
+
+def _revalidate(client, path, response):
+    return client.get(path, headers={"If-None-Match": response.headers["ETag"]})
+
+
+class TestMatching:
+    """Pruebas de la comparación de If-None-Match"""
+
+    def test_exact_and_list(self):
+        assert etag.matches('"abc"', '"abc"')
+        assert etag.matches('"x", "abc"', '"abc"')
+        assert not etag.matches('"abd"', '"abc"')
+
+    def test_weak_and_wildcard(self):
+        assert etag.matches('W/"abc"', '"abc"')
+        assert etag.matches("*", '"abc"')
+
+    def test_version_is_stable_until_bumped(self):
+        first = etag.version("book")
+        assert etag.version("book") == first
+        etag.bump("book")
+        assert etag.version("book") != first
+
+    def test_version_expires(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(etag, "_versions", TTLCache(ttl=30, clock=lambda: now[0]))
+        first = etag.version("book")
+        now[0] = 31
+        assert etag.version("book") != first
+
+
+class TestCatalogETags:
+    """ETag / 304 en /books/, /books/available y /categories/"""
+
+    @pytest.mark.parametrize("path", ["/books/", "/books/?limit=1", "/books/available", "/categories/"])
+    def test_not_modified_without_database(self, client, sample_book, statements, path):
+        response = client.get(path)
+        assert response.status_code == 200
+        assert response.headers["ETag"].startswith('"')
+        assert response.headers["Cache-Control"] == "no-cache"
+
+        statements.clear()
+        cached = _revalidate(client, path, response)
+        assert cached.status_code == 304
+        assert cached.content == b""
+        assert cached.headers["ETag"] == response.headers["ETag"]
+        assert statements == []
+
+    def test_other_routes_have_no_etag(self, client, sample_book):
+        assert "ETag" not in client.get("/books/search?search=1984").headers
+        assert "ETag" not in client.get("/health").headers
+
+    def test_errors_have_no_etag(self, client):
+        response = client.get("/books/?cursor=invalid")
+        assert response.status_code == 400
+        assert "ETag" not in response.headers
+
+    def test_create_update_delete_book(self, client, sample_category):
+        before = client.get("/books/")
+        created = client.post("/books/", json={"title": "New", "author": "A", "isbn": "ET-1"}).json()
+        after_create = _revalidate(client, "/books/", before)
+        assert after_create.status_code == 200
+        assert [book["isbn"] for book in after_create.json()["items"]] == ["ET-1"]
+
+        client.put(f"/books/{created['book_id']}", json={"title": "Renamed", "author": "A", "isbn": "ET-1"})
+        after_update = _revalidate(client, "/books/", after_create)
+        assert after_update.status_code == 200
+        assert after_update.json()["items"][0]["title"] == "Renamed"
+
+        client.delete(f"/books/{created['book_id']}")
+        assert _revalidate(client, "/books/", after_update).status_code == 200
+
+    def test_category_change_only_affects_categories(self, client, sample_book):
+        books = client.get("/books/")
+        categories = client.get("/categories/")
+        client.post("/categories/", json={"name": "Poetry"})
+
+        assert _revalidate(client, "/categories/", categories).status_code == 200
+        assert _revalidate(client, "/books/", books).status_code == 304
+
+    def test_checkout_and_return(self, client, sample_book, sample_user):
+        available = client.get("/books/available")
+        loan = client.post("/loans/", json={"book_id": sample_book.book_id, "user_id": sample_user.user_id})
+        assert loan.status_code == 200
+
+        after_checkout = _revalidate(client, "/books/available", available)
+        assert after_checkout.status_code == 200
+        assert after_checkout.json()["items"] == []
+
+        client.put(f"/loans/return/{loan.json()['loan_id']}")
+        after_return = _revalidate(client, "/books/available", after_checkout)
+        assert after_return.status_code == 200
+        assert len(after_return.json()["items"]) == 1
+
+    def test_bulk_import(self, client):
+        before = client.get("/books/")
+        client.post("/books/bulk?format=csv", content="title,author,isbn\nA,B,ET-BULK\n")
+        assert _revalidate(client, "/books/", before).status_code == 200
+
+    @pytest.mark.parametrize("finish", ["commit", "rollback"])
+    def test_version_changes_again_at_end_of_transaction(self, tmp_path, finish):
+        """Una versión generada entre el flush y el commit no sobrevive al commit"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from app.database import Base
+        from app.models.category import Category
+
+        bind = create_engine(f"sqlite:///{tmp_path / 'etag.db'}")
+        Base.metadata.create_all(bind)
+        with Session(bind) as session:
+            session.add(Category(name="Essays"))
+            session.flush()
+            during = etag.version("category")
+            getattr(session, finish)()
+        bind.dispose()
+        assert etag.version("category") != during
+
+    def test_disabled(self, client, sample_book, monkeypatch):
+        monkeypatch.setattr(config, "ETAG_VERSION_TTL", 0)
+        assert "ETag" not in client.get("/books/").headers
+
+    def test_disabled_with_several_workers(self, client, sample_book, monkeypatch):
+        """Con varios workers no hay ETag ni 304: las versiones son por proceso"""
+        etag_value = client.get("/books/").headers["ETag"]
+        monkeypatch.setattr(config, "WEB_CONCURRENCY", 2)
+
+        response = client.get("/books/", headers={"If-None-Match": etag_value})
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
@@ -0,0 +1,92 @@
+# tests/test_export.py
+import csv
+import io
+import json
+import pytest
+from app.export import iter_export
+
+
+class TestIterExport:
+    """Pruebas del generador de exportación"""
+
+    @pytest.fixture
+    def books(self, db_session, sample_category):
+        from app.models.book import Book
+        books = [
+            Book(title=f"Export {i}", author="Author, Jr.", isbn=f"EXP-{i}",
+                 category_id=sample_category.category_id)
+            for i in range(5)
+        ]
+        db_session.add_all(books)
+        db_session.commit()
+        return books
+
+    def test_ndjson_in_batches(self, db_session, books):
+        """Debe generar un chunk por lote con una fila JSON por línea"""
+        from app.models.book import Book
+        chunks = list(iter_export(db_session, Book.__table__, "ndjson", batch_size=2))
+        assert len(chunks) == 3
+
+        rows = [json.loads(line) for chunk in chunks for line in chunk.decode().splitlines()]
+        assert [r["isbn"] for r in rows] == [f"EXP-{i}" for i in range(5)]
+        assert set(rows[0]) == {c.name for c in Book.__table__.columns}
+
+    def test_csv_has_header_and_quotes(self, db_session, books):
+        """El CSV debe incluir encabezado y escapar comas"""
+        from app.models.book import Book
+        body = b"".join(iter_export(db_session, Book.__table__, "csv", batch_size=2)).decode()
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert len(rows) == 5
+        assert rows[0]["author"] == "Author, Jr."
+
+    def test_empty_table(self, db_session):
+        """Una tabla vacía produce solo el encabezado CSV"""
+        from app.models.loan import Loan
+        body = b"".join(iter_export(db_session, Loan.__table__, "csv")).decode()
+        assert body.strip() == "loan_id,book_id,user_id,loan_date,return_date,status"
+
+
+class TestExportEndpoints:
+    """Pruebas de los endpoints de exportación"""
+
+    def test_export_books_ndjson(self, client, sample_book):
+        """GET /books/export debe retornar NDJSON por defecto"""
+        response = client.get("/books/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert 'filename="books.ndjson"' in response.headers["content-disposition"]
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows[0]["title"] == sample_book.title
+
+    def test_export_books_csv(self, client, sample_book):
+        """GET /books/export?format=csv debe retornar CSV"""
+        response = client.get("/books/export?format=csv")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert rows[0]["isbn"] == sample_book.isbn
+
+    def test_export_invalid_format(self, client):
+        """Un formato desconocido debe ser rechazado"""
+        response = client.get("/books/export?format=xml")
+        assert response.status_code == 422
+
+    def test_export_loans_requires_admin(self, client, auth_headers):
+        """GET /loans/export debe requerir rol de admin"""
+        response = client.get("/loans/export", headers=auth_headers)
+        assert response.status_code == 403
+
+    def test_export_loans(self, client, sample_loan, admin_headers, admin_user):
+        """GET /loans/export debe exportar los préstamos con fechas ISO"""
+        response = client.get("/loans/export", headers=admin_headers)
+        assert response.status_code == 200
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert rows[0]["loan_id"] == sample_loan.loan_id
+        assert rows[0]["loan_date"] == sample_loan.loan_date.isoformat()
+
+    def test_export_users_csv(self, client, sample_user, admin_headers, admin_user):
+        """GET /users/export debe exportar usuarios en CSV"""
+        response = client.get("/users/export?format=csv", headers=admin_headers)
+        assert response.status_code == 200
+        emails = {row["email"] for row in csv.DictReader(io.StringIO(response.text))}
+        assert emails == {sample_user.email, admin_user.email}
@@ -0,0 +1,82 @@
+# tests/test_fast_json.py
+import pytest
+from fastapi.responses import JSONResponse, ORJSONResponse
+from app import config, fast_json, schemas
+from app.models.book import Book
+from app.models.loan import Loan
+
+
+@pytest.fixture
+def fast(monkeypatch):
+    monkeypatch.setattr(config, "FAST_JSON", True)
+
+
+@pytest.fixture
+def catalog(db_session, sample_loan, admin_user):
+    """Varios libros (uno prestado) para comparar los listados"""
+    for index in range(3):
+        db_session.add(Book(title=f"Extra {index}", author="Writer", isbn=f"FJ-{index}"))
+    db_session.commit()
+
+
+LIST_ENDPOINTS = [
+    "/books/",
+    "/books/?limit=2",
+    "/books/available",
+    "/books/search?search=extra",
+    "/categories/",
+    "/users/",
+    "/loans/",
+    "/loans/me",
+    "/loans/active",
+]
+
+
+class TestFastJsonHelpers:
+    """Pruebas de los helpers de serialización"""
+
+    def test_entities_default_to_model(self):
+        assert fast_json.entities(Loan, schemas.Loan) == (Loan,)
+
+    def test_entities_project_schema_columns(self, fast):
+        columns = fast_json.entities(Loan, schemas.Loan)
+        assert [column.name for column in columns] == list(schemas.Loan.model_fields)
+
+    def test_type_adapter_is_cached(self):
+        assert fast_json.type_adapter(list[schemas.Book]) is fast_json.type_adapter(list[schemas.Book])
+
+    def test_respond_passes_through_when_disabled(self):
+        value = [{"name": "Fiction", "category_id": 1}]
+        assert fast_json.respond(list[schemas.Category], value) is value
+
+    def test_respond_validates(self, fast):
+        """La respuesta sigue validada contra el schema"""
+        from pydantic import ValidationError
+        with pytest.raises(ValidationError):
+            fast_json.respond(list[schemas.Category], [{"name": "Missing id"}])
+
+    def test_default_response_class(self, monkeypatch):
+        assert fast_json.default_response_class() is JSONResponse
+        monkeypatch.setattr(config, "FAST_JSON", True)
+        assert fast_json.default_response_class() is ORJSONResponse
+
+
+class TestFastJsonRoutes:
+    """Con FAST_JSON los listados responden exactamente lo mismo"""
+
+    @pytest.mark.parametrize("path", LIST_ENDPOINTS)
+    def test_same_payload(self, client, catalog, admin_headers, auth_headers, monkeypatch, path):
+        headers = admin_headers if path in ("/users/", "/loans/") else auth_headers
+        slow = client.get(path, headers=headers)
+        monkeypatch.setattr(config, "FAST_JSON", True)
+        fast = client.get(path, headers=headers)
+
+        assert slow.status_code == fast.status_code == 200
+        assert fast.headers["content-type"] == "application/json"
+        assert fast.json() == slow.json()
+
+    def test_rows_are_not_orm_objects(self, db_session, catalog, fast):
+        from app.crud import books as crud_books
+        rows = crud_books.get_books(db_session, entities=fast_json.entities(Book, schemas.Book))
+        assert rows and not any(isinstance(row, Book) for row in rows)
+        assert rows[0].book_id == rows[0]._mapping["book_id"]
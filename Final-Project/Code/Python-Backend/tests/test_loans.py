@@ -89,6 +89,17 @@ class TestLoanCRUD:
         loan = crud_loans.create_loan(db_session, loan_data)
         assert loan is None
     
+    def test_create_loan_with_inactive_user(self, db_session, sample_book, sample_user):
+        """Debe fallar y no reservar el libro si el usuario está inactivo"""
+        sample_user.status = "inactive"
+        db_session.commit()
+
+        loan_data = LoanCreate(book_id=sample_book.book_id, user_id=sample_user.user_id)
+
+        assert crud_loans.create_loan(db_session, loan_data) is None
+        db_session.refresh(sample_book)
+        assert sample_book.status == "available"
+
     def test_return_loan(self, db_session, sample_loan, sample_book):
         """Debe marcar préstamo como devuelto"""
         returned = crud_loans.return_loan(db_session, sample_loan.loan_id)
@@ -281,4 +292,64 @@ class TestLoanEndpoints:
         headers = {"Authorization": f"Bearer {user_token}"}
         response = client.delete(f"/loans/{sample_loan.loan_id}", headers=headers)
         # El endpoint actualmente no exige rol ADMIN para eliminar préstamos
-        assert response.status_code == 200
\ No newline at end of file
+        assert response.status_code == 200
+
+class TestConcurrentCheckout:
+    """Préstamos simultáneos del mismo libro"""
+
+    CHECKOUTS = 200
+
+    @pytest.fixture
+    def file_sessionmaker(self, tmp_path):
+        """Base SQLite en archivo: cada hilo usa su propia conexión"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import sessionmaker
+        from app.database import Base
+        engine = create_engine(
+            f"sqlite:///{tmp_path / 'checkout.db'}",
+            connect_args={"check_same_thread": False, "timeout": 30},
+            pool_size=32,
+            max_overflow=0
+        )
+        Base.metadata.create_all(bind=engine)
+        yield sessionmaker(bind=engine, autoflush=False)
+        engine.dispose()
+
+    def test_exactly_one_checkout_wins(self, file_sessionmaker):
+        """De cientos de préstamos en paralelo solo uno reserva el libro"""
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from fastapi import HTTPException
+        from app.models.book import Book
+        from app.models.loan import Loan
+        from app.models.user import User
+        from app.routers import loans as loans_router
+
+        with file_sessionmaker() as db:
+            user = User(full_name="Reader", email="reader@library.com", status="active")
+            book = Book(title="Popular", author="Author", isbn="POP-1", status="available")
+            db.add_all([user, book])
+            db.commit()
+            body = LoanCreate(book_id=book.book_id, user_id=user.user_id)
+
+        start = threading.Event()
+
+        def checkout(_):
+            start.wait(timeout=5)
+            with file_sessionmaker() as db:
+                try:
+                    loans_router.create_loan(body, db=db)
+                    return 200
+                except HTTPException as exc:
+                    return exc.status_code
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            futures = [pool.submit(checkout, index) for index in range(self.CHECKOUTS)]
+            start.set()
+            results = [future.result() for future in futures]
+
+        assert results.count(200) == 1
+        assert results.count(400) == self.CHECKOUTS - 1
+        with file_sessionmaker() as db:
+            assert db.query(Loan).count() == 1
+            assert db.query(Book).one().status == "loaned"
@@ -0,0 +1,116 @@
+# tests/test_metrics.py
+import pytest
+from app import config, metrics
+from app.metrics import Counter, Gauge, Histogram
+
+
+def _samples(text: str) -> dict[str, float]:
+    """Líneas ``nombre{labels} valor`` del formato de texto de Prometheus"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples
+
+
+class TestMetricTypes:
+    """Pruebas de los contadores, gauges e histogramas"""
+
+    def test_counter(self):
+        counter = Counter("test_total", "Test counter", ("kind",))
+        counter.inc("a")
+        counter.inc("a", amount=2)
+        counter.inc('b"x')
+        assert counter.header() == ["# HELP bookwise_test_total Test counter", "# TYPE bookwise_test_total counter"]
+        assert counter.render() == ['bookwise_test_total{kind="a"} 3', 'bookwise_test_total{kind="b\\"x"} 1']
+
+    def test_gauge_with_collector(self):
+        gauge = Gauge("test_ratio", "Test gauge", ("cache",), collect=lambda: [(("users",), 0.5)])
+        assert gauge.render() == ['bookwise_test_ratio{cache="users"} 0.5']
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = Histogram("test_seconds", "Test histogram", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, "/books/")
+        assert histogram.count("/books/") == 4
+        assert histogram.render() == [
+            'bookwise_test_seconds_bucket{route="/books/",le="0.1"} 2',
+            'bookwise_test_seconds_bucket{route="/books/",le="1.0"} 3',
+            'bookwise_test_seconds_bucket{route="/books/",le="+Inf"} 4',
+            'bookwise_test_seconds_sum{route="/books/"} 3.65',
+            'bookwise_test_seconds_count{route="/books/"} 4',
+        ]
+
+
+class TestMetricsEndpoint:
+    """Pruebas de GET /metrics y del middleware"""
+
+    def test_content_type_and_families(self, client):
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == metrics.CONTENT_TYPE
+        for family in ("http_requests_total", "http_request_duration_seconds", "http_requests_in_flight",
+                       "auth_failures_total", "db_pool_connections", "cache_hit_ratio"):
+            assert f"# TYPE bookwise_{family} " in response.text
+
+    def test_labels_use_route_template(self, client, sample_loan, admin_headers):
+        before = metrics.REQUESTS.value("GET", "/loans/{loan_id}", "200")
+        count = metrics.LATENCY.count("GET", "/loans/{loan_id}")
+        assert client.get(f"/loans/{sample_loan.loan_id}", headers=admin_headers).status_code == 200
+
+        assert metrics.REQUESTS.value("GET", "/loans/{loan_id}", "200") == before + 1
+        assert metrics.LATENCY.count("GET", "/loans/{loan_id}") == count + 1
+        samples = _samples(client.get("/metrics").text)
+        assert 'bookwise_http_request_duration_seconds_bucket{method="GET",route="/loans/{loan_id}",le="+Inf"}' in samples
+        assert not any(f"/loans/{sample_loan.loan_id}" in name for name in samples)
+
+    def test_status_and_unmatched(self, client):
+        before = metrics.REQUESTS.value("GET", "unmatched", "404")
+        assert client.get("/does-not-exist/123").status_code == 404
+        assert metrics.REQUESTS.value("GET", "unmatched", "404") == before + 1
+
+    def test_not_modified_keeps_route(self, client, sample_book):
+        response = client.get("/books/")
+        before = metrics.REQUESTS.value("GET", "/books/", "304")
+        client.get("/books/", headers={"If-None-Match": response.headers["ETag"]})
+        assert metrics.REQUESTS.value("GET", "/books/", "304") == before + 1
+
+    def test_in_flight_counts_scrape(self, client):
+        samples = _samples(client.get("/metrics").text)
+        assert samples["bookwise_http_requests_in_flight"] == 1
+
+    def test_pool_and_cache_gauges(self, client, sample_category, tmp_path, monkeypatch):
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import QueuePool
+        from app import database
+        bind = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, pool_size=3)
+        monkeypatch.setattr(database, "engine", bind)
+
+        client.get("/categories/")
+        client.get("/categories/")
+        with bind.connect():
+            samples = _samples(client.get("/metrics").text)
+        bind.dispose()
+        assert samples['bookwise_db_pool_connections{engine="sync",state="checkedout"}'] == 1
+        assert samples['bookwise_db_pool_connections{engine="sync",state="size"}'] == 3
+        assert samples['bookwise_cache_hits_total{cache="categories"}'] >= 1
+        assert 0 < samples['bookwise_cache_hit_ratio{cache="categories"}'] <= 1
+
+    @pytest.mark.parametrize("headers, reason", [
+        ({}, "missing"),
+        ({"Authorization": "Bearer not-a-jwt"}, "invalid"),
+    ])
+    def test_auth_failures(self, client, headers, reason):
+        before = metrics.AUTH_FAILURES.value(reason)
+        assert client.get("/loans/me", headers=headers).status_code == 401
+        assert metrics.AUTH_FAILURES.value(reason) == before + 1
+
+    def test_forbidden(self, client, auth_headers):
+        before = metrics.AUTH_FAILURES.value("forbidden")
+        assert client.get("/loans/", headers=auth_headers).status_code == 403
+        assert metrics.AUTH_FAILURES.value("forbidden") == before + 1
+
+    def test_disabled(self, client, monkeypatch):
+        monkeypatch.setattr(config, "METRICS_ENABLED", False)
+        assert client.get("/metrics").status_code == 404
@@ -0,0 +1,71 @@
+# tests/test_migrations.py
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect, text
+from app import migrate
+from app.database import Base
+
+
+@pytest.fixture
+def file_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+    yield engine
+    engine.dispose()
+
+
+def _version(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def _index_names(engine, table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+class TestMigrations:
+    """Pruebas de las migraciones de Alembic"""
+
+    def test_upgrade_matches_models(self, file_engine):
+        """Tras upgrade head el esquema coincide con los modelos"""
+        migrate.upgrade(file_engine)
+        assert _version(file_engine) == "0003"
+
+        with file_engine.connect() as connection:
+            context = MigrationContext.configure(connection, opts={
+                "compare_type": True,
+                "include_object": migrate.include_object_for("sqlite"),
+            })
+            assert compare_metadata(context, Base.metadata) == []
+
+    def test_hot_filter_indexes(self, file_engine):
+        migrate.upgrade(file_engine)
+        assert {"ix_loan_user_id_status", "ix_loan_book_id", "ix_loan_active"} <= _index_names(file_engine, "loan")
+        assert "ix_book_available" in _index_names(file_engine, "book")
+        assert "ix_app_user_auth_id" in _index_names(file_engine, "app_user")
+
+    def test_downgrade_to_base(self, file_engine):
+        migrate.upgrade(file_engine)
+        with file_engine.connect() as connection:
+            command.downgrade(migrate.alembic_config(connection), "base")
+            connection.commit()
+        assert set(inspect(file_engine).get_table_names()) == {"alembic_version"}
+
+    def test_existing_database_is_stamped(self, file_engine):
+        """Una base creada con create_all (sin alembic_version) se adopta sin recrear tablas"""
+        Base.metadata.create_all(bind=file_engine)
+        with file_engine.begin() as connection:
+            connection.execute(text(
+                "INSERT INTO category (name) VALUES ('Existing')"
+            ))
+
+        migrate.upgrade(file_engine)
+        assert _version(file_engine) == "0003"
+        with file_engine.connect() as connection:
+            assert connection.execute(text("SELECT name FROM category")).scalar() == "Existing"
+
+    def test_upgrade_is_idempotent(self, file_engine):
+        migrate.upgrade(file_engine)
+        migrate.upgrade(file_engine)
+        assert _version(file_engine) == "0003"
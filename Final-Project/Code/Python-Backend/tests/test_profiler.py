@@ -0,0 +1,105 @@
+# tests/test_profiler.py
+import logging
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from app import config, profiler
+from app.main import app
+from app.profiler import QueryProfile, QueryProfilerMiddleware
+
+
+@pytest.fixture
+def profiled_client(client):
+    """La app con el profiler por fuera (mismas dependencias que ``client``)"""
+    return TestClient(QueryProfilerMiddleware(app))
+
+
+@pytest.fixture
+def statements(db_session):
+    """Sentencias SQL ejecutadas durante el test"""
+    executed = []
+    bind = db_session.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(bind, "before_cursor_execute", capture)
+    yield executed
+    event.remove(bind, "before_cursor_execute", capture)
+
+
+class TestQueryProfile:
+    """Pruebas del registro de consultas"""
+
+    def test_record(self):
+        profile = QueryProfile()
+        profile.record("SELECT 1", 0.002)
+        profile.record("SELECT 2", 0.005)
+        profile.record("SELECT 1", 0.001)
+        assert profile.count == 3
+        assert profile.total == pytest.approx(0.008)
+        assert profile.slowest == (0.005, "SELECT 2")
+        assert profile.repeated(2) == [("SELECT 1", 2)]
+
+    def test_server_timing(self):
+        profile = QueryProfile()
+        profile.record("SELECT 1", 0.0125)
+        assert profiler.server_timing(profile, 0.05) == 'db;dur=12.5;desc="1 queries", app;dur=50.0'
+
+    def test_nothing_recorded_outside_a_request(self, db_session):
+        profiler.install()
+        db_session.execute(text("SELECT 1"))
+        assert profiler.current() is None
+
+    def test_budgets_from_env(self, monkeypatch):
+        monkeypatch.setenv("QUERY_BUDGETS", "POST  /loans/=6, DELETE /loans/{loan_id}=4")
+        assert config.env_budgets("QUERY_BUDGETS") == {"POST /loans/": 6, "DELETE /loans/{loan_id}": 4}
+        monkeypatch.setenv("QUERY_BUDGETS", "")
+        assert config.env_budgets("QUERY_BUDGETS") == {}
+
+
+class TestQueryProfilerMiddleware:
+    """Headers X-Query-Count / Server-Timing y warnings por request"""
+
+    def test_headers_match_executed_statements(self, profiled_client, sample_book, sample_user, statements):
+        payload = {"book_id": sample_book.book_id, "user_id": sample_user.user_id}
+        statements.clear()
+        response = profiled_client.post("/loans/", json=payload)
+        assert response.status_code == 200
+        assert int(response.headers["X-Query-Count"]) == len(statements) > 0
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert f'desc="{len(statements)} queries"' in response.headers["Server-Timing"]
+        assert ", app;dur=" in response.headers["Server-Timing"]
+
+    def test_no_queries(self, profiled_client):
+        response = profiled_client.get("/health")
+        assert response.headers["X-Query-Count"] == "0"
+
+    def test_over_budget_is_logged(self, profiled_client, sample_book, sample_user, monkeypatch, caplog):
+        monkeypatch.setattr(config, "QUERY_BUDGETS", {"POST /loans/": 1})
+        with caplog.at_level(logging.WARNING, logger="app.profiler"):
+            profiled_client.post("/loans/", json={"book_id": sample_book.book_id, "user_id": sample_user.user_id})
+        assert "POST /loans/ ran" in caplog.text
+        assert "(budget 1)" in caplog.text
+        assert "slowest" in caplog.text
+
+    def test_within_budget_is_quiet(self, profiled_client, sample_book, caplog):
+        with caplog.at_level(logging.WARNING, logger="app.profiler"):
+            profiled_client.get("/books/")
+        assert caplog.text == ""
+
+    def test_repeated_statement_is_logged(self, db_session, monkeypatch, caplog):
+        monkeypatch.setattr(config, "QUERY_REPEAT_THRESHOLD", 3)
+        mini = FastAPI()
+
+        @mini.get("/items/{item_id}")
+        def n_plus_one(item_id: int):
+            for _ in range(3):
+                db_session.execute(text("SELECT 1"))
+            return {}
+
+        with caplog.at_level(logging.WARNING, logger="app.profiler"):
+            response = TestClient(QueryProfilerMiddleware(mini)).get("/items/1")
+        assert response.headers["X-Query-Count"] == "3"
+        assert "GET /items/{item_id} ran the same statement 3 times (possible N+1): SELECT 1" in caplog.text
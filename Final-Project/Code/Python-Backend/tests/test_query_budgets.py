@@ -0,0 +1,82 @@
+# tests/test_query_budgets.py
+"""
+Consultas SQL por endpoint (@pytest.mark.query_budget, ver conftest.py).
+
+Los presupuestos son los valores actuales: si un cambio agrega un viaje a la
+base en estas rutas, el test falla y lista las sentencias del request.
+"""
+import pytest
+
+
+def _checkout(client, sample_book, sample_user):
+    response = client.post("/loans/", json={"book_id": sample_book.book_id, "user_id": sample_user.user_id})
+    assert response.status_code == 200
+    return response.json()["loan_id"]
+
+
+class TestLoanBudgets:
+    """Escrituras de préstamos"""
+
+    @pytest.mark.query_budget(3, route="POST /loans/")
+    def test_checkout(self, client, sample_book, sample_user):
+        _checkout(client, sample_book, sample_user)
+
+    @pytest.mark.query_budget(5, route="PUT /loans/return/{loan_id}")
+    def test_return(self, client, sample_book, sample_user):
+        loan_id = _checkout(client, sample_book, sample_user)
+        assert client.put(f"/loans/return/{loan_id}").status_code == 200
+
+    @pytest.mark.query_budget(4, route="DELETE /loans/{loan_id}")
+    def test_delete_active(self, client, sample_book, sample_user, admin_user, admin_headers):
+        loan_id = _checkout(client, sample_book, sample_user)
+        assert client.delete(f"/loans/{loan_id}", headers=admin_headers).status_code == 200
+
+    @pytest.mark.query_budget(2, route="GET /loans/")
+    def test_list(self, client, sample_loan, admin_user, admin_headers):
+        assert client.get("/loans/", headers=admin_headers).status_code == 200
+
+
+class TestReadBudgets:
+    """Lecturas frecuentes"""
+
+    @pytest.mark.query_budget(2)
+    def test_dashboard(self, client, sample_loan, auth_headers):
+        assert client.get("/stats/dashboard", headers=auth_headers).status_code == 200
+
+    @pytest.mark.query_budget(0, route="GET /stats/dashboard")
+    def test_dashboard_cached(self, client, sample_loan, auth_headers, query_counts):
+        client.get("/stats/dashboard", headers=auth_headers)
+        query_counts.clear()
+        assert client.get("/stats/dashboard", headers=auth_headers).status_code == 200
+
+    @pytest.mark.query_budget(1)
+    @pytest.mark.parametrize("path", ["/books/", "/books/available", "/categories/", "/loans/active"])
+    def test_lists(self, client, sample_loan, path):
+        assert client.get(path).status_code == 200
+
+    @pytest.mark.query_budget(1, route="GET /books/batch")
+    def test_batch(self, client, sample_loan):
+        assert client.get(f"/books/batch?ids={sample_loan.book_id},9999").status_code == 200
+
+    @pytest.mark.query_budget(2)
+    def test_search(self, client, sample_book):
+        assert client.get("/books/search?search=1984").status_code == 200
+
+
+class TestBudgetMarker:
+    """El marcador falla cuando un request supera su presupuesto"""
+
+    @pytest.mark.xfail(strict=True, reason="POST /loans/ runs 3 queries")
+    @pytest.mark.query_budget(2, route="POST /loans/")
+    def test_over_budget_fails(self, client, sample_book, sample_user):
+        _checkout(client, sample_book, sample_user)
+
+    @pytest.mark.xfail(strict=True, reason="the route was never requested")
+    @pytest.mark.query_budget(3, route="POST /loans/")
+    def test_missing_route_fails(self, client):
+        client.get("/health")
+
+    def test_counts_are_recorded(self, client, sample_book, query_counts):
+        client.get("/books/")
+        client.get("/health")
+        assert [(name, profile.count) for name, profile in query_counts] == [("GET /books/", 1), ("GET /health", 0)]
@@ -0,0 +1,69 @@
+# tests/test_query_plans.py
+"""
+Los endpoints de filtros frecuentes deben resolverse con índices.
+
+Se captura el SQL que ejecuta cada endpoint y se pasa por EXPLAIN QUERY PLAN;
+el test falla si alguna consulta recorre completa una de las tablas grandes.
+"""
+import pytest
+from sqlalchemy import event, text
+from app.crud import users as crud_users
+
+LARGE_TABLES = ("book", "loan", "app_user")
+
+
+@pytest.fixture
+def captured_sql(db_session):
+    statements = []
+    bind = db_session.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(bind, "before_cursor_execute", capture)
+    yield statements
+    event.remove(bind, "before_cursor_execute", capture)
+
+
+def full_scans(db_session, statements) -> list[str]:
+    """Líneas 'SCAN <tabla>' sin índice de los planes de ``statements``"""
+    scans = []
+    for statement, parameters in statements:
+        plan = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        for row in plan:
+            detail = row[-1]
+            if any(detail == f"SCAN {table}" for table in LARGE_TABLES):
+                scans.append(f"{detail}  <-  {statement}")
+    return scans
+
+
+class TestHotFilterPlans:
+    """Planes de ejecución de las consultas filtradas por estado / usuario"""
+
+    def test_active_loans(self, client, db_session, sample_loan, captured_sql):
+        assert client.get("/loans/active").status_code == 200
+        assert captured_sql
+        assert full_scans(db_session, captured_sql) == []
+
+    def test_my_loans(self, client, db_session, sample_loan, auth_headers, captured_sql):
+        assert client.get("/loans/me", headers=auth_headers).status_code == 200
+        assert full_scans(db_session, captured_sql) == []
+
+    def test_available_books(self, client, db_session, sample_book, captured_sql):
+        from app.models.book import Book
+        db_session.add(Book(title="Second", author="A", isbn="PLAN-2", status="available"))
+        db_session.commit()
+
+        first = client.get("/books/available?limit=1").json()
+        client.get(f"/books/available?limit=1&cursor={first['next_cursor']}")
+        assert full_scans(db_session, captured_sql) == []
+
+    def test_user_by_auth_id(self, db_session, sample_user, captured_sql):
+        assert crud_users.get_user_by_auth_id(db_session, sample_user.auth_id) is not None
+        assert full_scans(db_session, captured_sql) == []
+
+    def test_detects_full_scan(self, db_session, sample_book, captured_sql):
+        """Control: un filtro sin índice sí se reporta"""
+        db_session.execute(text("SELECT * FROM book WHERE publication_year = 1949")).all()
+        assert full_scans(db_session, captured_sql)
@@ -0,0 +1,184 @@
+# tests/test_search.py
+import pytest
+from sqlalchemy.dialects import postgresql
+from app import search
+from app.crud import books as crud_books, category as crud_category
+from app.schemas import BookCreate
+
+
+@pytest.fixture
+def catalog(db_session, sample_category):
+    """Libros con coincidencias en distintos campos"""
+    from app.models.book import Book
+    from app.models.category import Category
+
+    poetry = Category(name="Poetry", description="Poems")
+    db_session.add(poetry)
+    db_session.commit()
+
+    books = [
+        Book(title="Dune", author="Frank Herbert", isbn="S-1", category_id=sample_category.category_id),
+        Book(title="Herbert West", author="H. P. Lovecraft", isbn="S-2", category_id=sample_category.category_id),
+        Book(title="Leaves of Grass", author="Walt Whitman", isbn="S-3", category_id=poetry.category_id),
+        Book(title="Uncategorized Herbert Notes", author="Anon", isbn="S-4", category_id=None),
+    ]
+    db_session.add_all(books)
+    db_session.commit()
+    return books
+
+
+class TestInvertedIndex:
+    """Pruebas del índice invertido en memoria"""
+
+    def test_tokenize(self):
+        """Debe separar en términos en minúscula"""
+        assert search.tokenize("George ORWELL, 1984!") == ["george", "orwell", "1984"]
+        assert search.tokenize(None) == []
+
+    def test_prefix_and_substring_match(self):
+        """Debe encontrar por prefijo y, si no hay, por subcadena"""
+        index = search.InvertedIndex([(1, "Nineteen Eighty-Four", "George Orwell", "Fiction")])
+        assert index.search(["orw"]) == [(search.AUTHOR_WEIGHT, 1)]
+        assert index.search(["well"]) == [(search.AUTHOR_WEIGHT, 1)]
+        assert index.search(["tolkien"]) == []
+
+    def test_all_terms_required(self):
+        """Todos los términos deben coincidir en el documento"""
+        index = search.InvertedIndex([
+            (1, "Dune", "Frank Herbert", None),
+            (2, "Dune Messiah", "Frank Herbert", None),
+        ])
+        assert [book_id for _, book_id in index.search(["dune", "messiah"])] == [2]
+
+
+class TestSearchEngine:
+    """Pruebas del motor de búsqueda rankeado"""
+
+    def test_results_are_ranked(self, db_session, catalog):
+        """Título pesa más que autor"""
+        results = crud_books.search_books(db_session, "herbert", limit=10)
+        titles = [book.title for book, _ in results]
+        scores = [score for _, score in results]
+        assert titles[0] in ("Herbert West", "Uncategorized Herbert Notes")
+        assert "Dune" in titles
+        assert scores == sorted(scores, reverse=True)
+
+    def test_uncategorized_books_are_found(self, db_session, catalog):
+        """Los libros sin categoría también deben aparecer"""
+        results = crud_books.search_books(db_session, "notes", limit=10)
+        assert [book.isbn for book, _ in results] == ["S-4"]
+
+    def test_category_match(self, db_session, catalog):
+        """Debe encontrar libros por nombre de categoría"""
+        results = crud_books.search_books(db_session, "poetry", limit=10)
+        assert [(book.isbn, score) for book, score in results] == [("S-3", search.CATEGORY_WEIGHT)]
+
+    def test_index_follows_updates(self, db_session, catalog):
+        """El índice debe reflejar cambios hechos por el CRUD"""
+        assert crud_books.search_books(db_session, "arrakis", limit=10) == []
+
+        dune = catalog[0]
+        crud_books.update_book(db_session, dune.book_id, BookCreate(
+            title="Arrakis",
+            author=dune.author,
+            isbn=dune.isbn,
+            category_id=dune.category_id
+        ))
+        results = crud_books.search_books(db_session, "arrakis", limit=10)
+        assert [book.book_id for book, _ in results] == [dune.book_id]
+
+    def test_index_built_before_commit_is_discarded(self, tmp_path):
+        """Un índice que otra conexión construyó entre el flush y el commit no sobrevive al commit"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from app.database import Base
+        from app.models.book import Book
+
+        bind = create_engine(f"sqlite:///{tmp_path / 'search.db'}")
+        Base.metadata.create_all(bind)
+        with Session(bind) as session:
+            session.add(Book(title="Dune", author="Frank Herbert", isbn="RACE-1"))
+            session.commit()
+        with Session(bind) as writer, Session(bind) as reader:
+            writer.query(Book).one().title = "Arrakis"
+            writer.flush()
+            assert search.search_books(reader, "dune", 10)  # reconstruye con la fila anterior
+            writer.commit()
+            assert [book.title for book, _ in search.search_books(reader, "arrakis", 10)] == ["Arrakis"]
+        bind.dispose()
+
+    def test_empty_search(self, db_session, catalog):
+        """Una búsqueda sin términos no retorna resultados"""
+        assert crud_books.search_books(db_session, "  !! ", limit=10) == []
+
+    def test_postgresql_query_uses_search_indexes(self, db_session, monkeypatch):
+        """En PostgreSQL debe usar @@ sobre el tsvector y % de pg_trgm"""
+        captured = {}
+
+        class FakeQuery:
+            def __init__(self, *entities):
+                pass
+
+            def filter(self, *criteria):
+                captured.setdefault("criteria", []).extend(criteria)
+                return self
+
+            def order_by(self, *args):
+                return self
+
+            def limit(self, n):
+                return self
+
+            def all(self):
+                return []
+
+        monkeypatch.setattr(db_session, "query", FakeQuery)
+        search._search_postgresql(db_session, "orwell", ["orwell"], 10, (3, 5))
+
+        sql = " ".join(
+            str(c.compile(dialect=postgresql.dialect())) for c in captured["criteria"]
+        )
+        assert "to_tsvector('simple', book.title || ' ' || book.author) @@ to_tsquery('simple'" in sql
+        assert "book.title %% " in sql  # % escapado por el paramstyle de psycopg2
+        assert "book.book_id > " in sql
+        assert "UNION" in sql
+
+
+class TestSearchEndpoint:
+    """Pruebas del endpoint /books/search"""
+
+    def test_search_cursor_walks_ranked_results(self, client, catalog):
+        """Seguir next_cursor debe recorrer todos los resultados en orden"""
+        response = client.get("/books/search", params={"search": "herbert", "limit": 1})
+        page = response.json()
+        seen = [b["isbn"] for b in page["items"]]
+        while page["next_cursor"]:
+            response = client.get(
+                "/books/search",
+                params={"search": "herbert", "limit": 1, "cursor": page["next_cursor"]}
+            )
+            page = response.json()
+            seen.extend(b["isbn"] for b in page["items"])
+
+        assert sorted(seen) == ["S-1", "S-2", "S-4"]
+        assert seen[-1] == "S-1"
+
+    def test_search_rejects_list_cursor(self, client, catalog):
+        """Un cursor de listado no sirve para la búsqueda"""
+        from app.pagination import encode_cursor
+        response = client.get("/books/search", params={"search": "herbert", "cursor": encode_cursor(1)})
+        assert response.status_code == 400
+
+
+class TestCategoryMatching:
+    """Coincidencia de categorías por prefijo (ruta PostgreSQL) sobre la caché"""
+
+    def test_prefix_of_every_term(self, db_session):
+        from app.models.category import Category
+        db_session.add_all([Category(name="Science Fiction"), Category(name="Poetry")])
+        db_session.commit()
+        ids = {category.name: category.category_id for category in crud_category.get_categories(db_session)}
+
+        assert search._matching_category_ids(db_session, ["sci", "fic"]) == [ids["Science Fiction"]]
+        assert search._matching_category_ids(db_session, ["poe"]) == [ids["Poetry"]]
+        assert search._matching_category_ids(db_session, ["etry"]) == []
@@ -1,6 +1,8 @@
 # tests/test_stats_and_categories.py
 import pytest
+from sqlalchemy import event
 from app.crud import category as crud_category
+from app.crud import stats as crud_stats
 
 
 class TestStatisticsEndpoint:
@@ -46,6 +48,15 @@ class TestStatisticsEndpoint:
         assert data["active_loans"] == 0
         assert data["available_books"] == 0
     
+    def test_dashboard_counts_provisioned_user(self, client, auth_headers, db_session):
+        """provision_user (INSERT de Core) también descarta los contadores cacheados"""
+        from app.crud import users as crud_users
+        assert client.get("/stats/dashboard", headers=auth_headers).json()["total_users"] == 1
+
+        crud_users.provision_user(db_session, "provisioned@test.com")
+
+        assert client.get("/stats/dashboard", headers=auth_headers).json()["total_users"] == 2
+
     def test_dashboard_stats_multiple_books(
         self,
         client,
@@ -95,6 +106,84 @@ class TestStatisticsEndpoint:
         assert data["active_loans"] == 0
 
 
+class TestDashboardCounters:
+    """Pruebas de los contadores cacheados del dashboard"""
+
+    @staticmethod
+    def _capture(db_session):
+        statements = []
+        bind = db_session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(bind, "before_cursor_execute", listener)
+        return statements, lambda: event.remove(bind, "before_cursor_execute", listener)
+
+    def test_single_statement(self, db_session, sample_loan):
+        """Los cuatro totales salen de una sola consulta"""
+        statements, stop = self._capture(db_session)
+        try:
+            stats = crud_stats.get_dashboard_stats(db_session)
+        finally:
+            stop()
+
+        assert len(statements) == 1
+        assert stats == {"total_books": 1, "total_users": 1, "active_loans": 1, "available_books": 0}
+
+    def test_cached_until_flush(self, db_session, sample_book):
+        """Se reutiliza el valor hasta que un flush toca libros, usuarios o préstamos"""
+        from app.models.book import Book
+        crud_stats.get_dashboard_stats(db_session)
+
+        statements, stop = self._capture(db_session)
+        try:
+            assert crud_stats.get_dashboard_stats(db_session)["total_books"] == 1
+            assert statements == []
+        finally:
+            stop()
+
+        db_session.add(Book(title="New", author="A", isbn="N-1", status="available"))
+        db_session.commit()
+        stats = crud_stats.get_dashboard_stats(db_session)
+        assert stats["total_books"] == 2
+        assert stats["available_books"] == 2
+
+    def test_category_changes_keep_cache(self, db_session, sample_book):
+        """Crear categorías no invalida los contadores"""
+        from app.schemas import CategoryCreate
+        crud_stats.get_dashboard_stats(db_session)
+        crud_category.create_category(db_session, CategoryCreate(name="Other"))
+
+        statements, stop = self._capture(db_session)
+        try:
+            crud_stats.get_dashboard_stats(db_session)
+        finally:
+            stop()
+        assert statements == []
+
+    def test_counted_before_commit_is_discarded(self, tmp_path):
+        """Contadores calculados por otra conexión entre el flush y el commit no sobreviven al commit"""
+        from sqlalchemy import create_engine
+        from sqlalchemy.orm import Session
+        from app.database import Base
+        from app.models.book import Book
+
+        bind = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+        Base.metadata.create_all(bind)
+        with Session(bind) as writer, Session(bind) as reader:
+            writer.add(Book(title="New", author="A", isbn="RACE-1", status="available"))
+            writer.flush()
+            assert crud_stats.get_dashboard_stats(reader)["total_books"] == 0
+            reader.rollback()
+            writer.commit()
+            assert crud_stats.get_dashboard_stats(reader)["total_books"] == 1
+        bind.dispose()
+
+    def test_returned_copy(self, db_session):
+        """Modificar el resultado no altera la caché"""
+        stats = crud_stats.get_dashboard_stats(db_session)
+        stats["total_books"] = 100
+        assert crud_stats.get_dashboard_stats(db_session)["total_books"] == 0
+
+
 class TestCategoryCRUD:
     """Pruebas de operaciones CRUD de categorías"""
     
@@ -173,6 +262,37 @@ class TestCategoryEndpoints:
         assert data["description"] == sample_category.description
 
 
+class TestCategoryCache:
+    """Pruebas de la caché read-through de categorías"""
+
+    def test_second_read_skips_database(self, db_session, sample_category):
+        crud_category.get_categories(db_session)
+        statements, stop = TestDashboardCounters._capture(db_session)
+        try:
+            categories = crud_category.get_categories(db_session)
+        finally:
+            stop()
+        assert statements == []
+        assert [category.name for category in categories] == [sample_category.name]
+
+    def test_create_category_invalidates(self, client, sample_category):
+        assert len(client.get("/categories/").json()) == 1
+        client.post("/categories/", json={"name": "Poetry"})
+        assert [category["name"] for category in client.get("/categories/").json()] == ["Fiction", "Poetry"]
+
+    def test_returned_list_is_a_copy(self, db_session, sample_category):
+        crud_category.get_categories(db_session).clear()
+        assert len(crud_category.get_categories(db_session)) == 1
+
+    def test_counters_exposed(self, client, sample_category):
+        before = client.get("/health/cache").json()["categories"]
+        client.get("/categories/")
+        client.get("/categories/")
+        after = client.get("/health/cache").json()["categories"]
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+
+
 class TestIntegrationStats:
     """Pruebas de integración para estadísticas"""
     
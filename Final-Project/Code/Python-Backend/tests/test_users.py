@@ -231,4 +231,90 @@ class TestUserEndpoints:
         """DELETE /users/{id} debe requerir rol de admin"""
         headers = {"Authorization": f"Bearer {user_token}"}
         response = client.delete(f"/users/{sample_user.user_id}", headers=headers)
-        assert response.status_code == 403
\ No newline at end of file
+        assert response.status_code == 403
+
+class TestUserBatch:
+    """GET/POST /users/batch (solo librarians)"""
+
+    def test_requires_admin(self, client, sample_user, auth_headers):
+        assert client.get(f"/users/batch?ids={sample_user.user_id}", headers=auth_headers).status_code == 403
+
+    def test_keeps_order_and_reports_missing(self, client, admin_headers, admin_user, sample_user):
+        response = client.get(f"/users/batch?ids={sample_user.user_id},9999,{admin_user.user_id}", headers=admin_headers)
+        assert response.status_code == 200
+        assert [user["email"] for user in response.json()["items"]] == ["user@library.com", "admin@library.com"]
+        assert response.json()["missing"] == [9999]
+
+    def test_post_variant(self, client, admin_headers, admin_user, sample_user):
+        response = client.post("/users/batch", json=[admin_user.user_id, sample_user.user_id], headers=admin_headers)
+        assert [user["user_id"] for user in response.json()["items"]] == [admin_user.user_id, sample_user.user_id]
+
+    def test_crud_returns_existing_only(self, db_session, sample_user, admin_user):
+        from app.crud import users as crud_users
+        found = crud_users.get_users_by_ids(db_session, [sample_user.user_id, 9999])
+        assert list(found) == [sample_user.user_id]
+
+
+class TestUserProvisioning:
+    """Pruebas del registro idempotente de usuarios"""
+
+    def test_provision_creates_once(self, db_session):
+        """Dos llamadas con el mismo email devuelven el mismo usuario"""
+        first = crud_users.provision_user(db_session, "first@library.com", auth_id=7)
+        second = crud_users.provision_user(db_session, "first@library.com", auth_id=7)
+        assert first.user_id == second.user_id
+        assert first.full_name == "first"
+        assert len(crud_users.get_users(db_session)) == 1
+
+    def test_provision_existing_does_not_write(self, db_session, sample_user):
+        """Si el usuario existe solo se ejecuta un SELECT"""
+        from sqlalchemy import event
+        statements = []
+        bind = db_session.get_bind()
+        listener = lambda *args: statements.append(args[2])
+        event.listen(bind, "before_cursor_execute", listener)
+        try:
+            user = crud_users.provision_user(db_session, sample_user.email)
+        finally:
+            event.remove(bind, "before_cursor_execute", listener)
+
+        assert user.user_id == sample_user.user_id
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("SELECT")
+
+    def test_provision_ignores_conflict(self, db_session, sample_user):
+        """Si otra transacción ya insertó el email, el INSERT no falla"""
+        from sqlalchemy import select
+        from app.models.user import User
+        stmt = crud_users._insert_ignoring_existing(
+            db_session, [crud_users._provision_row(sample_user.email, None, None)]
+        )
+        assert db_session.execute(stmt).all() == []
+        assert db_session.scalars(select(User.user_id)).all() == [sample_user.user_id]
+
+    def test_provision_users_bulk(self, db_session, sample_user):
+        """El lote informa creados y existentes e ignora duplicados"""
+        from app.schemas import UserProvision
+        result = crud_users.provision_users(db_session, [
+            UserProvision(email=sample_user.email),
+            UserProvision(email="a@library.com", auth_id=10, full_name="A"),
+            UserProvision(email="b@library.com"),
+            UserProvision(email="b@library.com"),
+        ])
+        assert result == {"created": 2, "existing": 1}
+        assert crud_users.get_user_by_email(db_session, "a@library.com").full_name == "A"
+
+    def test_provision_endpoint_requires_admin(self, client, user_token):
+        headers = {"Authorization": f"Bearer {user_token}"}
+        response = client.post("/users/provision", json=[{"email": "x@library.com"}], headers=headers)
+        assert response.status_code == 403
+
+    def test_provision_endpoint(self, client, admin_headers, admin_user):
+        """POST /users/provision pre-registra en lote"""
+        payload = [{"email": f"bulk{index}@library.com", "auth_id": index} for index in range(3)]
+        response = client.post("/users/provision", json=payload, headers=admin_headers)
+        assert response.status_code == 200
+        assert response.json() == {"created": 3, "existing": 0}
+
+        again = client.post("/users/provision", json=payload, headers=admin_headers)
+        assert again.json() == {"created": 0, "existing": 3}
@@ -1,10 +1,11 @@
 import { useState, useEffect } from 'react';
-import { apiService, ApiBook, ApiCategory } from '../../services/api';
+import { apiService, ApiBook, ApiCategory, ApiPage } from '../../services/api';
 import { BookOpen, Plus, Search, CreditCard as Edit2, Trash2, X } from 'lucide-react';
 import Alert, { AlertType } from '../layout/Alert';
 
 export default function BookManagement() {
   const [books, setBooks] = useState<ApiBook[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [categories, setCategories] = useState<ApiCategory[]>([]);
   const [searchTerm, setSearchTerm] = useState('');
   const [categoryFilter, setCategoryFilter] = useState<number | ''>('');
@@ -22,7 +23,6 @@ export default function BookManagement() {
   const [confirmBookId, setConfirmBookId] = useState<number | null>(null);
 
   useEffect(() => {
-    loadBooks();
     // Cargar categorías al montar para el filtro
     (async () => {
       try {
@@ -34,12 +34,25 @@ export default function BookManagement() {
     })();
   }, []);
 
-  const loadBooks = async () => {
+  // La búsqueda la resuelve el backend; se espera a que el usuario deje de escribir
+  useEffect(() => {
+    const timer = setTimeout(() => loadBooks(), searchTerm ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
+
+  const fetchBooks = (cursor: string | null): Promise<ApiPage<ApiBook>> => {
+    const term = searchTerm.trim();
+    return term ? apiService.searchBooks(term, cursor) : apiService.getBooks(cursor);
+  };
+
+  // Primera página (cursor null) o la siguiente, que se agrega a la lista
+  const loadBooks = async (cursor: string | null = null) => {
     try {
       setLoading(true);
       setAlert(null);
-      const data = await apiService.getBooks();
-      setBooks(data);
+      const page = await fetchBooks(cursor);
+      setBooks(cursor ? [...books, ...page.items] : page.items);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       setAlert({ type: 'error', message: 'Error loading books' });
       console.error(err);
@@ -48,11 +61,9 @@ export default function BookManagement() {
     }
   };
 
+  // El filtro de categoría se aplica sobre las páginas ya cargadas
   const filteredBooks = books.filter(book =>
-    (book.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    book.author.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    book.isbn.includes(searchTerm)) &&
-    (categoryFilter === '' || book.category_id === categoryFilter)
+    categoryFilter === '' || book.category_id === categoryFilter
   );
 
   const handleSubmit = async (e: React.FormEvent) => {
@@ -141,7 +152,7 @@ export default function BookManagement() {
           <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 text-slate-400" size={20} />
           <input
             type="text"
-            placeholder="Search by title, author or ISBN..."
+            placeholder="Search by title, author or category..."
             value={searchTerm}
             onChange={(e) => setSearchTerm(e.target.value)}
             className="w-full pl-10 pr-4 py-3 border border-slate-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-emerald-500"
@@ -196,13 +207,13 @@ export default function BookManagement() {
         />
       )}
 
-      {loading && (
+      {loading && books.length === 0 && (
         <div className="text-center py-8">
           <p className="text-slate-500">Loading...</p>
         </div>
       )}
 
-      {!loading && (
+      {filteredBooks.length > 0 && (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
           {filteredBooks.map(book => (
             <div key={book.book_id} className="bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow p-6 border border-slate-200">
@@ -244,6 +255,18 @@ export default function BookManagement() {
         </div>
       )}
 
+      {nextCursor && (
+        <div className="text-center">
+          <button
+            onClick={() => loadBooks(nextCursor)}
+            disabled={loading}
+            className="bg-emerald-600 hover:bg-emerald-700 disabled:opacity-50 text-white px-6 py-2 rounded-lg"
+          >
+            {loading ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+
       {filteredBooks.length === 0 && !loading && (
         <div className="text-center py-12">
           <BookOpen className="mx-auto text-slate-300 mb-4" size={64} />
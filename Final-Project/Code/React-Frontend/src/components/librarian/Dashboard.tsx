@@ -1,7 +1,7 @@
 // src/components/librarian/Dashboard.tsx
 import { useState, useEffect } from 'react';
 import { useAuth } from '../../contexts/AuthContext';
-import { apiService, ApiUser, ApiLoan } from '../../services/api';
+import { apiService } from '../../services/api';
 import { BookOpen, Users, BookMarked, CheckCircle } from 'lucide-react';
 import Alert, { AlertType } from '../layout/Alert';
 
@@ -34,35 +34,22 @@ export default function Dashboard() {
 
       const isLibrarian = userProfile?.role === 'librarian';
 
-      // Cargar datos según el rol
-      const books = await apiService.getBooks();
-      
-      let users: ApiUser[] = [];
-      let loans: ApiLoan[] = [];
-      
-      try {
-        if (isLibrarian) {
-          // Solo librarians pueden ver todos los usuarios y préstamos
-          users = await apiService.getUsers();
-          loans = await apiService.getAllLoans();
-        } else {
-          // Usuarios normales solo ven sus préstamos
-          loans = await apiService.getMyLoans();
-        }
-      } catch (err: any) {
-        console.warn('Error loading users/loans:', err);
-        // Si hay error 403, el usuario no tiene permisos
-        if (err.response?.status === 403) {
-          console.log('User does not have admin permissions');
+      // Los totales salen de /stats/dashboard (COUNT en el backend), sin bajar los listados
+      const totals = await apiService.getDashboardStats();
+
+      let activeLoans = totals.active_loans;
+      if (!isLibrarian) {
+        // Usuarios normales solo ven sus préstamos
+        try {
+          const loans = await apiService.getMyLoans();
+          activeLoans = loans.filter(l => l.status === 'active').length;
+        } catch (err: any) {
+          console.warn('Error loading loans:', err);
+          activeLoans = 0;
         }
       }
 
-      setStats({
-        total_books: books.length,
-        total_users: users.length,
-        active_loans: loans.filter((l: any) => l.status === 'active').length,
-        available_books: books.filter((b: any) => b.status === 'available').length
-      });
+      setStats({ ...totals, active_loans: activeLoans });
       } catch (err: any) {
       console.error('Dashboard error:', err);
       setAlert({ type: 'error', message: err.response?.data?.detail || 'Error loading dashboard data' });
@@ -1,11 +1,12 @@
 import { useState, useEffect } from 'react';
-import { apiService, ApiLoan, ApiBook, ApiUser } from '../../services/api';
+import { apiService, ApiLoan, ApiBook, ApiUser, MAX_PAGE_SIZE } from '../../services/api';
 import { BookMarked, Plus, Search, X, CheckCircle, Calendar } from 'lucide-react';
 import Alert, { AlertType } from '../layout/Alert';
 
 export default function LoanManagement() {
   const [loans, setLoans] = useState<ApiLoan[]>([]);
   const [books, setBooks] = useState<ApiBook[]>([]);
+  const [availableBooks, setAvailableBooks] = useState<ApiBook[]>([]);
   const [users, setUsers] = useState<ApiUser[]>([]);
   const [searchTerm, setSearchTerm] = useState('');
   const [isModalOpen, setIsModalOpen] = useState(false);
@@ -27,13 +28,17 @@ export default function LoanManagement() {
     try {
       setLoading(true);
       setAlert(null);
-      const [loansData, booksData, usersData] = await Promise.all([
+      const [loansData, availablePage, usersData] = await Promise.all([
         apiService.getAllLoans(),
-        apiService.getBooks(),
+        // El selector de nuevo préstamo muestra a lo sumo una página (500) de disponibles
+        apiService.getAvailableBooks(null, MAX_PAGE_SIZE),
         apiService.getUsers()
       ]);
+      // Solo los libros de los préstamos listados, en una request
+      const booksData = await apiService.getBooksByIds(loansData.map(loan => loan.book_id));
       setLoans(loansData);
       setBooks(booksData);
+      setAvailableBooks(availablePage.items);
       setUsers(usersData);
     } catch (err) {
       setAlert({ type: 'error', message: 'Error loading data' });
@@ -135,7 +140,6 @@ export default function LoanManagement() {
     }
   };
 
-  const availableBooks = books.filter(b => b.status === 'available');
   const activeUsers = users.filter(u => u.status === 'active');
 
   return (
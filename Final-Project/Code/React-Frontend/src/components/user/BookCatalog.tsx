@@ -1,24 +1,34 @@
 import { useState, useEffect } from 'react';
-import { apiService, ApiBook } from '../../services/api';
+import { apiService, ApiBook, ApiPage } from '../../services/api';
 import { BookOpen, Search, Calendar } from 'lucide-react';
 import Alert, { AlertType } from '../layout/Alert';
 
 export default function BookCatalog() {
   const [books, setBooks] = useState<ApiBook[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [loading, setLoading] = useState(false);
   const [alert, setAlert] = useState<{ type: AlertType; title?: string; message: string } | null>(null);
 
+  // La búsqueda la resuelve el backend; se espera a que el usuario deje de escribir
   useEffect(() => {
-    loadBooks();
-  }, []);
+    const timer = setTimeout(() => loadBooks(), searchTerm ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
 
-  const loadBooks = async () => {
+  const fetchBooks = (cursor: string | null): Promise<ApiPage<ApiBook>> => {
+    const term = searchTerm.trim();
+    return term ? apiService.searchBooks(term, cursor) : apiService.getBooks(cursor);
+  };
+
+  // Primera página (cursor null) o la siguiente, que se agrega a la lista
+  const loadBooks = async (cursor: string | null = null) => {
     try {
       setLoading(true);
       setAlert(null);
-      const data = await apiService.getBooks();
-      setBooks(data);
+      const page = await fetchBooks(cursor);
+      setBooks(cursor ? [...books, ...page.items] : page.items);
+      setNextCursor(page.next_cursor);
     } catch (err) {
       setAlert({ type: 'error', message: 'Error loading books' });
       console.error(err);
@@ -27,12 +37,6 @@ export default function BookCatalog() {
     }
   };
 
-  const filteredBooks = books.filter(book =>
-    book.title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    book.author.toLowerCase().includes(searchTerm.toLowerCase()) ||
-    book.isbn.includes(searchTerm)
-  );
-
   return (
     <div className="space-y-6">
       <div>
@@ -44,7 +48,7 @@ export default function BookCatalog() {
         <Search className="absolute left-3 top-1/2 transform -translate-y-1/2 text-slate-400" size={20} />
         <input
           type="text"
-          placeholder="Search by title, author or ISBN..."
+          placeholder="Search by title, author or category..."
           value={searchTerm}
           onChange={(e) => setSearchTerm(e.target.value)}
           className="w-full pl-10 pr-4 py-3 border border-slate-300 rounded-lg focus:outline-none focus:ring-2 focus:ring-emerald-500"
@@ -61,15 +65,15 @@ export default function BookCatalog() {
         />
       )}
 
-      {loading && (
+      {loading && books.length === 0 && (
         <div className="text-center py-8">
           <p className="text-slate-500">Loading...</p>
         </div>
       )}
 
-      {!loading && (
+      {books.length > 0 && (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {filteredBooks.map(book => (
+          {books.map(book => (
             <div key={book.book_id} className="bg-white rounded-lg shadow-md hover:shadow-lg transition-shadow p-6 border border-slate-200">
               <div className="flex items-start justify-between mb-4">
                 <div className="bg-emerald-100 p-3 rounded-lg">
@@ -99,7 +103,19 @@ export default function BookCatalog() {
         </div>
       )}
 
-      {filteredBooks.length === 0 && !loading && (
+      {nextCursor && (
+        <div className="text-center">
+          <button
+            onClick={() => loadBooks(nextCursor)}
+            disabled={loading}
+            className="bg-emerald-600 hover:bg-emerald-700 disabled:opacity-50 text-white px-6 py-2 rounded-lg"
+          >
+            {loading ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+
+      {books.length === 0 && !loading && (
         <div className="text-center py-12">
           <BookOpen className="mx-auto text-slate-300 mb-4" size={64} />
           <p className="text-slate-500 text-lg">No books found</p>
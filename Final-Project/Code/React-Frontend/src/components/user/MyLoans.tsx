@@ -19,10 +19,9 @@ export default function MyLoans() {
     try {
       setLoading(true);
       setAlert(null);
-      const [loansData, booksData] = await Promise.all([
-        apiService.getMyLoans(),
-        apiService.getBooks()
-      ]);
+      const loansData = await apiService.getMyLoans();
+      // Solo los libros de estos préstamos, en una request
+      const booksData = await apiService.getBooksByIds(loansData.map(loan => loan.book_id));
       setLoans(loansData);
       setBooks(booksData);
     } catch (err: any) {
@@ -34,6 +34,15 @@ export interface ApiLoan {
   status?: string;
 }
 
+export interface ApiPage<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+// Tamaño de página por defecto del backend (el máximo es 500)
+export const PAGE_SIZE = 50;
+export const MAX_PAGE_SIZE = 500;
+
 // ✅ Nueva interfaz para crear usuario completo
 export interface CreateUserCompleteRequest {
   username: string;
@@ -45,6 +54,19 @@ export interface CreateUserCompleteRequest {
 
 
 class ApiService {
+  // Una página de un listado paginado por cursor; la vista pide la siguiente con next_cursor
+  private async fetchPage<T>(
+    url: string,
+    cursor: string | null = null,
+    limit: number = PAGE_SIZE,
+    params: Record<string, string> = {}
+  ): Promise<ApiPage<T>> {
+    const response = await apiClient.get(url, {
+      params: cursor ? { ...params, limit, cursor } : { ...params, limit },
+    });
+    return response.data;
+  }
+
   // ==================== CATEGORY ENDPOINTS ====================
   async getCategories(): Promise<ApiCategory[]> {
     const response = await apiClient.get('/categories/');
@@ -125,9 +147,16 @@ class ApiService {
   }
 
   // ==================== BOOK ENDPOINTS ====================
-  async getBooks(): Promise<ApiBook[]> {
-    const response = await apiClient.get('/books/');
-    return response.data;
+  async getBooks(cursor: string | null = null, limit: number = PAGE_SIZE): Promise<ApiPage<ApiBook>> {
+    return this.fetchPage<ApiBook>('/books/', cursor, limit);
+  }
+
+  // Libros por id en una sola request (los que no existen se omiten)
+  async getBooksByIds(bookIds: number[]): Promise<ApiBook[]> {
+    const ids = Array.from(new Set(bookIds));
+    if (ids.length === 0) return [];
+    const response = await apiClient.post('/books/batch', ids);
+    return response.data.items;
   }
 
   async getBook(bookId: number): Promise<ApiBook> {
@@ -150,14 +179,12 @@ class ApiService {
     return response.data;
   }
 
-  async getAvailableBooks(): Promise<ApiBook[]> {
-    const response = await apiClient.get('/books/available');
-    return response.data;
+  async getAvailableBooks(cursor: string | null = null, limit: number = PAGE_SIZE): Promise<ApiPage<ApiBook>> {
+    return this.fetchPage<ApiBook>('/books/available', cursor, limit);
   }
 
-  async searchBooks(search: string): Promise<ApiBook[]> {
-    const response = await apiClient.get(`/books/search?search=${encodeURIComponent(search)}`);
-    return response.data;
+  async searchBooks(search: string, cursor: string | null = null, limit: number = PAGE_SIZE): Promise<ApiPage<ApiBook>> {
+    return this.fetchPage<ApiBook>('/books/search', cursor, limit, { search });
   }
 
   // ==================== LOAN ENDPOINTS ====================